@@ -1,14 +1,12 @@
-import time
 import os
 import base64
 import json
-from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+from selenium_driver import new_chrome
+import card_extract
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
+import readiness
 
 # credentials.json を再構築
 with open("credentials.json", "wb") as f:
@@ -30,35 +28,18 @@ options = Options()
 options.add_argument('--headless')
 options.add_argument('--no-sandbox')
 options.add_argument('--disable-dev-shm-usage')
-driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+driver = new_chrome(options)
 
 # ヘッダー再設定（必要であれば）
 ws.update("B1:D1", [["カード名", "画像URL", "直近価格JSON"]])
 
 for i, url in enumerate(urls, start=2):
     driver.get(url)
-    time.sleep(2)
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
-
-    # カード名取得
-    card_name = soup.find("h1", class_="entry-title")
-    card_name = card_name.text.strip() if card_name else ""
-
-    # 画像URL取得
-    img_tag = soup.select_one("figure.eye-catch img")
-    img_url = img_tag["src"] if img_tag else ""
-
-    # 価格情報取得
-    price_table = soup.find("tbody", id="item-price-table")
-    prices = {"美品": "", "キズあり": "", "PSA10": ""}
-    if price_table:
-        rows = price_table.find_all("tr")
-        for row in rows:
-            cells = row.find_all("td")
-            if cells and "直近価格" in cells[0].text:
-                prices["美品"] = cells[1].text.strip() if len(cells) > 1 else ""
-                prices["キズあり"] = cells[2].text.strip() if len(cells) > 2 else ""
-                prices["PSA10"] = cells[3].text.strip() if len(cells) > 3 else ""
+    # 価格表の行数が落ち着くまで待つ（表がないページは readyState=complete で進む）
+    readiness.wait_ready_selenium(driver, "pokeca-chart", "tbody#item-price-table tr", min_count=0,
+                                  stable_ms=300, ceiling_ms=2000, verbose=False)
+    # カード名・画像URL・価格情報（必要な要素だけを parse）
+    card_name, img_url, prices = card_extract.entry(card_extract.card_soup(driver.page_source))
 
     price_json = json.dumps(prices, ensure_ascii=False)
 
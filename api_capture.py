@@ -0,0 +1,158 @@
+"""XHR/fetch の JSON レスポンスから一覧を取り出すキャプチャモード
+
+SPA のサイトは一覧を JSON API から読み込んで描画している。DOM の
+クラス名（Tailwind / Chakra UI）から読み取る代わりに、page.on("response")
+で JSON を受け取り、ApiCapture の対応表で {title, image, url, pt} に変換する。
+
+JSON の形はサイト側の実装次第なので、最初はブラウザで DOM と JSON の
+両方を取り、DOM の結果と同じ一覧（URL の集合と、各 URL のタイトル・PT が一致）を
+返したエンドポイントだけを「確認済み」として API_ENDPOINTS_PATH
+（既定 .cache/api_endpoints.json）に記録する。
+確認済みのエンドポイント（GET のみ）は次回からブラウザなしで直接取得する。
+http_fastpath と同じく、FASTPATH_RETRY_DAYS 日ごと、または件数が確認時から
+VERIFY_COUNT_DRIFT 以上ずれたら、ブラウザと突き合わせ直す。
+"""
+import os
+import re
+import json
+import time
+
+import http_session
+from http_fastpath import DEFAULT_UA, RETRY_DAYS, VERIFY_COUNT_DRIFT, iter_dicts
+
+ENDPOINTS_PATH = os.getenv("API_ENDPOINTS_PATH", ".cache/api_endpoints.json")
+
+
+class ApiCapture:
+    """JSON レスポンスから一覧を取り出す対応表
+
+    url_pattern: 対象にするレスポンス URL の正規表現
+    id:          レコードを識別するキーの候補（これがないレコードは無視）
+    detail_url:  詳細ページ URL のテンプレート（{id} などレコードのキーで埋める）
+    title / image / pt: 各項目のキーの候補（先に見つかったものを使う）
+    """
+
+    def __init__(self, url_pattern: str, detail_url: str, id=("id",),
+                 title=("name", "title"), image=("image", "imageUrl", "image_url", "thumbnail", "thumbnailUrl"),
+                 pt=("price", "point", "points", "coin")):
+        self.url_pattern = re.compile(url_pattern)
+        self.detail_url = detail_url
+        self.id_keys = tuple(id)
+        self.title_keys = tuple(title)
+        self.image_keys = tuple(image)
+        self.pt_keys = tuple(pt)
+
+    def matches(self, response) -> bool:
+        if response.request.resource_type not in ("xhr", "fetch"):
+            return False
+        if "json" not in (response.headers.get("content-type") or ""):
+            return False
+        return bool(self.url_pattern.search(response.url))
+
+    def extract(self, payload) -> list:
+        """JSON から {title, image, url, pt} の配列を返す"""
+        results = []
+        seen = set()
+        for record in iter_dicts(payload):
+            item_id = _first(record, self.id_keys)
+            image = _first(record, self.image_keys)
+            if item_id in (None, "") or not isinstance(image, str) or not image:
+                continue
+            try:
+                url = self.detail_url.format(**record)
+            except (KeyError, IndexError, ValueError):
+                continue
+            if url in seen:
+                continue
+            seen.add(url)
+            title = _first(record, self.title_keys)
+            pt = _first(record, self.pt_keys)
+            results.append({
+                "title": str(title or "").strip(),
+                "image": image,
+                "url": url,
+                "pt": "" if pt is None else str(pt),
+            })
+        return results
+
+
+def _first(record: dict, keys):
+    for key in keys:
+        value = record.get(key)
+        if value not in (None, ""):
+            return value
+    return None
+
+
+def best_match(captured: list, dom_items: list, same):
+    """DOM の結果と同じ一覧を返したレスポンスを返す（なければ None）
+
+    captured は (url, method, items) の配列。items は整形済み（detail_url を持つ）。
+    same(api_items, dom_items) で一致を判定する。一部しか返さないレスポンス
+    （ページ分割など）も、余分な項目を含むレスポンス（別カテゴリなど）も採用しない。
+    """
+    for url, method, items in captured:
+        if same(items, dom_items):
+            return url, method, items
+    return None
+
+
+# -----------------------------
+# 確認済みエンドポイントの記録と再取得
+# -----------------------------
+class EndpointStore:
+    def __init__(self, path: str = ENDPOINTS_PATH):
+        self.path = path
+        self.state = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def get(self, slug: str):
+        return self.state.get(slug)
+
+    def verified(self, slug: str, count: int) -> bool:
+        """再取得の結果（count 件）をブラウザと突き合わせずに使ってよいか"""
+        entry = self.state.get(slug)
+        if not entry or not entry.get("count"):
+            return False
+        if time.time() - entry["verified"] >= RETRY_DAYS * 86400:
+            return False
+        return abs(count - entry["count"]) <= entry["count"] * VERIFY_COUNT_DRIFT
+
+    def remember(self, slug: str, url: str, method: str, count: int) -> None:
+        self.state = self._load()
+        self.state[slug] = {"url": url, "method": method, "verified": time.time(), "count": count}
+        self._save()
+
+    def forget(self, slug: str) -> None:
+        self.state = self._load()
+        if self.state.pop(slug, None) is not None:
+            self._save()
+
+    def _save(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self.state, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"⚠️ エンドポイントの記録失敗: {e}")
+
+
+def replay(endpoint: dict, referer: str, user_agent: str = None, timeout: int = 30):
+    """確認済みエンドポイントを HTTP で直接取得し、JSON を返す"""
+    res = http_session.get(
+        endpoint["url"],
+        headers={
+            "User-Agent": user_agent or DEFAULT_UA,
+            "Accept": "application/json",
+            "Referer": referer,
+        },
+        timeout=timeout,
+    )
+    res.raise_for_status()
+    return res.json()
@@ -0,0 +1,128 @@
+"""playwright.async_api ベースの並列スクレイピングエンジン
+
+共有の Chromium 1つに対して複数サイトを同時に処理する。
+処理時間は「全サイトの合計」から「一番遅いサイト」程度まで短くなる。
+Chromium は最初に page() が呼ばれたときに起動するので、全サイトが
+HTTP で取得できた回はブラウザを起動しない。常駐ブラウザサーバー
+（browser_server.py）が起動していれば、起動せずにそちらへ接続する。
+
+サイト定義と実行の入口は site_registry.py。
+
+環境変数:
+    SCRAPE_CONCURRENCY     同時に開くページ数（全サイト合計、既定 4）
+    SCRAPE_PER_SITE_LIMIT  1サイトあたりの同時ページ数の上限（既定 2）
+"""
+import os
+import time
+import asyncio
+import contextlib
+import contextvars
+
+from playwright.async_api import async_playwright
+
+import browser_server
+
+DEFAULT_CONCURRENCY = int(os.getenv("SCRAPE_CONCURRENCY", "4"))
+DEFAULT_PER_SITE_LIMIT = int(os.getenv("SCRAPE_PER_SITE_LIMIT", "2"))
+
+# page() の中にいるタスク（入れ子の page() を検出する）
+_page_holder = contextvars.ContextVar("page_holder", default=None)
+
+
+class ScrapeEngine:
+    """共有ブラウザ上でサイトを並列に実行するエンジン
+
+    サイトは ``slug`` 属性と ``async scrape(engine) -> list[dict]`` を持つオブジェクト。
+    ページは必ず ``engine.page(slug)`` から取得する。ここで全体の同時数
+    (concurrency) とサイトごとの同時数 (per_site_limit) が制御される。
+    サイトの枠を先に取ってから全体の枠を取るので、待っているサイトが
+    全体の枠を抱えて他のサイトを止めることはない。
+    同じタスクの中で page() を入れ子にすると枠を使い切って止まりうるので
+    RuntimeError にする。ページを複数使うときは並列に取得して使い終わったら返すこと。
+    """
+
+    def __init__(self, concurrency: int = DEFAULT_CONCURRENCY, per_site_limit: int = DEFAULT_PER_SITE_LIMIT):
+        self.concurrency = max(1, concurrency)
+        self.per_site_limit = max(1, per_site_limit)
+        self.browser = None
+        self.timings = {}
+        self._playwright = None
+        self._slots = None
+        self._site_slots = {}
+        self._launch_lock = None
+        self._remote = False
+        self._pages_opened = 0
+
+    async def __aenter__(self):
+        self._slots = asyncio.Semaphore(self.concurrency)
+        self._launch_lock = asyncio.Lock()
+        return self
+
+    async def __aexit__(self, *exc):
+        if self._playwright is None:
+            return
+        try:
+            if self.browser is not None:
+                await self.browser.close()
+        finally:
+            if self._remote:
+                browser_server.record_close(self._pages_opened)
+            await self._playwright.stop()
+
+    async def _ensure_browser(self):
+        async with self._launch_lock:
+            if self.browser is None:
+                self._playwright = await async_playwright().start()
+                self.browser = await browser_server.connect_async(self._playwright)
+                self._remote = self.browser is not None
+                if self.browser is None:
+                    self.browser = await self._playwright.chromium.launch(headless=True, args=["--no-sandbox"])
+
+    # -----------------------------
+    # ページ取得（同時数制御つき）
+    # -----------------------------
+    @contextlib.asynccontextmanager
+    async def page(self, slug: str, **context_options):
+        """サイト専用の BrowserContext とページを払い出す"""
+        task = asyncio.current_task()
+        if _page_holder.get() is task:
+            raise RuntimeError(f"{slug}: page() の中で page() を取得しています")
+        site_slots = self._site_slots.setdefault(slug, asyncio.Semaphore(self.per_site_limit))
+        async with site_slots, self._slots:
+            await self._ensure_browser()
+            context = await self.browser.new_context(**context_options)
+            self._pages_opened += 1
+            token = _page_holder.set(task)
+            try:
+                yield await context.new_page()
+            finally:
+                _page_holder.reset(token)
+                await context.close()
+
+    # -----------------------------
+    # サイト実行
+    # -----------------------------
+    async def _run_site(self, site):
+        start = time.time()
+        try:
+            items = await site.scrape(self)
+            print(f"✅ {site.slug}: {len(items)} 件取得")
+        except Exception as e:
+            print(f"🛑 {site.slug} スクレイピング失敗: {e}")
+            items = []
+        self.timings[site.slug] = time.time() - start
+        return site.slug, items
+
+    async def run(self, sites) -> dict:
+        """全サイトを並列に実行し {slug: [item, ...]} を返す"""
+        results = await asyncio.gather(*(self._run_site(site) for site in sites))
+        return dict(results)
+
+
+async def scrape_sites(sites, concurrency: int = DEFAULT_CONCURRENCY,
+                       per_site_limit: int = DEFAULT_PER_SITE_LIMIT):
+    """エンジンを起動してサイトを実行し (結果, サイト別処理時間) を返す"""
+    async with ScrapeEngine(concurrency, per_site_limit) as engine:
+        results = await engine.run(sites)
+    return results, engine.timings
+
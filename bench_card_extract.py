@@ -0,0 +1,150 @@
+"""card_extract のベンチマーク（全体 parse と部分 parse の比較）
+
+    python bench_card_extract.py --save 50     # 実ページを 50 件 fixtures に保存
+    python bench_card_extract.py               # 保存済み fixtures で比較
+
+保存先は --fixtures（既定 .cache/fixtures/pokeca-chart）。fixtures がなければ
+WordPress テーマ風の合成ページで測る。各ページについて、3種類の抽出
+（card_detail / latest_prices / entry）の結果が全体 parse と一致するかも確認する。
+lxml が入っていれば、参考として lxml + SoupStrainer の結果も表示する。
+"""
+import os
+import glob
+import time
+import argparse
+import tracemalloc
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+import card_extract
+
+FIXTURE_DIR = ".cache/fixtures/pokeca-chart"
+
+
+def synthetic_page(n: int) -> str:
+    nav = "".join(f'<li class="menu-item"><a href="https://pokeca-chart.com/cat-{i}">カテゴリ {i}</a></li>'
+                  for i in range(300))
+    related = "".join(
+        f'<div class="related"><a href="https://pokeca-chart.com/card-{i}">'
+        f'<img src="/wp-content/uploads/card-{i}.jpg" alt="card {i}"><span>関連カード {i}</span></a></div>'
+        for i in range(200)
+    )
+    rows = "".join(
+        f"<tr><td>{label}</td><td>{(n + j) * 100:,}円</td><td>{(n + j) * 80:,}円</td><td>{(n + j) * 300:,}円</td></tr>"
+        for j, label in enumerate(["データ数", "直近価格", "最高価格", "平均価格", "最低価格"])
+    )
+    return (
+        "<!DOCTYPE html><html><head><title>カード</title>"
+        + "<script>var x = 1;</script>" * 40
+        + f'</head><body><header><ul class="menu">{nav}</ul></header>'
+        + f'<main><article><h1 class="entry-title">ピカチュウ {n}</h1>'
+        + f'<figure class="eye-catch"><img src="https://pokeca-chart.com/wp-content/uploads/{n}.jpg"></figure>'
+        + f'<table><tbody id="item-price-table">{rows}</tbody></table>'
+        + "<p>" + "価格推移の説明文。" * 400 + "</p>"
+        + f"</article>{related}</main><footer>{nav}</footer></body></html>"
+    )
+
+
+def load_fixtures(path: str) -> list:
+    pages = []
+    for file in sorted(glob.glob(os.path.join(path, "*.html"))):
+        with open(file, encoding="utf-8") as f:
+            pages.append((os.path.basename(file), f.read()))
+    return pages
+
+
+def save_fixtures(path: str, count: int) -> None:
+    import http_session
+    import sitemap_discovery
+
+    os.makedirs(path, exist_ok=True)
+    urls = []
+    for sitemap in sitemap_discovery.find_sitemaps():
+        for kind, loc, _ in sitemap_discovery.iter_sitemap(sitemap):
+            if kind == "sitemap":
+                for sub_kind, sub_loc, _ in sitemap_discovery.iter_sitemap(loc):
+                    url = sitemap_discovery.card_url(sub_loc) if sub_kind == "url" else ""
+                    if url:
+                        urls.append(url)
+                    if len(urls) >= count:
+                        break
+            elif sitemap_discovery.card_url(loc):
+                urls.append(sitemap_discovery.card_url(loc))
+            if len(urls) >= count:
+                break
+        if len(urls) >= count:
+            break
+
+    for url in urls[:count]:
+        res = http_session.get(url)
+        res.encoding = res.encoding or res.apparent_encoding
+        name = url.rstrip("/").rsplit("/", 1)[-1] + ".html"
+        with open(os.path.join(path, name), "w", encoding="utf-8") as f:
+            f.write(res.text)
+    print(f"💾 {len(urls[:count])} 件を {path} に保存")
+
+
+def extract_all(soup, name: str):
+    return (card_extract.card_detail(soup, name), card_extract.latest_prices(soup), card_extract.entry(soup))
+
+
+def measure(label: str, make_soup, pages: list, repeat: int):
+    # 速度は tracemalloc なしで測り、メモリは1ページずつ別に測る（tracemalloc は遅いため）
+    start = time.perf_counter()
+    results = []
+    for _ in range(repeat):
+        results = [extract_all(make_soup(html), name) for name, html in pages]
+    elapsed = time.perf_counter() - start
+
+    peak = 0
+    for name, html in pages:
+        tracemalloc.start()
+        extract_all(make_soup(html), name)
+        peak = max(peak, tracemalloc.get_traced_memory()[1])
+        tracemalloc.stop()
+    rate = len(pages) * repeat / elapsed
+    print(f"  {label:<28}: {rate:8.1f} pages/sec | 1ページの peak {peak / 1024 / 1024:6.1f} MB")
+    return results, rate
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--fixtures", default=FIXTURE_DIR)
+    parser.add_argument("--save", type=int, default=0, help="実ページを保存する件数")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    if args.save:
+        save_fixtures(args.fixtures, args.save)
+
+    pages = load_fixtures(args.fixtures)
+    if not pages:
+        print(f"ℹ️ {args.fixtures} に fixtures がないため合成ページで測定します")
+        pages = [(f"synthetic-{n}", synthetic_page(n)) for n in range(30)]
+
+    size_kb = sum(len(html.encode()) for _, html in pages) / len(pages) / 1024
+    print(f"📊 {len(pages)} ページ（平均 {size_kb:.0f} KB）× {args.repeat} 回")
+
+    full, full_rate = measure("html.parser 全体", lambda h: BeautifulSoup(h, "html.parser"), pages, args.repeat)
+    part, part_rate = measure("html.parser + SoupStrainer", card_extract.card_soup, pages, args.repeat)
+    print(f"  → {part_rate / full_rate:.1f} 倍")
+
+    mismatched = [name for (name, _), a, b in zip(pages, full, part) if a != b]
+    if mismatched:
+        print(f"🛑 抽出結果が一致しないページ: {mismatched}")
+    else:
+        print("✅ 全ページで抽出結果が一致")
+
+    try:
+        import lxml  # noqa: F401
+    except ImportError:
+        return
+    strainer = SoupStrainer(card_extract.CARD_TAGS)
+    lx, _ = measure("lxml + SoupStrainer（参考）",
+                    lambda h: BeautifulSoup(h, "lxml", parse_only=strainer), pages, args.repeat)
+    diff = sum(1 for a, b in zip(full, lx) if a != b)
+    print(f"  lxml の結果が異なるページ: {diff} 件")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""http_session の効果を測るベンチマーク（pages/sec）
+
+    python bench_http_session.py                       # ローカルサーバーで比較
+    python bench_http_session.py --url https://pokeca-chart.com/s12a-262 --pages 200
+
+ローカルサーバーは接続ごとに --handshake-ms だけ待ってから応答し、
+TCP + TLS の接続確立にかかる往復を模擬する（Keep-Alive 中の2回目以降は待たない）。
+--url を指定すると、そのページを実際に取得して比較する。
+"""
+import time
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import http_session
+
+BODY = ("<html><body>" + "<div class='card'>pokeca</div>" * 300 + "</body></html>").encode()
+
+
+def local_server(handshake_ms: int):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def setup(self):
+            super().setup()
+            time.sleep(handshake_ms / 1000)
+
+        def do_GET(self):
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(BODY)))
+            self.end_headers()
+            self.wfile.write(BODY)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def run(fetch, urls, workers: int) -> float:
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=workers) as ex:
+        for res in ex.map(fetch, urls):
+            res.raise_for_status()
+    return len(urls) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", help="実サイトのページ（省略時はローカルサーバー）")
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--workers", type=int, default=12)
+    parser.add_argument("--handshake-ms", type=int, default=50)
+    args = parser.parse_args()
+
+    server = None
+    if args.url:
+        url = args.url
+    else:
+        server = local_server(args.handshake_ms)
+        url = f"http://127.0.0.1:{server.server_port}/card"
+    urls = [url] * args.pages
+
+    http_session.get_session(args.workers)
+    before = run(lambda u: requests.get(u, timeout=30), urls, args.workers)
+    after = run(lambda u: http_session.get(u), urls, args.workers)
+
+    print(f"📊 {args.pages} ページ / {args.workers} ワーカー")
+    print(f"  requests.get     : {before:8.1f} pages/sec")
+    print(f"  http_session.get : {after:8.1f} pages/sec （{after / before:.1f} 倍）")
+
+    if server:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,285 @@
+"""常駐ブラウザサーバー（自前ホストでの定期実行用）
+
+    python browser_server.py
+
+Playwright の launch-server で Chromium を常駐させ、各スクレイパーは
+shared_browser / async_scrape_engine から connect() で接続する。
+サーバーが起動していなければ、従来どおりその場で Chromium を起動する。
+
+監視ループ:
+    - BROWSER_SERVER_HEALTH_SEC ごとに接続してページを開けるか確認し、
+      失敗したら再起動する
+    - 使用ページ数が BROWSER_SERVER_MAX_PAGES を超えるか、プロセス群の
+      RSS が BROWSER_SERVER_MAX_RSS_MB を超えたら、接続中のクライアントが
+      いなくなった時点で再起動する
+
+接続中のクライアントは、サーバーのポートに張られている TCP 接続（/proc/net/tcp）で
+数える。クライアントが close() せずに終了・例外終了しても接続は切れるので、
+数え残しで再起動が止まることはない。使用ページ数はクライアントが切断時に記録する。
+
+環境変数:
+    BROWSER_SERVER_WS         接続先（既定 ws://127.0.0.1:9323/scraper、"off" で接続しない）
+    BROWSER_SERVER_MAX_PAGES  再起動までのページ数（既定 500）
+    BROWSER_SERVER_MAX_RSS_MB 再起動する RSS（既定 1500）
+    BROWSER_SERVER_HEALTH_SEC ヘルスチェック間隔（既定 30）
+"""
+import os
+import sys
+import json
+import time
+import socket
+import subprocess
+from urllib.parse import urlparse
+
+WS_ENDPOINT = os.getenv("BROWSER_SERVER_WS", "ws://127.0.0.1:9323/scraper")
+MAX_PAGES = int(os.getenv("BROWSER_SERVER_MAX_PAGES", "500"))
+MAX_RSS_MB = int(os.getenv("BROWSER_SERVER_MAX_RSS_MB", "1500"))
+HEALTH_SEC = int(os.getenv("BROWSER_SERVER_HEALTH_SEC", "30"))
+USAGE_PATH = os.getenv("BROWSER_SERVER_USAGE_PATH", ".cache/browser_server_usage.log")
+CONFIG_PATH = ".cache/browser_server_config.json"
+CONNECT_TIMEOUT_MS = 10000
+
+
+# -----------------------------
+# 利用状況の記録（クライアント → サーバー監視）
+# -----------------------------
+def _append_usage(line: str) -> None:
+    # 1行ずつの追記は O_APPEND で原子的に行われるので、複数プロセスから書いてよい
+    try:
+        os.makedirs(os.path.dirname(USAGE_PATH) or ".", exist_ok=True)
+        fd = os.open(USAGE_PATH, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        try:
+            os.write(fd, (line + "\n").encode())
+        finally:
+            os.close(fd)
+    except OSError:
+        pass
+
+
+def record_close(pages: int) -> None:
+    _append_usage(f"close {pages}")
+
+
+def read_pages() -> int:
+    """切断したクライアントが使ったページ数の合計"""
+    pages = 0
+    try:
+        with open(USAGE_PATH, encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) == 2 and parts[0] == "close":
+                    pages += int(parts[1])
+    except (OSError, ValueError):
+        pass
+    return pages
+
+
+def active_connections(port: int) -> int:
+    """port で待ち受けているサーバーへの確立済み TCP 接続数（Linux の /proc を参照）"""
+    count = 0
+    for path in ("/proc/net/tcp", "/proc/net/tcp6"):
+        try:
+            with open(path) as f:
+                next(f, None)  # 見出し行
+                for line in f:
+                    fields = line.split()
+                    # local_address は "IP:PORT"（16進）、st の 01 は ESTABLISHED
+                    if len(fields) > 3 and fields[3] == "01" and int(fields[1].rsplit(":", 1)[1], 16) == port:
+                        count += 1
+        except (OSError, ValueError):
+            continue
+    return count
+
+
+# -----------------------------
+# クライアント側
+# -----------------------------
+def available() -> bool:
+    """サーバーのポートが開いているか（接続を試す前の軽い確認）"""
+    if WS_ENDPOINT.lower() == "off":
+        return False
+    parsed = urlparse(WS_ENDPOINT)
+    try:
+        with socket.create_connection((parsed.hostname, parsed.port), timeout=0.5):
+            return True
+    except OSError:
+        return False
+
+
+class RemoteBrowser:
+    """接続したブラウザのラッパー。開いたページ数を数え、close() で切断する"""
+
+    def __init__(self, browser):
+        self._browser = browser
+        self.pages = 0
+
+    def new_context(self, **kwargs):
+        context = self._browser.new_context(**kwargs)
+        context.on("page", self._count_page)
+        return context
+
+    def new_page(self, **kwargs):
+        page = self._browser.new_page(**kwargs)
+        self.pages += 1
+        return page
+
+    def _count_page(self, page):
+        self.pages += 1
+
+    def close(self):
+        try:
+            self._browser.close()  # 接続を切るだけで、サーバーの Chromium は残る
+        finally:
+            record_close(self.pages)
+
+    def __getattr__(self, name):
+        return getattr(self._browser, name)
+
+
+def connect(p):
+    """sync API: サーバーに接続できれば RemoteBrowser を、できなければ None を返す"""
+    if not available():
+        return None
+    try:
+        browser = p.chromium.connect(WS_ENDPOINT, timeout=CONNECT_TIMEOUT_MS)
+    except Exception as e:
+        print(f"⚠️ 常駐ブラウザに接続できないためローカルで起動します: {e}")
+        return None
+    print("🔌 常駐ブラウザに接続")
+    return RemoteBrowser(browser)
+
+
+async def connect_async(p):
+    """async API: サーバーに接続できれば Browser を、できなければ None を返す
+
+    ページ数は呼び出し側で数え、終了時に record_close() を呼ぶこと
+    （呼ばずに終了しても接続数の判定には影響しない）。
+    """
+    if not available():
+        return None
+    try:
+        browser = await p.chromium.connect(WS_ENDPOINT, timeout=CONNECT_TIMEOUT_MS)
+    except Exception as e:
+        print(f"⚠️ 常駐ブラウザに接続できないためローカルで起動します: {e}")
+        return None
+    print("🔌 常駐ブラウザに接続")
+    return browser
+
+
+# -----------------------------
+# サーバー監視
+# -----------------------------
+def _process_tree_rss_mb(root_pid: int) -> float:
+    """root_pid とその子孫プロセスの RSS 合計（Linux の /proc を参照）"""
+    children = {}
+    rss = {}
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                ppid = int(f.read().rsplit(")", 1)[1].split()[1])
+            with open(f"/proc/{entry}/statm") as f:
+                rss[int(entry)] = int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+        except (OSError, ValueError, IndexError):
+            continue
+        children.setdefault(ppid, []).append(int(entry))
+
+    total = 0
+    stack = [root_pid]
+    while stack:
+        pid = stack.pop()
+        total += rss.get(pid, 0)
+        stack.extend(children.get(pid, []))
+    return total / (1024 * 1024)
+
+
+class Supervisor:
+    def __init__(self):
+        self.proc = None
+        self.started = None
+
+    def start(self):
+        parsed = urlparse(WS_ENDPOINT)
+        config = {
+            "headless": True,
+            "args": ["--no-sandbox"],
+            "port": parsed.port,
+            "host": parsed.hostname,
+            "wsPath": parsed.path,
+        }
+        os.makedirs(os.path.dirname(CONFIG_PATH), exist_ok=True)
+        with open(CONFIG_PATH, "w", encoding="utf-8") as f:
+            json.dump(config, f)
+        # 前回の利用状況は新しいブラウザには関係ないので消す
+        open(USAGE_PATH, "w").close()
+
+        self.proc = subprocess.Popen(
+            [sys.executable, "-m", "playwright", "launch-server", "--browser", "chromium", "--config", CONFIG_PATH]
+        )
+        self.started = time.time()
+        for _ in range(300):
+            if available():
+                print(f"🚀 常駐ブラウザ起動: {WS_ENDPOINT} (pid {self.proc.pid})")
+                return
+            if self.proc.poll() is not None:
+                raise RuntimeError(f"launch-server が終了しました (code {self.proc.returncode})")
+            time.sleep(0.1)
+        raise RuntimeError("launch-server の起動待ちがタイムアウトしました")
+
+    def stop(self):
+        if self.proc is None:
+            return
+        self.proc.terminate()
+        try:
+            self.proc.wait(timeout=15)
+        except subprocess.TimeoutExpired:
+            self.proc.kill()
+            self.proc.wait()
+        self.proc = None
+
+    def healthy(self, p) -> bool:
+        if self.proc.poll() is not None:
+            return False
+        try:
+            browser = p.chromium.connect(WS_ENDPOINT, timeout=CONNECT_TIMEOUT_MS)
+            try:
+                page = browser.new_page()
+                page.goto("about:blank", timeout=CONNECT_TIMEOUT_MS)
+            finally:
+                browser.close()
+            return True
+        except Exception as e:
+            print(f"⚠️ ヘルスチェック失敗: {e}")
+            return False
+
+    def run(self):
+        from playwright.sync_api import sync_playwright
+
+        self.start()
+        try:
+            with sync_playwright() as p:
+                while True:
+                    time.sleep(HEALTH_SEC)
+                    if not self.healthy(p):
+                        print("♻️ 応答がないため再起動します")
+                        self.stop()
+                        self.start()
+                        continue
+
+                    active = active_connections(urlparse(WS_ENDPOINT).port)
+                    pages = read_pages()
+                    rss_mb = _process_tree_rss_mb(self.proc.pid)
+                    if active == 0 and (pages >= MAX_PAGES or rss_mb >= MAX_RSS_MB):
+                        print(f"♻️ 再起動: {pages} ページ / RSS {round(rss_mb)} MB "
+                              f"/ 稼働 {round((time.time() - self.started) / 60)} 分")
+                        self.stop()
+                        self.start()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+
+
+if __name__ == "__main__":
+    Supervisor().run()
@@ -0,0 +1,109 @@
+"""pokeca-chart.com のカード詳細ページから必要な部分だけを取り出す
+
+詳細ページで使うのは h1（カード名）、img / figure.eye-catch（画像）、
+tbody#item-price-table（価格表）だけなので、BeautifulSoup の parse_only
+（SoupStrainer）でこれらの要素の部分木だけを作る。ページ全体の木を作らない分、
+速く、メモリも少ない。パーサーは従来と同じ html.parser なので、
+取り出した部分木と抽出結果は全体を parse した場合と同じになる。
+
+抽出ロジックは呼び出し元ごとに従来の挙動を保ったまま、ここにまとめている。
+    card_detail(soup, url)  scrape_pokeca_chart_wp.py（h1 / 最初の img / 直近価格の行）
+    latest_prices(soup)     scraper.py（価格表の2行目）
+    entry(soup)             all-date.py（h1.entry-title / figure.eye-catch img / 「直近価格」の行）
+
+    python bench_card_extract.py で全体 parse との比較（pages/sec・メモリ）を測れる。
+"""
+from bs4 import BeautifulSoup, SoupStrainer
+
+from stream_fetch import Target
+
+SITE_ROOT = "https://pokeca-chart.com"
+
+# 抽出で参照する要素（これらの部分木だけを作る）
+CARD_TAGS = ["h1", "img", "figure", "tbody"]
+
+# card_detail に必要な要素（最初の h1・最初の img・価格表）。揃えばそれ以降は受信しない
+CARD_DETAIL_TARGETS = [
+    Target("h1"),
+    Target("img", event="start"),
+    Target("tbody", id="item-price-table"),
+]
+
+
+def empty_prices() -> dict:
+    return {"美品": "", "キズあり": "", "PSA10": ""}
+
+
+def card_soup(html: str) -> BeautifulSoup:
+    """必要な要素だけを parse した BeautifulSoup を返す"""
+    return BeautifulSoup(html, "html.parser", parse_only=SoupStrainer(CARD_TAGS))
+
+
+def card_detail(soup, url: str) -> dict:
+    # ① カード名
+    h1 = soup.find("h1")
+    card_name = h1.text.strip() if h1 else "noname"
+
+    # ② 画像
+    img_url = ""
+    img = soup.find("img")
+    if img and img.get("src"):
+        img_url = img["src"]
+        if not img_url.startswith("http"):
+            img_url = SITE_ROOT + img_url
+
+    # ③ 価格 JSON
+    prices = empty_prices()
+
+    table = soup.find("tbody", id="item-price-table")
+    if table:
+        rows = table.find_all("tr")
+        if len(rows) >= 2:
+            cols = rows[1].find_all("td")
+            if len(cols) >= 4:
+                prices["美品"] = cols[1].get_text(strip=True)
+                prices["キズあり"] = cols[2].get_text(strip=True)
+                prices["PSA10"] = cols[3].get_text(strip=True)
+
+    return {
+        "card_name": card_name,
+        "image_url": img_url,
+        "detail_url": url,
+        "price_json": prices,
+    }
+
+
+def latest_prices(soup) -> dict:
+    table = soup.find("tbody", id="item-price-table")
+    prices = empty_prices()
+
+    if table:
+        rows = table.find_all("tr")
+        if len(rows) >= 2:  # 「直近価格」は2番目の行
+            tds = rows[1].find_all("td")
+            if len(tds) >= 4:
+                prices["美品"] = tds[1].text.strip()
+                prices["キズあり"] = tds[2].text.strip()
+                prices["PSA10"] = tds[3].text.strip()
+    return prices
+
+
+def entry(soup):
+    """(カード名, 画像URL, 価格) を返す"""
+    card_name = soup.find("h1", class_="entry-title")
+    card_name = card_name.text.strip() if card_name else ""
+
+    img_tag = soup.select_one("figure.eye-catch img")
+    img_url = img_tag["src"] if img_tag else ""
+
+    price_table = soup.find("tbody", id="item-price-table")
+    prices = empty_prices()
+    if price_table:
+        rows = price_table.find_all("tr")
+        for row in rows:
+            cells = row.find_all("td")
+            if cells and "直近価格" in cells[0].text:
+                prices["美品"] = cells[1].text.strip() if len(cells) > 1 else ""
+                prices["キズあり"] = cells[2].text.strip() if len(cells) > 2 else ""
+                prices["PSA10"] = cells[3].text.strip() if len(cells) > 3 else ""
+    return card_name, img_url, prices
@@ -0,0 +1,238 @@
+"""正規化した詳細URLの重複判定インデックス（全スクレイパー共通）
+
+既存URLとの重複判定は、これまでプロセスごとに生のURL文字列の set を作り、
+サイトごとに strip_query / normalize_url などの正規化をまちまちに掛けていた。
+ここでは URL を canonical_url() で正規化し、その 64 bit ハッシュを source_slug ごとに
+DEDUP_INDEX_PATH（既定 .cache/dedup_index.sqlite）へ保存する。
+
+    - 判定は主キー（source, hash）の索引を引くだけで、URL 一覧をメモリに載せない
+    - contains_many() / filter_new() はまとめて SQL 1回（BATCH 件ずつ）で引く
+    - add() はトランザクション内の INSERT OR IGNORE（途中で落ちても半端に残らない）
+    - 正規化の規則はここだけにあるので、どのスクレイパーから引いても同じ答えになる
+
+正規化: スキーム（http / https は https に統一）とホスト名を小文字に、既定ポート・
+フラグメント・末尾の / ・utm_* などの計測用パラメータを除き、クエリはキー順に並べる。
+クエリで商品を区別しないサイト（STRIP_QUERY_SOURCES）はクエリごと除く。
+
+一覧を後から列挙したいパーティション（pokeca-chart の価格更新など）は
+keep_urls=True で開くと、URL の文字列も一緒に保存する。
+fp 列には最後に送った内容の指紋（item_diff.fingerprint）を持つ。
+"""
+import os
+import time
+import sqlite3
+import hashlib
+import threading
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+INDEX_PATH = os.getenv("DEDUP_INDEX_PATH", ".cache/dedup_index.sqlite")
+
+# クエリを除いて比較するサイト（site_adapters の dedup="strip_query" と各スクリプトの strip_query）
+STRIP_QUERY_SOURCES = frozenset({
+    "cardel-online",
+    "dokkan-toreca",
+    "dorima8",
+    "ichica-main",
+    "kagura-tcg",
+    "moshoripa",
+    "pokepa365",
+    "reveoripa",
+    "risesjp",
+    "torekazi",
+})
+
+# 同じページを指す URL に付いてくる計測用パラメータ
+TRACKING_PARAMS = frozenset({"fbclid", "gclid", "yclid", "mc_cid", "mc_eid"})
+
+# SQLite の変数の上限（999）より少なく
+BATCH = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS urls (
+    source TEXT    NOT NULL,
+    hash   INTEGER NOT NULL,
+    added  REAL    NOT NULL,
+    url    TEXT,
+    fp     INTEGER,
+    PRIMARY KEY (source, hash)
+) WITHOUT ROWID;
+"""
+
+
+def canonical_url(url: str, strip_query: bool = False) -> str:
+    parts = urlsplit((url or "").strip())
+    scheme = parts.scheme.lower()
+    if scheme in ("http", "https", ""):
+        scheme = "https" if parts.netloc else scheme
+    netloc = (parts.hostname or "").lower()
+    try:
+        port = parts.port
+    except ValueError:
+        port = None
+    if port and port not in (80, 443):
+        netloc = f"{netloc}:{port}"
+    path = parts.path or "/"
+    if len(path) > 1:
+        path = path.rstrip("/") or "/"
+    query = ""
+    if not strip_query and parts.query:
+        params = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                  if not k.startswith("utm_") and k not in TRACKING_PARAMS]
+        query = urlencode(sorted(params))
+    return urlunsplit((scheme, netloc, path, query, ""))
+
+
+def url_hash(canonical: str) -> int:
+    """64 bit ハッシュ（SQLite の INTEGER に収まる符号付き）"""
+    digest = hashlib.blake2b(canonical.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+class DedupIndex:
+    """スレッド間で共有してよい（内部でロックする）。複数プロセスからの同時書き込みは SQLite が直列化する"""
+
+    def __init__(self, path: str = INDEX_PATH):
+        self.path = path
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(urls)")}
+        if "fp" not in columns:
+            # 内容の指紋（item_diff）を持たない古いインデックス
+            self._db.execute("ALTER TABLE urls ADD COLUMN fp INTEGER")
+
+    def partition(self, source: str, keep_urls: bool = False) -> "Partition":
+        return Partition(self, source, keep_urls=keep_urls)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+
+class Partition:
+    """1つの source_slug の既存URL。set と同じく `url in partition` で判定できる"""
+
+    def __init__(self, index: DedupIndex, source: str, keep_urls: bool = False):
+        self.index = index
+        self.source = source
+        self.strip_query = source in STRIP_QUERY_SOURCES
+        self.keep_urls = keep_urls
+
+    def key(self, url: str) -> int:
+        return url_hash(canonical_url(url, strip_query=self.strip_query))
+
+    # -----------------------------
+    # 判定
+    # -----------------------------
+    def __contains__(self, url) -> bool:
+        if not url:
+            return False
+        index = self.index
+        with index._lock:
+            row = index._db.execute(
+                "SELECT 1 FROM urls WHERE source = ? AND hash = ?", (self.source, self.key(url))
+            ).fetchone()
+        return row is not None
+
+    def __len__(self) -> int:
+        index = self.index
+        with index._lock:
+            return index._db.execute("SELECT COUNT(*) FROM urls WHERE source = ?", (self.source,)).fetchone()[0]
+
+    def __iter__(self):
+        """keep_urls=True で保存した URL を返す（ハッシュしか持たない行は返せない）"""
+        index = self.index
+        with index._lock:
+            rows = index._db.execute(
+                "SELECT url FROM urls WHERE source = ? AND url IS NOT NULL", (self.source,)
+            ).fetchall()
+        return iter([row[0] for row in rows])
+
+    def lookup(self, urls) -> list:
+        """urls の各要素について、未登録なら None、登録済みなら指紋（未記録なら 0）を同じ順で返す"""
+        urls = list(urls)
+        keys = [self.key(url) if url else None for url in urls]
+        found = {}
+        index = self.index
+        wanted = sorted({k for k in keys if k is not None})
+        with index._lock:
+            for i in range(0, len(wanted), BATCH):
+                chunk = wanted[i:i + BATCH]
+                marks = ",".join("?" * len(chunk))
+                found.update(index._db.execute(
+                    f"SELECT hash, COALESCE(fp, 0) FROM urls WHERE source = ? AND hash IN ({marks})",
+                    (self.source, *chunk),
+                ))
+        return [found.get(k) for k in keys]
+
+    def contains_many(self, urls) -> list:
+        """urls の各要素が既存かどうかを同じ順で返す"""
+        return [fp is not None for fp in self.lookup(urls)]
+
+    def filter_new(self, items: list, field: str = "detail_url") -> list:
+        """items のうち field の URL が未登録のものを返す"""
+        flags = self.contains_many(item.get(field, "") for item in items)
+        return [item for item, known in zip(items, flags) if not known]
+
+    # -----------------------------
+    # 追加・入れ替え
+    # -----------------------------
+    def _rows(self, urls, added: float, fps=None):
+        rows = {}
+        for i, url in enumerate(urls):
+            if url:
+                rows[self.key(url)] = (url if self.keep_urls else None, fps[i] if fps else None)
+        return [(self.source, key, added, url, fp) for key, (url, fp) in rows.items()]
+
+    def add(self, urls, added: float = None, fps=None) -> int:
+        """urls を追加し、新しく増えた件数を返す（1トランザクション）
+
+        fps（urls と同じ順の指紋）を渡すと、登録済みの行も指紋を更新する。
+        """
+        urls = list(urls)
+        rows = self._rows(urls, added or time.time(), fps)
+        index = self.index
+        with index._lock, index._db:
+            before = index._db.execute("SELECT COUNT(*) FROM urls WHERE source = ?", (self.source,)).fetchone()[0]
+            if fps:
+                index._db.executemany(
+                    "INSERT INTO urls VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (source, hash) DO UPDATE SET fp = excluded.fp", rows)
+            else:
+                index._db.executemany("INSERT OR IGNORE INTO urls VALUES (?, ?, ?, ?, ?)", rows)
+            after = index._db.execute("SELECT COUNT(*) FROM urls WHERE source = ?", (self.source,)).fetchone()[0]
+        return after - before
+
+    def replace(self, urls, added: float, keep_after: float) -> None:
+        """全件取得した一覧で置き換える
+
+        一覧にない行は消すが、keep_after 以降に追加した行（一覧取得後の投稿）は残す。
+        一覧にある行は指紋を保ったまま残す。
+        """
+        rows = self._rows(urls, added)
+        index = self.index
+        with index._lock, index._db:
+            index._db.execute("CREATE TEMP TABLE IF NOT EXISTS listed (hash INTEGER PRIMARY KEY)")
+            index._db.execute("DELETE FROM listed")
+            index._db.executemany("INSERT OR IGNORE INTO listed VALUES (?)", [(row[1],) for row in rows])
+            index._db.execute(
+                "DELETE FROM urls WHERE source = ? AND added < ? AND hash NOT IN (SELECT hash FROM listed)",
+                (self.source, keep_after),
+            )
+            index._db.executemany("INSERT OR IGNORE INTO urls VALUES (?, ?, ?, ?, ?)", rows)
+
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def get_index() -> DedupIndex:
+    """プロセス内で共有するインデックス"""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = DedupIndex()
+        return _shared
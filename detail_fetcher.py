@@ -0,0 +1,288 @@
+"""詳細ページの並列取得（ホストごとに同時数を自動調整する asyncio エンジン）
+
+固定の max_workers だと、相手が遅いときは詰め込みすぎ、速いときは
+遅すぎる。ここではホストごとに AIMD（加算増加・乗算減少）で同時数を決める。
+    - 応答が普段どおりの速さで返れば、同時数を少しずつ増やす（1往復あたり +1）
+    - 429 / 5xx / タイムアウト / 接続エラー、または応答時間が
+      基準の LATENCY_FACTOR 倍を超えたら、同時数を半分にする
+失敗した取得はジッター付き指数バックオフで再試行し（Retry-After があれば従う）、
+それでも失敗した URL は failed に残す。
+
+HTTP は http_session の接続プール（再試行なし）を使い、取得と parse は
+スレッドで実行する（aiohttp は使わず requests のまま）。
+cache（page_cache.PageCache）を渡すと条件付き GET になり、304 や本文が
+前回と同じページは parse を省略して前回の結果を返す。
+
+    items, failed = fetch_all(urls, parse)       # parse(url, html) -> dict | None
+    items, failed = fetch_all(urls, parse, cache=PageCache(), cache_key="site-detail:1")
+
+stop_at（stream_fetch.Target の配列）を渡すと、その要素が揃った時点で受信をやめ、
+そこまでの HTML を parse に渡す。
+
+環境変数:
+    DETAIL_INITIAL_CONCURRENCY  ホストごとの同時数の初期値（既定 4）
+    DETAIL_MAX_CONCURRENCY      ホストごとの同時数の上限（既定 24）
+    DETAIL_RETRIES              1 URL あたりの再試行回数（既定 4）
+    DETAIL_REPORT_SEC           進捗を表示する間隔（既定 10 秒、0 で表示しない）
+"""
+import os
+import time
+import random
+import asyncio
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urlparse
+
+import requests
+
+import http_session
+import stream_fetch
+
+INITIAL_CONCURRENCY = int(os.getenv("DETAIL_INITIAL_CONCURRENCY", "4"))
+MAX_CONCURRENCY = int(os.getenv("DETAIL_MAX_CONCURRENCY", "24"))
+RETRIES = int(os.getenv("DETAIL_RETRIES", "4"))
+REPORT_SEC = float(os.getenv("DETAIL_REPORT_SEC", "10"))
+
+# 応答時間が基準のこの倍数を超えたら混雑とみなす
+LATENCY_FACTOR = 2.0
+# 数 ms 単位の揺れで混雑と判定しないよう、これ以下の増加は無視する
+LATENCY_SLACK = 0.05
+BACKOFF_BASE = 0.5
+BACKOFF_CAP = 30.0
+
+
+class HostLimiter:
+    """1ホスト分の同時数（AIMD）"""
+
+    def __init__(self, host: str, initial: int, maximum: int):
+        self.host = host
+        self.limit = float(initial)
+        self.maximum = maximum
+        self.in_flight = 0
+        self.latency = None      # 応答時間の指数移動平均
+        self.baseline = None     # 空いているときの応答時間
+        self._last_decrease = 0.0
+        self._cond = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+
+    async def release(self, outcome: str, elapsed: float):
+        """outcome: ok（成功）/ busy（混雑・失敗）/ neutral（404 など、同時数は変えない）"""
+        async with self._cond:
+            self.in_flight -= 1
+            if outcome == "ok":
+                self._observe(elapsed)
+                if self.latency > max(self.baseline * LATENCY_FACTOR, self.baseline + LATENCY_SLACK):
+                    self._decrease()
+                else:
+                    self.limit = min(self.maximum, self.limit + 1 / self.limit)
+            elif outcome == "busy":
+                self._decrease()
+            self._cond.notify_all()
+
+    def _observe(self, elapsed: float):
+        if self.latency is None:
+            self.latency = self.baseline = elapsed
+            return
+        self.latency = 0.8 * self.latency + 0.2 * elapsed
+        # 基準は速くなればすぐ追従し、遅くなる方向にはゆっくり動かす
+        if self.latency < self.baseline:
+            self.baseline = self.latency
+        else:
+            self.baseline += (self.latency - self.baseline) * 0.01
+
+    def _decrease(self):
+        # 同じ混雑で何度も半減しないよう、1往復分は間を空ける
+        now = time.monotonic()
+        if now - self._last_decrease < (self.latency or 1.0):
+            return
+        self.limit = max(1.0, self.limit / 2)
+        self._last_decrease = now
+
+
+class FetchStats:
+    def __init__(self):
+        self.started = time.monotonic()
+        self.ok = 0
+        self.failed = 0
+        self.retries = 0
+        self.not_modified = 0
+        self.errors = Counter()
+
+    def pages_per_sec(self) -> float:
+        elapsed = time.monotonic() - self.started
+        return self.ok / elapsed if elapsed > 0 else 0.0
+
+    def line(self, hosts: dict) -> str:
+        limits = ", ".join(f"{h}={int(s.limit)}" for h, s in hosts.items())
+        errors = " ".join(f"{k}:{v}" for k, v in sorted(self.errors.items())) or "なし"
+        return (f"📈 {self.pages_per_sec():.1f} pages/sec | 成功 {self.ok} | 失敗 {self.failed} "
+                f"| 再試行 {self.retries} | 304 {self.not_modified} | エラー {errors} | 同時数 {limits}")
+
+
+class _Retryable(Exception):
+    def __init__(self, kind: str, retry_after: float = 0.0):
+        super().__init__(kind)
+        self.kind = kind
+        self.retry_after = retry_after
+
+
+class DetailFetcher:
+    """URL の一覧を取得して parse(url, html) に渡す"""
+
+    def __init__(self, parse, initial: int = INITIAL_CONCURRENCY, max_concurrency: int = MAX_CONCURRENCY,
+                 retries: int = RETRIES, timeout: int = 20, report_sec: float = REPORT_SEC,
+                 cache=None, cache_key: str = "", stop_at=None):
+        self.parse = parse
+        self.stop_at = stop_at
+        self.cache = cache
+        self.cache_key = cache_key or getattr(parse, "__qualname__", "parse")
+        self.initial = max(1, initial)
+        self.max_concurrency = max(self.initial, max_concurrency)
+        self.retries = retries
+        self.timeout = timeout
+        self.report_sec = report_sec
+        self.hosts = {}
+        self.stats = FetchStats()
+        self.failed = []
+        self._session = None
+        self._executor = None
+
+    def _host(self, url: str) -> HostLimiter:
+        host = urlparse(url).netloc
+        if host not in self.hosts:
+            self.hosts[host] = HostLimiter(host, self.initial, self.max_concurrency)
+        return self.hosts[host]
+
+    def _get(self, url: str):
+        """スレッドで実行: 取得して parse する"""
+        headers = self.cache.validators(url) if self.cache else {}
+        stream = bool(self.stop_at)
+        res = self._session.get(url, headers=headers, timeout=self.timeout, stream=stream)
+        if res.status_code == 304 and self.cache:
+            res.close()
+            self.stats.not_modified += 1
+            result = self.cache.not_modified(url, self.cache_key, self.parse)
+            if result is not None:
+                return result
+            # 検証子を送った後にキャッシュから消えていた
+            res = self._session.get(url, timeout=self.timeout, stream=stream)
+        if res.status_code == 429 or res.status_code >= 500:
+            res.close()
+            raise _Retryable(str(res.status_code), _retry_after(res))
+        if not res.ok:
+            res.close()
+            res.raise_for_status()
+        if stream:
+            text = stream_fetch.read_until(res, self.stop_at)
+        else:
+            res.encoding = res.encoding or res.apparent_encoding
+            text = res.text
+        if self.cache:
+            return self.cache.store(url, res.headers, text, self.cache_key, self.parse)
+        return self.parse(url, text)
+
+    async def _fetch(self, url: str):
+        limiter = self._host(url)
+        loop = asyncio.get_running_loop()
+        for attempt in range(self.retries + 1):
+            await limiter.acquire()
+            start = time.monotonic()
+            outcome = "ok"
+            try:
+                item = await loop.run_in_executor(self._executor, self._get, url)
+                self.stats.ok += 1
+                return url, item
+            except _Retryable as e:
+                outcome, kind, retry_after = "busy", e.kind, e.retry_after
+            except (requests.Timeout, requests.ConnectionError) as e:
+                outcome, kind, retry_after = "busy", type(e).__name__, 0.0
+            except requests.HTTPError as e:
+                outcome = "neutral"
+                return self._fail(url, str(e.response.status_code))
+            except Exception as e:
+                outcome = "neutral"
+                return self._fail(url, f"parse:{type(e).__name__}")
+            finally:
+                await limiter.release(outcome, time.monotonic() - start)
+
+            self.stats.errors[kind] += 1
+            if attempt == self.retries:
+                break
+            self.stats.retries += 1
+            delay = random.uniform(0, min(BACKOFF_CAP, BACKOFF_BASE * 2 ** attempt))
+            await asyncio.sleep(max(delay, retry_after))
+        return self._fail(url, kind, counted=True)
+
+    def _fail(self, url: str, kind: str, counted: bool = False):
+        if not counted:
+            self.stats.errors[kind] += 1
+        self.stats.failed += 1
+        self.failed.append((url, kind))
+        return url, None
+
+    async def _report(self):
+        while True:
+            await asyncio.sleep(self.report_sec)
+            print(self.stats.line(self.hosts))
+
+    async def iter_results(self, urls):
+        """取得できた順に (url, item) を返す（失敗した URL は item が None）
+
+        取得中・取得済みで受け取られていないものは同時数の上限の2倍までに抑え、
+        呼び出し側の処理が遅いときは新しい取得を始めない（メモリを一定に保つ）。
+        """
+        urls = list(dict.fromkeys(urls))
+        if not urls:
+            return
+        host_count = len({urlparse(u).netloc for u in urls})
+        window = self.max_concurrency * host_count * 2
+        self._session = http_session.make_session(self.max_concurrency, retries=0)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency * host_count)
+        reporter = asyncio.create_task(self._report()) if self.report_sec > 0 else None
+        queue = iter(urls)
+        pending = set()
+        try:
+            while True:
+                for url in queue:
+                    pending.add(asyncio.create_task(self._fetch(url)))
+                    if len(pending) >= window:
+                        break
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    yield task.result()
+        finally:
+            for task in pending:
+                task.cancel()
+            if reporter:
+                reporter.cancel()
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._session.close()
+            print(self.stats.line(self.hosts))
+
+    async def run(self, urls) -> list:
+        """parse の結果（None 以外）を取得できた順に返す"""
+        items = []
+        async for _, item in self.iter_results(urls):
+            if item:
+                items.append(item)
+        return items
+
+
+def _retry_after(res) -> float:
+    try:
+        return float(res.headers.get("Retry-After", 0))
+    except ValueError:
+        return 0.0
+
+
+def fetch_all(urls, parse, **kwargs):
+    """同期版: (parse の結果の配列, 失敗した (url, 理由) の配列) を返す"""
+    fetcher = DetailFetcher(parse, **kwargs)
+    items = asyncio.run(fetcher.run(urls))
+    return items, fetcher.failed
@@ -4,7 +4,9 @@ from urllib.parse import urljoin
 
 import gspread
 from google.oauth2.service_account import Credentials
-from playwright.sync_api import sync_playwright
+from shared_browser import sync_playwright
+import readiness
+import outbox
 
 BASE_URL = "https://dorima8.com"
 TARGET_URL = BASE_URL
@@ -49,7 +51,7 @@ def scrape_banners(existing_urls: set):
         page = browser.new_page()
         try:
             page.goto(TARGET_URL, timeout=60000, wait_until="load")
-            page.wait_for_timeout(5000)
+            readiness.wait_ready(page, "dorima8-banners", ".slick-track img", images=".slick-track img", ceiling_ms=5000)
             slides = page.query_selector_all(".slick-track img")
         except Exception as e:
             print(f"🛑 読み込み失敗: {e}")
@@ -78,11 +80,12 @@ def main() -> None:
     sheet = get_sheet()
     existing = fetch_existing_image_urls(sheet)
     rows = scrape_banners(existing)
-    if not rows:
+    # 前回追記できなかった行があれば一緒に追記する
+    appended = outbox.append_rows(sheet, rows, value_input_option="USER_ENTERED")
+    if not appended:
         print("📭 新規データなし")
         return
-    sheet.append_rows(rows, value_input_option="USER_ENTERED")
-    print(f"📥 {len(rows)} 件追記完了")
+    print(f"📥 {appended} 件追記完了")
 
 
 if __name__ == "__main__":
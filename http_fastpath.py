@@ -0,0 +1,123 @@
+"""ブラウザを使わない HTTP 取得（高速パス）と、サイトごとの取得方法の記録
+
+サーバー側で描画しているサイト（scrape_iris_toreca_to_wp.py と同じ型）は
+requests + BeautifulSoup だけで取得できる。Next.js のサイトは
+<script id="__NEXT_DATA__"> に一覧データが JSON で埋め込まれている。
+
+SiteAdapter に http_extract を指定したサイトは、まず HTTP で取得する。
+HTTP の結果は、ブラウザ（DOM）で取得した結果と URL・タイトル・PT が一致して
+はじめて信用し（api_capture と同じ考え方）、それまではブラウザの結果を使う。
+どちらで取得できたかは FASTPATH_STATE_PATH（既定 .cache/fetch_paths.json）に記録する。
+    - ブラウザが必要だった（0件・不一致）サイトは FASTPATH_RETRY_DAYS（既定 7）日のあいだ
+      HTTP を試さない
+    - 確認済みの HTTP も FASTPATH_RETRY_DAYS 日ごと、または件数が確認時から
+      VERIFY_COUNT_DRIFT 以上ずれたら、ブラウザと突き合わせ直す
+"""
+import os
+import re
+import json
+import time
+
+import http_session
+from http_session import DEFAULT_UA
+
+STATE_PATH = os.getenv("FASTPATH_STATE_PATH", ".cache/fetch_paths.json")
+RETRY_DAYS = float(os.getenv("FASTPATH_RETRY_DAYS", "7"))
+
+# 確認時の件数からこの割合以上ずれたら、HTTP の結果をブラウザで確認し直す
+VERIFY_COUNT_DRIFT = 0.2
+
+_NEXT_DATA_RE = re.compile(
+    r'<script[^>]*id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL
+)
+
+
+# -----------------------------
+# HTTP 取得
+# -----------------------------
+def fetch_html(url: str, user_agent: str = None, timeout: int = 30) -> str:
+    res = http_session.get(url, headers={"User-Agent": user_agent or DEFAULT_UA}, timeout=timeout)
+    res.raise_for_status()
+    res.encoding = res.encoding or res.apparent_encoding
+    return res.text
+
+
+def parse_html(html: str):
+    """BeautifulSoup で解析する
+
+    bs4 はブラウザ取得だけのワークフローには入っていないので、ここで読み込む。
+    ない環境では ImportError になり、SiteAdapter.scrape_http がブラウザ取得に切り替える。
+    """
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(html, "html.parser")
+
+
+def next_data(html: str):
+    """__NEXT_DATA__ の JSON を返す（なければ None）"""
+    m = _NEXT_DATA_RE.search(html)
+    if not m:
+        return None
+    try:
+        return json.loads(m.group(1))
+    except ValueError:
+        return None
+
+
+def iter_dicts(obj):
+    """JSON を深さ優先でたどり、すべての dict を返す"""
+    stack = [obj]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, dict):
+            yield node
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend(reversed(node))
+
+
+# -----------------------------
+# 取得方法の記録
+# -----------------------------
+class PathMemory:
+    """サイトごとに、前回どちらの方法（http / browser）で取得できたかを記録する"""
+
+    def __init__(self, path: str = STATE_PATH):
+        self.path = path
+        self.state = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def should_try_http(self, slug: str) -> bool:
+        entry = self.state.get(slug)
+        if not entry or entry["path"] == "http":
+            return True
+        return time.time() - entry["checked"] >= RETRY_DAYS * 86400
+
+    def http_verified(self, slug: str, count: int) -> bool:
+        """HTTP の結果（count 件）をブラウザと突き合わせずに使ってよいか"""
+        entry = self.state.get(slug)
+        if not entry or entry["path"] != "http" or not entry.get("count"):
+            return False
+        if time.time() - entry["checked"] >= RETRY_DAYS * 86400:
+            return False
+        return abs(count - entry["count"]) <= entry["count"] * VERIFY_COUNT_DRIFT
+
+    def remember(self, slug: str, path: str, count: int = None) -> None:
+        """取得方法を記録する（http は DOM と一致を確認したときの件数も持つ）"""
+        # 別サイトの結果を上書きしないよう、保存直前に読み直してから更新する
+        self.state = self._load()
+        self.state[slug] = {"path": path, "checked": time.time()}
+        if count is not None:
+            self.state[slug]["count"] = count
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "w", encoding="utf-8") as f:
+                json.dump(self.state, f, ensure_ascii=False, indent=2)
+        except OSError as e:
+            print(f"⚠️ 取得方法の記録失敗: {e}")
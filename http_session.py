@@ -0,0 +1,93 @@
+"""HTTP 取得の共通セッション（接続の使い回し）
+
+requests.get() を毎回呼ぶと、リクエストごとに TCP + TLS 接続を張り直す。
+ここでは requests.Session を1つ共有し、ホストごとに接続プールを持たせる。
+
+    - プールの大きさ（ホストごとの同時接続数）はワーカー数に合わせる
+      （get_session(workers) で必要なら広げる）
+    - Keep-Alive、gzip / deflate（brotli が入っていれば br も）
+    - 既定の User-Agent
+    - 接続エラー・429・5xx は GET / HEAD のみ指数バックオフで再試行
+
+requests.Session はスレッド間で共有して GET する用途なら問題ない。
+"""
+import os
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.request import ACCEPT_ENCODING
+from urllib3.util.retry import Retry
+
+DEFAULT_UA = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+DEFAULT_WORKERS = int(os.getenv("HTTP_POOL_SIZE", "10"))
+RETRIES = int(os.getenv("HTTP_RETRIES", "3"))
+DEFAULT_TIMEOUT = 30
+
+# 同時に接続を保持しておくホスト数（スクレイパー1本あたりの取得先は数ホスト）
+POOL_HOSTS = 16
+
+_lock = threading.Lock()
+_session = None
+_pool_size = 0
+
+
+def _retry(retries: int) -> Retry:
+    return Retry(
+        total=retries,
+        backoff_factor=0.5,
+        status_forcelist=(429, 500, 502, 503, 504),
+        allowed_methods=("GET", "HEAD"),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+
+
+def _mount(session: requests.Session, pool_size: int, retries: int = RETRIES) -> None:
+    adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=pool_size, max_retries=_retry(retries))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+
+
+def make_session(pool_size: int = None, retries: int = RETRIES) -> requests.Session:
+    """共有しない独立したセッションを作る
+
+    再試行を呼び出し側で制御したいとき（detail_fetcher）は retries=0 にする。
+    """
+    session = requests.Session()
+    session.headers.update({
+        "User-Agent": DEFAULT_UA,
+        "Accept-Encoding": ACCEPT_ENCODING,
+        "Connection": "keep-alive",
+    })
+    _mount(session, max(pool_size or DEFAULT_WORKERS, 1), retries)
+    return session
+
+
+def get_session(workers: int = None) -> requests.Session:
+    """共有セッションを返す。workers が今のプールより大きければプールを広げる"""
+    global _session, _pool_size
+    size = max(workers or DEFAULT_WORKERS, 1)
+    with _lock:
+        if _session is None:
+            _session = make_session(size)
+        elif size > _pool_size:
+            _mount(_session, size)
+        _pool_size = max(_pool_size, size)
+        return _session
+
+
+def get(url: str, **kwargs) -> requests.Response:
+    """共有セッションで GET する（timeout 既定 30 秒）"""
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    return get_session().get(url, **kwargs)
+
+
+def head(url: str, **kwargs) -> requests.Response:
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    return get_session().head(url, **kwargs)
@@ -0,0 +1,87 @@
+"""送信前の差分判定（新規と、内容が変わったものだけを upsert に送る）
+
+これまでは detail_url が既存のアイテムをすべて落としていたので、サイト側で
+PT・タイトル・画像が変わっても WordPress には反映されなかった（重複除外のない
+cardel は逆に毎回全件を送っていた）。ここでは送ったアイテムの内容の指紋
+（正規化したフィールドの 64 bit ハッシュ）を dedup_index の fp 列に持ち、
+
+    新規        既存URLにない
+    変更        既存で、指紋が前回送ったものと違う
+    初回確認    既存だが指紋がまだない（この仕組みを入れる前の投稿。1回だけ送る）
+    変更なし    既存で、指紋が同じ
+
+に分けて、変更なし以外を送る。指紋は送信に成功したバッチだけ記録する
+（wp_existing.recorder が on_sent で記録する）ので、失敗したものは次回も送られる。
+
+指紋に含めないフィールド: detail_url（キー）・source_slug・extra（scraped_at など毎回変わる）。
+"""
+import json
+
+import dedup_index
+
+IGNORED_FIELDS = frozenset({"detail_url", "source_slug", "extra"})
+
+CATEGORIES = ("new", "changed", "baseline", "unchanged")
+LABELS = {"new": "新規", "changed": "変更", "baseline": "初回確認", "unchanged": "変更なし"}
+
+
+def _normalize(field: str, value):
+    if isinstance(value, str):
+        value = " ".join(value.split())
+        if field == "image_url" and value:
+            value = dedup_index.canonical_url(value)
+    return value
+
+
+def fingerprint(item: dict) -> int:
+    """送信内容の指紋（0 は「未記録」を表すので使わない）"""
+    fields = {k: _normalize(k, v) for k, v in item.items() if k not in IGNORED_FIELDS}
+    text = json.dumps(fields, ensure_ascii=False, sort_keys=True, default=str)
+    return dedup_index.url_hash(text) or 1
+
+
+def split(items: list, existing, key="detail_url"):
+    """送るべきアイテムとカテゴリ別件数を返す
+
+    existing は wp_existing.fetch() の Partition（set なら指紋がないので、既存は送らない）。
+    key はキーにするフィールド名か、アイテムからキーを返す関数。
+    同じキーが複数あるときは最初の1件だけを扱うので、リンク先が共通のバナーのように
+    detail_url が同じでも別物のアイテムは、区別できるもの（image_url など）をキーにし、
+    wp_existing.recorder にも同じ key を渡すこと。
+    """
+    key_of = key if callable(key) else (lambda item: item.get(key, ""))
+    counts = dict.fromkeys(CATEGORIES, 0)
+
+    seen = set()
+    unique = []
+    for item in items:
+        k = key_of(item)
+        if k and k not in seen:
+            seen.add(k)
+            unique.append((k, item))
+
+    if hasattr(existing, "lookup"):
+        stored = existing.lookup(k for k, _ in unique)
+    else:
+        stored = [1 if k in existing else None for k, _ in unique]
+
+    send = []
+    for (_, item), fp in zip(unique, stored):
+        if fp is None:
+            category = "new"
+        elif not hasattr(existing, "lookup"):
+            category = "unchanged"
+        elif fp == 0:
+            category = "baseline"
+        elif fp != fingerprint(item):
+            category = "changed"
+        else:
+            category = "unchanged"
+        counts[category] += 1
+        if category != "unchanged":
+            send.append(item)
+    return send, counts
+
+
+def line(counts: dict) -> str:
+    return "🧮 " + " / ".join(f"{LABELS[c]} {counts[c]} 件" for c in CATEGORIES)
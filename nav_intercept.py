@@ -0,0 +1,93 @@
+"""一覧ページのクリック遷移を横取りして、遷移先 URL だけを取り出す
+
+カードが <a href> ではなく onClick でルーター遷移する SPA では、詳細 URL を
+知るために「クリック → 遷移 → 戻る」を件数分繰り返していた。ここでは
+    - history.pushState / replaceState, next.router.push, window.open を記録のみにする
+    - ドキュメント遷移は page.route で中止し、リクエスト URL を記録する
+ことで、一覧ページを離れずにクリックごとの遷移先を得る（sync API 用）。
+"""
+from urllib.parse import urlparse
+
+NAV_HOOK_JS = """
+() => {
+    window.__navTarget = null;
+    if (window.__navHooked) return;
+    window.__navHooked = true;
+    const record = (url) => {
+        const href = new URL(String(url), location.href).href;
+        if (href.split('#')[0] === location.href.split('#')[0]) return false;
+        window.__navTarget = href;
+        return true;
+    };
+    for (const name of ['pushState', 'replaceState']) {
+        const original = history[name].bind(history);
+        history[name] = (state, title, url) => {
+            if (url != null && record(url)) return;
+            return original(state, title, url);
+        };
+    }
+    const router = window.next && window.next.router;
+    if (router && typeof router.push === 'function') {
+        const push = router.push.bind(router);
+        router.push = (url, as, options) => {
+            const target = typeof url === 'string' ? url : (as || (url && url.pathname) || '');
+            if (target && record(target)) return Promise.resolve(true);
+            return push(url, as, options);
+        };
+    }
+    const open = window.open;
+    window.open = (url, ...rest) => (url && record(url)) ? null : open.call(window, url, ...rest);
+}
+"""
+
+
+def _path_key(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+
+
+class NavInterceptor:
+    """一覧ページに組み込み、クリックごとの遷移先を返す
+
+    使い方:
+        nav = NavInterceptor(page, LISTING_URL)   # goto より前
+        page.goto(LISTING_URL) ...
+        nav.hook()                               # 一覧の描画後（再読み込みのたびに）
+        url = nav.click(element)
+    """
+
+    def __init__(self, page, listing_url: str):
+        self.page = page
+        self.listing_url = listing_url
+        self._blocked = None
+        page.route("**/*", self._route)
+
+    def _route(self, route):
+        request = route.request
+        if (request.resource_type == "document" and request.frame == self.page.main_frame
+                and _path_key(request.url) != _path_key(self.listing_url)):
+            self._blocked = request.url
+            route.abort()
+        else:
+            route.fallback()
+
+    def hook(self) -> None:
+        self.page.evaluate(NAV_HOOK_JS)
+
+    def left_listing(self) -> bool:
+        """横取りできずに一覧ページから離れたか"""
+        return _path_key(self.page.url) != _path_key(self.listing_url)
+
+    def click(self, element, timeout_ms: int = 3000) -> str:
+        """要素をクリックし、遷移先 URL を返す（なければ空文字）"""
+        self._blocked = None
+        self.page.evaluate("() => { window.__navTarget = null; }")
+        element.click(no_wait_after=True)
+        for _ in range(max(1, timeout_ms // 100)):
+            url = self._blocked or self.page.evaluate("() => window.__navTarget")
+            if url:
+                return url
+            if self.left_listing():
+                return self.page.url
+            self.page.wait_for_timeout(100)
+        return ""
@@ -0,0 +1,199 @@
+"""送信待ちデータの永続キュー（WordPress upsert・Banner Ingest・スプレッドシート追記）
+
+送信に失敗すると、これまではエラーを表示するだけで取得したデータは失われ、
+次の実行でブラウザからサイト全体を取り直すしかなかった。ここでは送る前に
+OUTBOX_DIR（既定 .cache/outbox）の追記専用ファイル（送信先ごとに1つ）へ
+
+    {"put": キー, "payload": 送るデータ, "at": 時刻}
+
+を書き、送れたら {"done": [キー, ...]} を追記する。次の実行では done になっていない
+ものを pending() で読み出し、今回のデータとキーでまとめて（同じキーは新しい方を残す）
+一度に送る。すべて送れたらファイルを消す（compact）。
+
+キー（冪等キー）は送信先で同じものを指す値から作る。
+    upsert      source_slug + 正規化した detail_url（item_key）
+    その他      内容の JSON のハッシュ（payload_key）
+OUTBOX_MAX_AGE_DAYS（既定 7）より古いものは、送れないまま残り続けないよう捨てる。
+"""
+import os
+import json
+import time
+import hashlib
+import threading
+
+import requests
+
+import dedup_index
+
+OUTBOX_DIR = os.getenv("OUTBOX_DIR", ".cache/outbox")
+MAX_AGE_SEC = float(os.getenv("OUTBOX_MAX_AGE_DAYS", "7")) * 86400
+
+# 同じファイルを開く Outbox（同じ送信先の別の WpSender など）で共有するロック
+_locks = {}
+_locks_lock = threading.Lock()
+
+
+def _lock_for(path: str) -> threading.RLock:
+    with _locks_lock:
+        return _locks.setdefault(os.path.abspath(path), threading.RLock())
+
+
+def payload_key(payload) -> str:
+    text = json.dumps(payload, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=12).hexdigest()
+
+
+def item_key(item: dict) -> str:
+    """upsert アイテムのキー（WordPress 側で同じ投稿になるもの）"""
+    url = item.get("detail_url") if isinstance(item, dict) else None
+    if not url:
+        return payload_key(item)
+    return f"{item.get('source_slug') or ''}|{dedup_index.canonical_url(url)}"
+
+
+class Outbox:
+    """スレッド間で共有してよい。同じ送信先の Outbox どうしも同じロックを使う"""
+
+    def __init__(self, channel: str, directory: str = OUTBOX_DIR):
+        self.channel = channel
+        name = hashlib.sha1(channel.encode("utf-8")).hexdigest()[:16]
+        self.path = os.path.join(directory, f"{name}.jsonl")
+        self._lock = _lock_for(self.path)
+
+    def _append(self, records: list) -> None:
+        if not records:
+            return
+        text = "".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in records)
+        with self._lock:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(text)
+                f.flush()
+                os.fsync(f.fileno())
+
+    def put(self, entries) -> None:
+        """(キー, データ) の組を送信待ちとして書く"""
+        now = time.time()
+        self._append([{"put": key, "payload": payload, "at": now} for key, payload in entries])
+
+    def done(self, keys) -> None:
+        keys = list(keys)
+        if keys:
+            self._append([{"done": keys}])
+
+    def _load(self, warn: bool = True) -> dict:
+        """送信待ちの キー -> (データ, 書いた時刻)。同じキーは最後に書いたもの"""
+        entries = {}
+        with self._lock:
+            try:
+                f = open(self.path, encoding="utf-8")
+            except FileNotFoundError:
+                return {}
+            with f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue    # 書き込み途中で止まった最後の行
+                    if "put" in record:
+                        entries[record["put"]] = (record["payload"], record.get("at", 0))
+                    else:
+                        for key in record.get("done", []):
+                            entries.pop(key, None)
+        cutoff = time.time() - MAX_AGE_SEC
+        expired = [key for key, (_, at) in entries.items() if at < cutoff]
+        if expired and warn:
+            print(f"⚠️ 送信待ちのうち {len(expired)} 件は古いため破棄します（{self.channel}）")
+        for key in expired:
+            del entries[key]
+        return entries
+
+    def pending(self) -> dict:
+        """送信待ちの キー -> データ"""
+        return {key: payload for key, (payload, _) in self._load().items()}
+
+    def compact(self) -> int:
+        """送信待ちだけを残してファイルを書き直し、残った件数を返す（0 ならファイルを消す）
+
+        読み込みから置き換えまでロックを持ち続け、その間の put() を取りこぼさない。
+        """
+        with self._lock:
+            entries = self._load(warn=False)
+            try:
+                if not entries:
+                    if os.path.exists(self.path):
+                        os.remove(self.path)
+                    return 0
+                tmp = f"{self.path}.{os.getpid()}.tmp"
+                with open(tmp, "w", encoding="utf-8") as f:
+                    for key, (payload, at) in entries.items():
+                        f.write(json.dumps({"put": key, "payload": payload, "at": at},
+                                           ensure_ascii=False, default=str) + "\n")
+                os.replace(tmp, self.path)
+            except OSError as e:
+                print(f"⚠️ 送信待ちファイルの整理失敗: {e}")
+        return len(entries)
+
+
+def merge(pending: dict, entries) -> dict:
+    """前回の送信待ちと今回のデータをキーでまとめる（同じキーは今回の方を残す）"""
+    merged = dict(pending)
+    for key, payload in entries:
+        merged.pop(key, None)
+        merged[key] = payload
+    return merged
+
+
+# -----------------------------
+# スプレッドシート追記
+# -----------------------------
+def append_rows(sheet, rows: list, value_input_option: str = "USER_ENTERED") -> int:
+    """前回追記できなかった行と rows をまとめて追記し、追記した行数を返す
+
+    失敗したら行を送信待ちに残したまま例外を送出する。
+    """
+    box = Outbox(f"sheet:{sheet.spreadsheet.id}:{sheet.id}")
+    pending = box.pending()
+    entries = [(payload_key(row), row) for row in rows]
+    box.put(entries)
+    merged = merge(pending, entries)
+    if not merged:
+        return 0
+    if pending:
+        print(f"📤 前回追記できなかった {len(pending)} 行も一緒に追記します")
+    sheet.append_rows(list(merged.values()), value_input_option=value_input_option)
+    box.done(merged)
+    box.compact()
+    return len(merged)
+
+
+# -----------------------------
+# Banner Ingest
+# -----------------------------
+def banner_key(banner: dict) -> str:
+    return f"{banner.get('site_name') or ''}|{dedup_index.canonical_url(banner.get('image_url') or '')}"
+
+
+def post_banners(api_url: str, banners: list, auth=None, timeout: int = 30):
+    """Banner Ingest へ1回の POST で送り、レスポンスを返す（送るものがなければ None）
+
+    バナーはサイトごとの一覧なので、今回取得できたサイトは今回の一覧を送り、
+    取得できなかったサイトは前回送れなかった一覧を一緒に送る。
+    2xx 以外のレスポンスや例外のときは送信待ちに残す（例外はそのまま送出する）。
+    """
+    box = Outbox(f"banner:{api_url}")
+    pending = box.pending()
+    sites = {banner.get("site_name") for banner in banners}
+    replay = {key: banner for key, banner in pending.items() if banner.get("site_name") not in sites}
+    entries = [(banner_key(banner), banner) for banner in banners]
+    box.put(entries)
+    merged = merge(replay, entries)
+    if not merged:
+        return None
+    if replay:
+        print(f"📤 前回送れなかったバナー {len(replay)} 件も一緒に送ります")
+    res = requests.post(api_url, json=list(merged.values()), auth=auth, timeout=timeout)
+    if res.ok:
+        box.done([*pending, *merged])
+        box.compact()
+    return res
@@ -0,0 +1,139 @@
+"""詳細ページの HTTP キャッシュ（条件付き GET）
+
+URL ごとに ETag / Last-Modified と圧縮した本文を PAGE_CACHE_PATH
+（既定 .cache/page_cache.sqlite）に保存する。次回は If-None-Match /
+If-Modified-Since を付けて取得し、304 なら本文を受け取らずに前回の結果を使う。
+
+parse の結果も本文のハッシュと一緒に保存しておき、304 のとき、または
+200 でも本文が前回と同じとき（検証子を返さないサーバー）は parse し直さない。
+parse の実装を変えたときは parser（キー）を変えれば古い結果は使われない。
+
+合計サイズが PAGE_CACHE_MAX_MB（既定 200）を超えたら、最後に使ってから
+時間が経ったものから消す（LRU）。
+"""
+import os
+import json
+import time
+import zlib
+import sqlite3
+import hashlib
+import threading
+
+CACHE_PATH = os.getenv("PAGE_CACHE_PATH", ".cache/page_cache.sqlite")
+MAX_BYTES = int(float(os.getenv("PAGE_CACHE_MAX_MB", "200")) * 1024 * 1024)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS pages (
+    url           TEXT PRIMARY KEY,
+    etag          TEXT,
+    last_modified TEXT,
+    body          BLOB,
+    body_hash     TEXT,
+    parser        TEXT,
+    parsed        TEXT,
+    size          INTEGER,
+    accessed      REAL
+);
+CREATE INDEX IF NOT EXISTS pages_accessed ON pages (accessed);
+"""
+
+
+def body_hash(body: bytes) -> str:
+    return hashlib.blake2b(body, digest_size=16).hexdigest()
+
+
+class PageCache:
+    """スレッド間で共有してよい（内部でロックする）"""
+
+    def __init__(self, path: str = CACHE_PATH, max_bytes: int = MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.executescript(_SCHEMA)
+        self.reused = 0     # parse を省略した回数
+        self._total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+    def validators(self, url: str) -> dict:
+        """条件付き GET 用のヘッダー（キャッシュになければ空）"""
+        with self._lock:
+            row = self._db.execute("SELECT etag, last_modified FROM pages WHERE url = ?", (url,)).fetchone()
+        headers = {}
+        if row and row[0]:
+            headers["If-None-Match"] = row[0]
+        if row and row[1]:
+            headers["If-Modified-Since"] = row[1]
+        return headers
+
+    def not_modified(self, url: str, parser: str, parse):
+        """304 のとき: 前回の parse 結果を返す（parser が違えば保存済みの本文を parse し直す）"""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body, parser, parsed FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            self._db.execute("UPDATE pages SET accessed = ? WHERE url = ?", (time.time(), url))
+            self._db.commit()
+        if row is None:
+            return None
+        body, cached_parser, parsed = row
+        if cached_parser == parser and parsed is not None:
+            self.reused += 1
+            return json.loads(parsed)
+        text = zlib.decompress(body).decode("utf-8")
+        result = parse(url, text)
+        self._save_parsed(url, parser, result)
+        return result
+
+    def store(self, url: str, headers, text: str, parser: str, parse):
+        """200 のとき: 本文を保存し、本文が前回と同じなら前回の parse 結果を返す"""
+        body = text.encode("utf-8")
+        digest = body_hash(body)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT body_hash, parser, parsed, size FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+        if row and row[0] == digest and row[1] == parser and row[2] is not None:
+            result = json.loads(row[2])
+            self.reused += 1
+        else:
+            result = parse(url, text)
+
+        compressed = zlib.compress(body, 6)
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, headers.get("ETag"), headers.get("Last-Modified"), compressed, digest,
+                 parser, json.dumps(result, ensure_ascii=False), len(compressed), time.time()),
+            )
+            self._total += len(compressed) - (row[3] if row else 0)
+            if self._total > self.max_bytes:
+                self._evict()
+            self._db.commit()
+        return result
+
+    def _save_parsed(self, url: str, parser: str, result) -> None:
+        with self._lock:
+            self._db.execute(
+                "UPDATE pages SET parser = ?, parsed = ? WHERE url = ?",
+                (parser, json.dumps(result, ensure_ascii=False), url),
+            )
+            self._db.commit()
+
+    def _evict(self) -> None:
+        # 毎回少しずつ消さないよう、上限の 9 割まで下げる
+        target = self.max_bytes * 0.9
+        rows = self._db.execute("SELECT url, size FROM pages ORDER BY accessed").fetchall()
+        removed = []
+        for url, size in rows:
+            if self._total <= target:
+                break
+            removed.append((url,))
+            self._total -= size
+        self._db.executemany("DELETE FROM pages WHERE url = ?", removed)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
@@ -0,0 +1,70 @@
+"""pokeca-chart のカード価格の確認履歴と、価格更新の優先順位
+
+カードごとに「前回の価格・最後に確認した時刻・確認回数・価格が変わっていた回数」を
+PRICE_HISTORY_PATH（既定 .cache/pokeca_prices.json）に記録する。
+
+価格更新では、1回の実行で取得するページ数（予算）の範囲で、
+    優先度 = 価格が変わる確率 × 前回確認からの経過時間
+の高いカードから取得する。変わる確率は (変化回数 + 1) / (確認回数 + 2)。
+よく値動きするカードは頻繁に、動かないカードはたまに確認されるようになる。
+一度も確認していないカードは STALE_CAP_HOURS だけ経過したものとして扱う。
+"""
+import os
+import json
+import time
+
+HISTORY_PATH = os.getenv("PRICE_HISTORY_PATH", ".cache/pokeca_prices.json")
+
+# 経過時間の上限（未確認のカードが既知のカードより常に優先されないように）
+STALE_CAP_HOURS = 24 * 30
+
+
+class PriceHistory:
+    def __init__(self, path: str = HISTORY_PATH):
+        self.path = path
+        self.cards = self._load()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def priority(self, url: str, now: float) -> float:
+        entry = self.cards.get(url)
+        if not entry:
+            return 0.5 * STALE_CAP_HOURS
+        rate = (entry["changes"] + 1) / (entry["checks"] + 2)
+        age_hours = min((now - entry["checked"]) / 3600, STALE_CAP_HOURS)
+        return rate * age_hours
+
+    def plan(self, urls, budget: int) -> list:
+        """優先度の高い順に最大 budget 件の URL を返す"""
+        now = time.time()
+        ranked = sorted(set(urls), key=lambda u: self.priority(u, now), reverse=True)
+        return ranked[:max(budget, 0)]
+
+    def record(self, url: str, prices: dict) -> bool:
+        """確認結果を記録し、前回から価格が変わったかを返す（初回は True）"""
+        entry = self.cards.get(url)
+        now = time.time()
+        if entry is None:
+            self.cards[url] = {"prices": prices, "checked": now, "checks": 1, "changes": 0}
+            return True
+        changed = entry["prices"] != prices
+        entry["checks"] += 1
+        entry["changes"] += int(changed)
+        entry["checked"] = now
+        entry["prices"] = prices
+        return changed
+
+    def save(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self.cards, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"⚠️ 価格履歴の保存失敗: {e}")
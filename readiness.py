@@ -0,0 +1,207 @@
+"""固定待機（wait_for_timeout / time.sleep）の代わりに使う準備完了待ち
+
+待機条件:
+    selector   要素数が stable_ms のあいだ変化しない（min_count 件以上）
+    images     対象 img の src がすべて空でない（data: のプレースホルダーは未完了扱い）
+    xhr        指定ホストへの XHR/fetch が stable_ms のあいだ 0 件（watch_xhr で goto 前に登録）
+
+条件を満たさなくても ceiling_ms で打ち切って先に進む（従来の固定待機と同じ扱い）。
+サイトごとの所要時間は表示し、READINESS_LOG_PATH（既定 .cache/readiness.json）に記録する。
+上限を詰めるときの目安に使う。記録はメモリにためておき、プロセス終了時に1回だけ書く
+（URL ごとに待つループで毎回ファイルを読み書きしない）。
+上限（ceiling_ms）は、置き換えた固定待機と同じ値を呼び出し側で渡す。
+"""
+import os
+import re
+import json
+import time
+import atexit
+import asyncio
+import threading
+
+LOG_PATH = os.getenv("READINESS_LOG_PATH", ".cache/readiness.json")
+DEFAULT_CEILING_MS = int(os.getenv("READINESS_CEILING_MS", "15000"))
+DEFAULT_STABLE_MS = 500
+POLL_MS = 100
+
+# 1回の評価で要素数・画像の状態・readyState をまとめて返す
+_PROBE_JS = """
+([selector, images]) => {
+    const count = selector ? document.querySelectorAll(selector).length : 0;
+    let imagesReady = true;
+    if (images) {
+        for (const img of document.querySelectorAll(images)) {
+            const src = (img.getAttribute('src') || '').trim();
+            if (!src || src.startsWith('data:')) { imagesReady = false; break; }
+        }
+    }
+    return {count, imagesReady, loaded: document.readyState === 'complete'};
+}
+"""
+
+
+# -----------------------------
+# XHR 監視
+# -----------------------------
+class PendingXHR:
+    """指定ホストへの未完了 XHR/fetch を数える"""
+
+    def __init__(self, host_pattern: str):
+        self.pattern = re.compile(host_pattern)
+        self.pending = set()
+        self.last_change = time.time()
+
+    def _matches(self, request) -> bool:
+        return request.resource_type in ("xhr", "fetch") and bool(self.pattern.search(request.url))
+
+    def on_request(self, request):
+        if self._matches(request):
+            self.pending.add(request)
+            self.last_change = time.time()
+
+    def on_done(self, request):
+        if request in self.pending:
+            self.pending.discard(request)
+            self.last_change = time.time()
+
+    def quiet_for(self) -> float:
+        """未完了 0 件が続いている秒数（未完了があれば 0）"""
+        return 0.0 if self.pending else time.time() - self.last_change
+
+
+def watch_xhr(page, host_pattern: str) -> PendingXHR:
+    """XHR 監視を登録する（sync/async どちらのページでも可。goto より前に呼ぶ）"""
+    tracker = PendingXHR(host_pattern)
+    page.on("request", tracker.on_request)
+    page.on("requestfinished", tracker.on_done)
+    page.on("requestfailed", tracker.on_done)
+    return tracker
+
+
+# -----------------------------
+# 判定
+# -----------------------------
+class _Condition:
+    """観測値を受け取り、条件を満たしたかを判定する"""
+
+    def __init__(self, stable_ms, min_count, xhr):
+        self.stable = stable_ms / 1000
+        self.min_count = min_count
+        self.xhr = xhr
+        self.count = None
+        self.count_since = time.time()
+
+    def update(self, probe: dict) -> bool:
+        now = time.time()
+        if probe["count"] != self.count:
+            self.count = probe["count"]
+            self.count_since = now
+        if self.count < self.min_count or not probe["imagesReady"] or not probe["loaded"]:
+            return False
+        if now - self.count_since < self.stable:
+            return False
+        return self.xhr is None or self.xhr.quiet_for() >= self.stable
+
+
+# 今回のプロセスの記録（slug -> 直近値・最大値・上限到達回数）。終了時に flush() で書く
+_pending = {}
+_pending_lock = threading.Lock()
+
+
+def record(slug: str, seconds: float, hit_ceiling: bool, verbose: bool = True) -> None:
+    """所要時間を表示し、サイトごとの直近値・最大値・上限到達回数を記録する"""
+    seconds = round(seconds, 2)
+    if hit_ceiling:
+        print(f"⌛ {slug}: 準備完了待ちが上限に到達（{seconds} 秒）")
+    elif verbose:
+        print(f"⏱ {slug}: 準備完了まで {seconds} 秒")
+
+    with _pending_lock:
+        entry = _pending.setdefault(slug, {"last": 0, "max": 0, "ceiling_hits": 0})
+        entry["last"] = seconds
+        entry["max"] = max(entry["max"], seconds)
+        entry["ceiling_hits"] += int(hit_ceiling)
+
+
+@atexit.register
+def flush() -> None:
+    """ためた記録を READINESS_LOG_PATH に反映する"""
+    with _pending_lock:
+        pending = dict(_pending)
+        _pending.clear()
+    if not pending:
+        return
+    try:
+        with open(LOG_PATH, encoding="utf-8") as f:
+            log = json.load(f)
+    except (OSError, ValueError):
+        log = {}
+    for slug, run in pending.items():
+        entry = log.setdefault(slug, {"last": 0, "max": 0, "ceiling_hits": 0})
+        entry["last"] = run["last"]
+        entry["max"] = max(entry["max"], run["max"])
+        entry["ceiling_hits"] += run["ceiling_hits"]
+    try:
+        os.makedirs(os.path.dirname(LOG_PATH) or ".", exist_ok=True)
+        with open(LOG_PATH, "w", encoding="utf-8") as f:
+            json.dump(log, f, ensure_ascii=False, indent=2)
+    except OSError as e:
+        print(f"⚠️ 待機時間の記録失敗: {e}")
+
+
+# -----------------------------
+# 待機（sync / async / Selenium）
+# -----------------------------
+def wait_ready(page, slug: str, selector: str = None, images: str = None, xhr: PendingXHR = None,
+               stable_ms: int = DEFAULT_STABLE_MS, min_count: int = 1,
+               ceiling_ms: int = DEFAULT_CEILING_MS, verbose: bool = True) -> bool:
+    """sync API のページで条件を満たすまで待つ。上限で打ち切ったら False"""
+    condition = _Condition(stable_ms, min_count if selector else 0, xhr)
+    start = time.time()
+    deadline = start + ceiling_ms / 1000
+    while True:
+        if condition.update(page.evaluate(_PROBE_JS, [selector, images])):
+            record(slug, time.time() - start, False, verbose)
+            return True
+        if time.time() >= deadline:
+            record(slug, time.time() - start, True)
+            return False
+        page.wait_for_timeout(POLL_MS)  # イベント処理（XHR 監視）もここで進む
+
+
+async def wait_ready_async(page, slug: str, selector: str = None, images: str = None, xhr: PendingXHR = None,
+                           stable_ms: int = DEFAULT_STABLE_MS, min_count: int = 1,
+                           ceiling_ms: int = DEFAULT_CEILING_MS, verbose: bool = True) -> bool:
+    """async API のページで条件を満たすまで待つ。上限で打ち切ったら False"""
+    condition = _Condition(stable_ms, min_count if selector else 0, xhr)
+    start = time.time()
+    deadline = start + ceiling_ms / 1000
+    while True:
+        if condition.update(await page.evaluate(_PROBE_JS, [selector, images])):
+            record(slug, time.time() - start, False, verbose)
+            return True
+        if time.time() >= deadline:
+            record(slug, time.time() - start, True)
+            return False
+        await asyncio.sleep(POLL_MS / 1000)
+
+
+def wait_ready_selenium(driver, slug: str, selector: str = None, images: str = None,
+                        stable_ms: int = DEFAULT_STABLE_MS, min_count: int = 1,
+                        ceiling_ms: int = DEFAULT_CEILING_MS, verbose: bool = True) -> bool:
+    """Selenium の driver で条件を満たすまで待つ（XHR 監視は非対応）
+
+    URL ごとに呼ぶループでは verbose=False にすると、上限到達時だけ表示する。
+    """
+    condition = _Condition(stable_ms, min_count if selector else 0, None)
+    script = f"return ({_PROBE_JS})(arguments[0]);"
+    start = time.time()
+    deadline = start + ceiling_ms / 1000
+    while True:
+        if condition.update(driver.execute_script(script, [selector, images])):
+            record(slug, time.time() - start, False, verbose)
+            return True
+        if time.time() >= deadline:
+            record(slug, time.time() - start, True)
+            return False
+        time.sleep(POLL_MS / 1000)
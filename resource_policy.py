@@ -0,0 +1,202 @@
+"""一覧ページ取得時のリソースブロック（page.route）
+
+一覧ページで読むのは img の src や background-image の文字列だけで、
+画像そのものは不要。画像・フォント・動画・トラッカーへのリクエストを
+中止して、転送量と networkidle までの待ち時間を減らす。
+DOM の属性は書き換えないので、抽出結果は変わらない。
+
+環境変数:
+    RESOURCE_BLOCKING=off   ブロックせずに読み込み、転送量と処理時間を
+                            基準値として RESOURCE_BASELINE_PATH に記録する
+    RESOURCE_BASELINE_PATH  基準値ファイル（既定 .cache/resource_baseline.json）
+
+ブロック時は、記録済みの基準値との差を「削減量」として表示する。
+"""
+import os
+import json
+import time
+from collections import Counter
+from urllib.parse import urlparse
+
+BASELINE_PATH = os.getenv("RESOURCE_BASELINE_PATH", ".cache/resource_baseline.json")
+BLOCKING_ENABLED = os.getenv("RESOURCE_BLOCKING", "on").lower() not in ("off", "0", "false")
+
+BLOCKED_TYPES = ("image", "font", "media")
+
+# 解析・広告タグ（ファーストパーティでも中止する）
+TRACKER_HOSTS = (
+    "google-analytics.com",
+    "googletagmanager.com",
+    "googlesyndication.com",
+    "googleadservices.com",
+    "doubleclick.net",
+    "facebook.net",
+    "facebook.com",
+    "clarity.ms",
+    "hotjar.com",
+    "analytics.tiktok.com",
+    "ads-twitter.com",
+    "static.ads-twitter.com",
+    "tr.line.me",
+    "d.line-scdn.net",
+    "yjtag.yahoo.co.jp",
+    "b92.yahoo.co.jp",
+    "s.yimg.jp",
+    "criteo.com",
+    "sentry.io",
+)
+
+# co.jp などの2階層サフィックス
+_SECOND_LEVEL = ("co.jp", "ne.jp", "or.jp", "ac.jp", "go.jp", "co.uk", "com.au")
+
+
+def site_domain(host: str) -> str:
+    """ホスト名から登録ドメインを推定する（www.ichica.co → ichica.co）"""
+    parts = host.lower().split(".")
+    if len(parts) >= 3 and ".".join(parts[-2:]) in _SECOND_LEVEL:
+        return ".".join(parts[-3:])
+    return ".".join(parts[-2:])
+
+
+def _host_matches(host: str, domains) -> bool:
+    return any(host == d or host.endswith("." + d) for d in domains)
+
+
+class BlockPolicy:
+    """サイトごとのブロック方針
+
+    resource_types:    中止するリソース種別（Playwright の resource_type）
+    block_trackers:    TRACKER_HOSTS へのリクエストを中止する
+    block_third_party: サイト外ドメインへのリクエストを種別に関係なく中止する
+                       （API やスクリプトを外部 CDN から読むサイトでは使わない）
+    allow_hosts:       常に許可するホスト（画像 CDN 経由の API など）
+    """
+
+    def __init__(self, resource_types=BLOCKED_TYPES, block_trackers=True,
+                 block_third_party=False, allow_hosts=()):
+        self.resource_types = tuple(resource_types)
+        self.block_trackers = block_trackers
+        self.block_third_party = block_third_party
+        self.allow_hosts = tuple(allow_hosts)
+
+    def reason(self, resource_type: str, url: str, first_party: str):
+        """中止する理由（中止しないなら None）"""
+        if resource_type == "document":
+            return None
+        host = urlparse(url).hostname or ""
+        if _host_matches(host, self.allow_hosts):
+            return None
+        if resource_type in self.resource_types:
+            return resource_type
+        if self.block_trackers and _host_matches(host, TRACKER_HOSTS):
+            return "tracker"
+        if self.block_third_party and host and not _host_matches(host, (first_party,)):
+            return "third-party"
+        return None
+
+
+DEFAULT_POLICY = BlockPolicy()
+
+
+# -----------------------------
+# 計測
+# -----------------------------
+class ResourceStats:
+    """ブロック件数・受信バイト数・処理時間をサイトごとに記録する"""
+
+    def __init__(self, slug: str, blocking: bool):
+        self.slug = slug
+        self.blocking = blocking
+        self.blocked = Counter()
+        self.loaded_bytes = 0
+        self.loaded_requests = 0
+        self.started = time.time()
+        self.elapsed = None
+
+    def on_response(self, response):
+        try:
+            size = int(response.headers.get("content-length") or 0)
+        except ValueError:
+            size = 0
+        self.loaded_bytes += size
+        self.loaded_requests += 1
+
+    def finish(self):
+        """計測を終了し、基準値の記録または削減量の表示を行う"""
+        self.elapsed = time.time() - self.started
+        if not self.blocking and BLOCKING_ENABLED:
+            return  # サイト側でブロック無効（block=None）のときは何もしない
+        baseline = load_baseline()
+        if not self.blocking:
+            baseline[self.slug] = {"bytes": self.loaded_bytes, "seconds": round(self.elapsed, 2)}
+            save_baseline(baseline)
+            print(f"📏 {self.slug}: 基準値を記録 {self.loaded_bytes // 1024} KB / {round(self.elapsed, 2)} 秒")
+            return
+
+        blocked = ", ".join(f"{kind} {count}" for kind, count in self.blocked.most_common()) or "なし"
+        print(f"🧱 {self.slug}: ブロック {sum(self.blocked.values())} 件（{blocked}）"
+              f" / 受信 {self.loaded_bytes // 1024} KB / {round(self.elapsed, 2)} 秒")
+        base = baseline.get(self.slug)
+        if base:
+            saved_kb = (base["bytes"] - self.loaded_bytes) // 1024
+            saved_sec = round(base["seconds"] - self.elapsed, 2)
+            print(f"   ↳ 基準値比: 転送量 -{saved_kb} KB / 時間 -{saved_sec} 秒")
+
+
+def load_baseline() -> dict:
+    try:
+        with open(BASELINE_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_baseline(baseline: dict) -> None:
+    os.makedirs(os.path.dirname(BASELINE_PATH) or ".", exist_ok=True)
+    with open(BASELINE_PATH, "w", encoding="utf-8") as f:
+        json.dump(baseline, f, ensure_ascii=False, indent=2)
+
+
+# -----------------------------
+# ページへの組み込み
+# -----------------------------
+def install(page, slug: str, site_url: str, policy=DEFAULT_POLICY) -> ResourceStats:
+    """sync API のページ（または BrowserContext）にブロック処理を組み込む（goto より前に呼ぶ）"""
+    stats = ResourceStats(slug, BLOCKING_ENABLED and policy is not None)
+    first_party = site_domain(urlparse(site_url).hostname or "")
+    page.on("response", stats.on_response)
+    if not stats.blocking:
+        return stats
+
+    def handle(route):
+        request = route.request
+        reason = policy.reason(request.resource_type, request.url, first_party)
+        if reason:
+            stats.blocked[reason] += 1
+            route.abort()
+        else:
+            route.continue_()
+
+    page.route("**/*", handle)
+    return stats
+
+
+async def install_async(page, slug: str, site_url: str, policy=DEFAULT_POLICY) -> ResourceStats:
+    """async API のページにブロック処理を組み込む（goto より前に呼ぶ）"""
+    stats = ResourceStats(slug, BLOCKING_ENABLED and policy is not None)
+    first_party = site_domain(urlparse(site_url).hostname or "")
+    page.on("response", stats.on_response)
+    if not stats.blocking:
+        return stats
+
+    async def handle(route):
+        request = route.request
+        reason = policy.reason(request.resource_type, request.url, first_party)
+        if reason:
+            stats.blocked[reason] += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    await page.route("**/*", handle)
+    return stats
@@ -0,0 +1,141 @@
+"""複数サイトのスクレイパーを1プロセス・1ブラウザでまとめて実行する
+
+使い方:
+    python run_all_scrapers.py                           # 全サイト実行
+    python run_all_scrapers.py torekazi scrape_dopa_to_wp # 指定サイトだけ実行
+
+site_registry.py に登録済みのサイト（slug で指定）は async_scrape_engine で並列に実行する。
+それ以外のスクリプト（モジュール名で指定）は main() をそのまま呼び出す
+（既存URL取得 → スクレイピング → WP投稿）。Chromium は1回だけ起動し、
+各サイトには新しい BrowserContext を渡す。
+最後に、スクリプトを1本ずつ実行した場合と比べた短縮時間の推定を表示する。
+"""
+import sys
+import time
+import importlib
+import subprocess
+
+from playwright.sync_api import sync_playwright
+
+from shared_browser import use_shared_browser, launch_browser
+import site_registry
+
+# -----------------------------
+# 実行対象（site_registry 未移行の WordPress 投稿系 Playwright スクレイパー）
+# -----------------------------
+# Selenium をモジュール読み込み時に起動するもの、Google Sheets 系、
+# 別エンドポイントに投稿する scrape_pokeca_chart_wp は含めない。
+SITE_MODULES = [
+    "scrape_cardel_to_wp",
+    "scrape_dopa_to_wp",
+    "scrape_eve_gacha_to_wp",
+    "scrape_grim_tcg_to_wp",
+    "scrape_ichica_main_to_wp",
+    "scrape_ichica_to_wp",
+    "scrape_kagura_tcg_to_wp",
+    "scrape_orikuji_to_wp",
+    "scrape_pokeca_to_wp",
+    # バナー系（WP_banar_* を使用）
+    "scrape_banners_to_wp",
+    "scrape_clove_banners_to_wp",
+    "scrape_evegacha_banners_to_wp",
+    "scrape_grimtcg_banners_to_wp",
+    "scrape_ichica_banners_to_wp",
+    "scrape_orikuji_banners_to_wp",
+]
+
+
+# -----------------------------
+# 起動コスト計測
+# -----------------------------
+def measure_interpreter_startup() -> float:
+    """スクリプト単体実行時のインタプリタ起動 + import にかかる秒数"""
+    start = time.time()
+    try:
+        subprocess.run(
+            [sys.executable, "-c", "import requests, playwright.sync_api"],
+            check=False,
+            timeout=60,
+        )
+    except Exception as e:
+        print(f"⚠️ 起動時間の計測に失敗: {e}")
+        return 0.0
+    return time.time() - start
+
+
+# -----------------------------
+# 各サイト実行
+# -----------------------------
+def run_module(name: str) -> bool:
+    try:
+        module = importlib.import_module(name)
+        module.main()
+        return True
+    except SystemExit as e:
+        return not e.code
+    except Exception as e:
+        print(f"🛑 {name} 実行エラー: {e}")
+        return False
+
+
+def run_modules(modules: list, results: list) -> float:
+    """共有ブラウザで各モジュールの main() を順に実行し、Chromium 起動時間を返す"""
+    with sync_playwright() as p:
+        launch_start = time.time()
+        browser = launch_browser(p)
+        launch_cost = time.time() - launch_start
+        print(f"🚀 Chromium 起動: {round(launch_cost, 2)} 秒")
+
+        with use_shared_browser(browser):
+            for name in modules:
+                print(f"\n===== {name} =====")
+                site_start = time.time()
+                ok = run_module(name)
+                results.append((name, time.time() - site_start, ok))
+
+        browser.close()
+    return launch_cost
+
+
+def run_sites(slugs: list, modules: list) -> None:
+    start = time.time()
+    results = []
+
+    # レジストリ登録サイトは async API で並列実行
+    # （sync API の起動中は asyncio.run() を呼べないので先に済ませる）
+    if slugs:
+        print(f"\n===== site_registry: {len(slugs)} サイト =====")
+        timings, ok = site_registry.run_sites(slugs)
+        results.extend((slug, timings.get(slug, 0.0), ok[slug]) for slug in slugs)
+
+    launch_cost = run_modules(modules, results) if modules else 0.0
+
+    total = time.time() - start
+    interpreter_cost = measure_interpreter_startup()
+
+    # 1本ずつ実行した場合は、サイトごとにインタプリタ起動と Chromium 起動が発生する
+    sequential = sum(elapsed for _, elapsed, _ in results) + len(results) * (interpreter_cost + launch_cost)
+
+    print("\n📊 サイト別処理時間")
+    for name, elapsed, ok in results:
+        mark = "✅" if ok else "🛑"
+        print(f"  {mark} {name}: {round(elapsed, 2)} 秒")
+
+    print(f"\n⏱ 一括実行: {round(total, 2)} 秒")
+    print(f"⏱ 1本ずつ実行した場合の推定: {round(sequential, 2)} 秒"
+          f"（起動 {round(interpreter_cost, 2)} 秒 + Chromium {round(launch_cost, 2)} 秒 × {len(results)} サイト）")
+    print(f"🏁 短縮時間（推定）: {round(sequential - total, 2)} 秒")
+
+
+def main():
+    names = sys.argv[1:]
+    if not names:
+        run_sites(list(site_registry.SITE_MODULES), SITE_MODULES)
+        return
+    slugs = [name for name in names if name in site_registry.SITE_MODULES]
+    modules = [name for name in names if name not in site_registry.SITE_MODULES]
+    run_sites(slugs, modules)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,24 +1,93 @@
-import os
 import re
 import time
-import json
-from urllib.parse import urljoin, urlparse
+from urllib.parse import urljoin
 from typing import List
 
-import requests
-from playwright.sync_api import sync_playwright
+from shared_browser import sync_playwright
+import readiness
+import resource_policy
+from nav_intercept import NavInterceptor
+from wp_client import fetch_existing_urls, post_to_wordpress
 
 # -----------------------------
-# WordPress REST API 設定
+# スクレイピング対象
 # -----------------------------
-WP_URL = os.getenv("WP_URL") or "https://online-gacha-hack.com/wp-json/oripa/v1/upsert"
-WP_USER = os.getenv("WP_USER")
-WP_APP_PASS = os.getenv("WP_APP_PASS")
+BASE_URL = "https://cardel.online/"
+
+CARD_SELECTOR = "div[id$='-Wrap']"
+
+# 一覧の全カードを1回の評価でまとめて読む
+READ_CARDS_JS = """
+(selector) => Array.from(document.querySelectorAll(selector)).map((el, idx) => {
+    const img = el.querySelector('figure img');
+    const ptEl = el.querySelector('div.flex.justify-end p.text-sm');
+    let pt = ptEl ? ptEl.innerText.trim() : '';
+    if (!ptEl) {
+        const m = el.innerText.match(/([0-9,]+)\\s*pt/);
+        if (m) pt = m[1];
+    }
+    return {
+        key: el.id.replace(/-Wrap$/, ''),
+        title: el.getAttribute('title') || `noname-${idx}`,
+        image: img ? (img.getAttribute('src') || '').trim() : '',
+        pt,
+    };
+})
+"""
+
 
 # -----------------------------
-# スクレイピング対象
+# 詳細URLの一括解決
 # -----------------------------
-BASE_URL = "https://cardel.online/"
+# テンプレート中の要素IDの位置（URL に { } が含まれていても壊れないよう str.replace で埋める）
+KEY_MARK = "{key}"
+
+
+def learn_url_template(nav, elements, cards) -> str:
+    """最初と最後のカードのクリックを横取りし、要素IDから詳細URLを作るテンプレートを得る
+
+    遷移先 URL に要素 ID（-Wrap を除いた部分）が含まれていれば、
+    その部分を KEY_MARK に置き換えたものをテンプレートとする。
+    要素 ID を持つ別々のカード2件で同じテンプレートになったときだけ使う。
+    """
+    keyed = [i for i, card in enumerate(cards) if card["key"]]
+    if len(keyed) < 2:
+        return ""
+    template = ""
+    for i in (keyed[0], keyed[-1]):
+        elements[i].scroll_into_view_if_needed()
+        url = nav.click(elements[i])
+        key = cards[i]["key"]
+        if not url or key not in url or KEY_MARK in url:
+            return ""
+        candidate = url.replace(key, KEY_MARK)
+        if template and candidate != template:
+            return ""
+        template = candidate
+    return template
+
+
+def resolve_detail_urls(nav, elements, cards) -> None:
+    """cards の各要素に detail_url を設定する"""
+    template = learn_url_template(nav, elements, cards)
+    if template:
+        print(f"🔗 詳細URLを要素IDから生成: {template}")
+        for card in cards:
+            card["detail_url"] = template.replace(KEY_MARK, card["key"]) if card["key"] else ""
+        return
+
+    # テンプレートが作れないときは、1件ずつクリックを横取りする（遷移はしない）
+    print("🔗 詳細URLをクリックの横取りで取得")
+    for idx, (el, card) in enumerate(zip(elements, cards)):
+        try:
+            el.scroll_into_view_if_needed()
+            card["detail_url"] = nav.click(el)
+        except Exception as e:
+            print(f"⚠️ スキップ index={idx}: {e}")
+            card["detail_url"] = ""
+        if nav.left_listing():
+            raise RuntimeError("クリックで一覧ページから移動したため中断")
+
 
 # -----------------------------
 # スクレイピング本体
@@ -30,9 +99,11 @@ def scrape_cardel() -> List[dict]:
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True, args=["--no-sandbox"])
         page = browser.new_page()
+        stats = resource_policy.install(page, "cardel-online", BASE_URL)
+        nav = NavInterceptor(page, BASE_URL)
         try:
             page.goto(BASE_URL, timeout=60000, wait_until="domcontentloaded")
-            page.wait_for_selector("div[id$='-Wrap']", timeout=20000)
+            page.wait_for_selector(CARD_SELECTOR, timeout=20000)
 
             # スクロールで全件ロード
             page.evaluate("""
@@ -44,95 +115,55 @@ def scrape_cardel() -> List[dict]:
                     }
                 }
             """)
-            page.wait_for_timeout(1000)
-
-            elements = page.query_selector_all("div[id$='-Wrap']")
-            print(f"📦 検出: {len(elements)}件")
-
-            for idx, el in enumerate(elements):
-                try:
-                    title = el.get_attribute("title") or f"noname-{idx}"
-
-                    # 画像取得
-                    image_url = ""
-                    img = el.query_selector("figure img")
-                    if img:
-                        image_url = (img.get_attribute("src") or "").strip()
-                        if image_url.startswith("/"):
-                            image_url = urljoin(BASE_URL, image_url)
-
-                    # PT抽出
-                    pt_text = ""
-                    pt_el = el.query_selector("div.flex.justify-end p.text-sm")
-                    if pt_el:
-                        pt_text = pt_el.inner_text().strip()
-                    else:
-                        m = re.search(r"([0-9,]+)\\s*pt", el.inner_text())
-                        if m:
-                            pt_text = m.group(1)
-
-                    # 詳細URL取得
-                    el.scroll_into_view_if_needed()
-                    el.click(timeout=10000)
-                    page.wait_for_timeout(2000)
-                    detail_url = page.url
-                    if detail_url.startswith("/"):
-                        detail_url = urljoin(BASE_URL, detail_url)
-
-                    # 整形
-                    rows.append({
-                        "source_slug": "cardel-online",
-                        "title": title,
-                        "image_url": image_url,
-                        "detail_url": detail_url,
-                        "points": re.sub(r"[^0-9]", "", pt_text),
-                        "price": None,
-                        "rarity": None,
-                        "extra": {"scraped_at": time.strftime("%Y-%m-%d %H:%M:%S")}
-                    })
-                    print(f"✅ 取得: {title} - {detail_url}")
-
-                    # 戻る
-                    page.go_back(wait_until="domcontentloaded")
-                    page.wait_for_timeout(800)
-                except Exception as e:
-                    print(f"⚠️ スキップ index={idx}: {e}")
-                    page.go_back(wait_until="domcontentloaded")
-                    page.wait_for_timeout(800)
+            readiness.wait_ready(page, "cardel-online", CARD_SELECTOR, ceiling_ms=1000)
+            nav.hook()
+
+            elements = page.query_selector_all(CARD_SELECTOR)
+            cards = page.evaluate(READ_CARDS_JS, CARD_SELECTOR)
+            print(f"📦 検出: {len(cards)}件")
+
+            resolve_detail_urls(nav, elements, cards)
+
+            for card in cards:
+                detail_url = card["detail_url"]
+                if not detail_url:
                     continue
+                if detail_url.startswith("/"):
+                    detail_url = urljoin(BASE_URL, detail_url)
+                image_url = card["image"]
+                if image_url.startswith("/"):
+                    image_url = urljoin(BASE_URL, image_url)
+
+                # 整形
+                rows.append({
+                    "source_slug": "cardel-online",
+                    "title": card["title"],
+                    "image_url": image_url,
+                    "detail_url": detail_url,
+                    "points": re.sub(r"[^0-9]", "", card["pt"]),
+                    "price": None,
+                    "rarity": None,
+                    "extra": {"scraped_at": time.strftime("%Y-%m-%d %H:%M:%S")}
+                })
+            # 新規・変更の件数は post_to_wordpress が item_diff の結果で表示する
+            print(f"📦 詳細URLあり: {len(rows)} / {len(cards)} 件")
 
         except Exception as e:
             print("🛑 スクレイピング失敗:", e)
+        stats.finish()
         browser.close()
     print(f"✅ 取得完了: {len(rows)} 件")
     return rows
 
-# -----------------------------
-# WordPress REST API 投稿
-# -----------------------------
-def post_to_wordpress(items: List[dict]):
-    if not items:
-        print("📭 投稿データなし")
-        return
-
-    print(f"🚀 {len(items)}件のデータをWordPressに送信中...")
-    try:
-        res = requests.post(WP_URL, json=items, auth=(WP_USER, WP_APP_PASS), timeout=60)
-        print("Status:", res.status_code)
-        try:
-            print("Response:", json.dumps(res.json(), ensure_ascii=False, indent=2))
-        except Exception:
-            print("Response:", res.text)
-    except Exception as e:
-        print("🛑 WordPress送信中にエラー:", e)
-
 # -----------------------------
 # メイン処理
 # -----------------------------
 def main():
     start = time.time()
+    # クエリを除いた比較は dedup_index（cardel-online は STRIP_QUERY_SOURCES）が行う
+    existing_urls = fetch_existing_urls("cardel-online")
     data = scrape_cardel()
-    post_to_wordpress(data)
+    post_to_wordpress(data, existing_urls)
     print(f"🏁 完了！処理時間: {round(time.time() - start, 2)} 秒")
 
 if __name__ == "__main__":
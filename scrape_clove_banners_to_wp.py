@@ -1,9 +1,10 @@
 import os
 from urllib.parse import urljoin, urlparse, parse_qs, unquote
 
-import requests
 from requests.auth import HTTPBasicAuth
-from playwright.sync_api import sync_playwright
+from shared_browser import sync_playwright
+import readiness
+import outbox
 
 
 BASE_URL = "https://oripa.clove.jp"
@@ -45,7 +46,7 @@ def scrape_banners() -> list:
 
         try:
             page.goto(TARGET_URL, timeout=60000, wait_until="load")
-            page.wait_for_timeout(5000)
+            readiness.wait_ready(page, "clove-banners", ".swiper-slide", images=".swiper-slide img", ceiling_ms=5000)
 
             # スライダーをできるだけ進めて、画像を最大取得
             for _ in range(10):
@@ -99,12 +100,11 @@ def send_to_wordpress(payload: list):
 
     print("📡 WordPress に送信中...")
 
-    res = requests.post(
-        api_url,
-        json=payload,
-        auth=HTTPBasicAuth(WP_USER, WP_APP_PASS),
-        timeout=30
-    )
+    # 前回送れなかったバナーがあれば一緒に送る
+    res = outbox.post_banners(api_url, payload, auth=HTTPBasicAuth(WP_USER, WP_APP_PASS), timeout=30)
+    if res is None:
+        print("📭 送信データなし")
+        return
 
     print("📬 ステータス:", res.status_code)
     try:
@@ -118,7 +118,6 @@ def main():
 
     if not banners:
         print("📭 新規バナーなし（または取得できず）")
-        return
 
     # WordPress REST API へ送信
     send_to_wordpress(banners)
@@ -1,11 +1,13 @@
 import os
 import time
 import re
-import json
 from urllib.parse import urljoin
 from typing import List
-import requests
-from playwright.sync_api import sync_playwright
+import wp_sender
+import wp_existing
+import item_diff
+from shared_browser import sync_playwright
+import resource_policy
 
 # -----------------------------
 # WordPress REST API 設定
@@ -36,32 +38,9 @@ def extract_pt(text: str) -> str:
 # -----------------------------
 # WordPress既存URLの取得
 # -----------------------------
-def fetch_existing_urls() -> set:
-    print("🔍 既存データ取得中（WordPress）...")
-    urls = set()
-    page = 1
-    while True:
-        try:
-            res = requests.get(
-                f"{WP_GET_URL}&page={page}",
-                auth=(WP_USER, WP_APP_PASS),
-                timeout=30
-            )
-            if res.status_code != 200:
-                break
-            data = res.json()
-            if not data:
-                break
-            for item in data:
-                # プラグインで detail_url がメタ情報として保存されている場合
-                if "detail_url" in item:
-                    urls.add(item["detail_url"])
-            page += 1
-        except Exception as e:
-            print(f"⚠️ 既存URL取得中にエラー: {e}")
-            break
-    print(f"✅ 既存URL: {len(urls)} 件")
-    return urls
+def fetch_existing_urls():
+    # wp/v2 の一覧を並列にページ取得し、detail_url だけを読む（前回のスナップショット + 差分）
+    return wp_existing.fetch(WP_GET_URL, auth=(WP_USER, WP_APP_PASS), source_slug="dopa-game", paged=True)
 
 # -----------------------------
 # スクレイピング本体
@@ -73,6 +52,7 @@ def scrape_dopa() -> List[dict]:
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True, args=["--no-sandbox"])
         page = browser.new_page(user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+        stats = resource_policy.install(page, "dopa-game", BASE_URL)
 
         try:
             page.goto(BASE_URL, timeout=60000, wait_until="domcontentloaded")
@@ -130,6 +110,7 @@ def scrape_dopa() -> List[dict]:
                 print(f"⚠ 取得スキップ: {exc}")
                 continue
 
+        stats.finish()
         browser.close()
 
     print(f"✅ {len(rows)} 件のデータを取得完了")
@@ -138,22 +119,15 @@ def scrape_dopa() -> List[dict]:
 # -----------------------------
 # WordPress REST API 投稿
 # -----------------------------
-def post_to_wordpress(items: List[dict], existing_urls: set):
-    new_items = [i for i in items if i["detail_url"] not in existing_urls]
+def post_to_wordpress(items: List[dict], existing_urls):
+    new_items, counts = item_diff.split(items, existing_urls)
+    print(item_diff.line(counts))
     if not new_items:
-        print("📭 新規データなし（全件重複）")
-        return
-
-    print(f"🚀 新規 {len(new_items)}件をWordPressに送信中...")
-    try:
-        res = requests.post(WP_URL, json=new_items, auth=(WP_USER, WP_APP_PASS), timeout=60)
-        print("Status:", res.status_code)
-        try:
-            print("Response:", json.dumps(res.json(), ensure_ascii=False, indent=2))
-        except Exception:
-            print("Response:", res.text)
-    except Exception as e:
-        print("🛑 WordPress送信中にエラー:", e)
+        print("📭 新規・変更なし")
+    else:
+        print(f"🚀 新規・変更 {len(new_items)}件をWordPressに送信中...")
+    wp_sender.send_all(WP_URL, new_items, auth=(WP_USER, WP_APP_PASS),
+                       on_sent=wp_existing.recorder(WP_GET_URL))
 
 # -----------------------------
 # メイン処理
@@ -1,11 +1,13 @@
 import os
 import re
 import time
-import json
 from urllib.parse import urljoin
 from typing import List
-from playwright.sync_api import sync_playwright
-import requests
+from shared_browser import sync_playwright
+import readiness
+import wp_sender
+import wp_existing
+import item_diff
 
 # -----------------------------
 # WordPress REST API 設定
@@ -26,18 +28,8 @@ BASE_URL = "https://eve-gacha.com/"
 # WordPress既存URL取得
 # -----------------------------
 def fetch_existing_urls() -> set:
-    print("🔍 WordPress既存URLを取得中...")
-    try:
-        res = requests.get(WP_GET_URL, auth=(WP_USER, WP_APP_PASS), timeout=30)
-        if res.status_code != 200:
-            print(f"⚠️ 既存URL取得失敗: {res.status_code}")
-            return set()
-        urls = set(res.json())
-        print(f"✅ 既存URL数: {len(urls)} 件")
-        return urls
-    except Exception as e:
-        print(f"🛑 既存URL取得エラー: {e}")
-        return set()
+    # 前回のスナップショット + 差分（古ければ全件取得）
+    return wp_existing.fetch(WP_GET_URL, auth=(WP_USER, WP_APP_PASS), source_slug="eve-gacha")
 
 # -----------------------------
 # スクレイピング処理
@@ -50,7 +42,7 @@ def scrape_eve_gacha() -> List[dict]:
         browser = p.chromium.launch(headless=True, args=["--no-sandbox"])
         page = browser.new_page()
         page.goto(BASE_URL, timeout=60000)
-        page.wait_for_timeout(3000)
+        readiness.wait_ready(page, "eve-gacha", "a[href*='/gacha/']", ceiling_ms=3000)
 
         cards = page.query_selector_all("a[href*='/gacha/']")
         print(f"取得したaタグ数: {len(cards)}")
@@ -128,26 +120,19 @@ def scrape_eve_gacha() -> List[dict]:
 # -----------------------------
 # WordPress REST API 投稿（重複除外）
 # -----------------------------
-def post_to_wordpress(items: List[dict], existing_urls: set):
+def post_to_wordpress(items: List[dict], existing_urls):
     if not items:
         print("📭 投稿データなし")
         return
 
-    new_items = [item for item in items if item["detail_url"] not in existing_urls]
+    new_items, counts = item_diff.split(items, existing_urls)
+    print(item_diff.line(counts))
     if not new_items:
-        print("📭 新規データなし（全件重複）")
-        return
-
-    print(f"🚀 新規 {len(new_items)}件をWordPressに送信中...")
-    try:
-        res = requests.post(WP_URL, json=new_items, auth=(WP_USER, WP_APP_PASS), timeout=60)
-        print("Status:", res.status_code)
-        try:
-            print("Response:", json.dumps(res.json(), ensure_ascii=False, indent=2))
-        except Exception:
-            print("Response:", res.text)
-    except Exception as e:
-        print("🛑 WordPress送信中にエラー:", e)
+        print("📭 新規・変更なし")
+    else:
+        print(f"🚀 新規・変更 {len(new_items)}件をWordPressに送信中...")
+    wp_sender.send_all(WP_URL, new_items, auth=(WP_USER, WP_APP_PASS),
+                       on_sent=wp_existing.recorder(WP_GET_URL))
 
 # -----------------------------
 # メイン処理
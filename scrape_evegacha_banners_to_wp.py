@@ -1,9 +1,10 @@
 import os
 from urllib.parse import urljoin
 
-import requests
 from requests.auth import HTTPBasicAuth
-from playwright.sync_api import sync_playwright
+from shared_browser import sync_playwright
+import readiness
+import outbox
 
 
 # 対象サイト
@@ -32,7 +33,7 @@ def scrape_banners() -> list:
 
         try:
             page.goto(TARGET_URL, timeout=60000, wait_until="load")
-            page.wait_for_timeout(5000)
+            readiness.wait_ready(page, "eve-gacha-banners", "section.carousel li.carousel__slide", images="section.carousel li.carousel__slide img", ceiling_ms=5000)
 
             # orikuji と同じ構造のスライダー
             slides = page.query_selector_all("section.carousel li.carousel__slide")
@@ -70,12 +71,11 @@ def send_to_wordpress(payload: list):
 
     print(f"📡 WordPress に送信開始: {api_url}")
 
-    res = requests.post(
-        api_url,
-        json=payload,
-        auth=HTTPBasicAuth(WP_USER, WP_APP_PASS),
-        timeout=30
-    )
+    # 前回送れなかったバナーがあれば一緒に送る
+    res = outbox.post_banners(api_url, payload, auth=HTTPBasicAuth(WP_USER, WP_APP_PASS), timeout=30)
+    if res is None:
+        print("📭 送信データなし")
+        return
 
     print("📬 ステータス:", res.status_code)
     try:
@@ -89,7 +89,6 @@ def main():
 
     if not banners:
         print("📭 新規バナーなし（または取得エラー）")
-        return
 
     send_to_wordpress(banners)
 
@@ -1,9 +1,11 @@
 import os
 import time
-import json
 from urllib.parse import urljoin
-from playwright.sync_api import sync_playwright
-import requests
+from shared_browser import sync_playwright
+import readiness
+import wp_sender
+import wp_existing
+import item_diff
 
 # -----------------------------
 # WordPress REST API設定
@@ -21,22 +23,17 @@ WP_GET_URL = "https://online-gacha-hack.com/wp-json/oripa/v1/list"
 BASE_URL = "https://grim-tcg.net-oripa.com"
 TARGET_URL = BASE_URL
 
+# リンクのないバナーはすべて detail_url が TARGET_URL になるので、
+# 差分判定と送信済みの記録は画像URLで行う（従来も画像URLで既存を判定していた）
+def banner_key(item: dict) -> str:
+    return item["image_url"]
+
 # -----------------------------
 # WordPress既存URL取得
 # -----------------------------
 def fetch_existing_urls() -> set:
-    print("🔍 WordPress既存URLを取得中...")
-    try:
-        res = requests.get(WP_GET_URL, auth=(WP_USER, WP_APP_PASS), timeout=30)
-        if res.status_code != 200:
-            print(f"⚠️ URL取得失敗: {res.status_code}")
-            return set()
-        urls = set(res.json())
-        print(f"✅ 既存URL数: {len(urls)} 件")
-        return urls
-    except Exception as e:
-        print(f"🛑 既存URL取得エラー: {e}")
-        return set()
+    # 前回のスナップショット + 差分（古ければ全件取得）
+    return wp_existing.fetch(WP_GET_URL, auth=(WP_USER, WP_APP_PASS), source_slug="grim-tcg")
 
 # -----------------------------
 # スクレイピング処理
@@ -50,7 +47,7 @@ def scrape_banners() -> list[dict]:
         page = browser.new_page()
         try:
             page.goto(TARGET_URL, timeout=60000, wait_until="load")
-            page.wait_for_timeout(5000)
+            readiness.wait_ready(page, "grim-tcg", ".swiper-wrapper .swiper-slide", images=".swiper-wrapper .swiper-slide img", ceiling_ms=5000)
             slides = page.query_selector_all(".swiper-wrapper .swiper-slide")
         except Exception as e:
             print(f"🛑 ページ読み込み失敗: {e}")
@@ -93,30 +90,18 @@ def post_to_wordpress(banners, existing_urls):
         print("📭 投稿データなし")
         return
 
-    new_items = []
     for item in banners:
-        detail_url = item["detail_url"].strip()
-        if detail_url in existing_urls or item["image_url"] in existing_urls:
-            print(f"⏭ スキップ（重複）: {item['image_url']}")
-            continue
-
+        item["detail_url"] = item["detail_url"].strip()
         item["source_slug"] = "grim-tcg"
-        new_items.append(item)
 
+    new_items, counts = item_diff.split(banners, existing_urls, key=banner_key)
+    print(item_diff.line(counts))
     if not new_items:
-        print("📭 新規データなし（全件既存）")
-        return
-
-    print(f"🚀 新規 {len(new_items)}件をWordPressに送信中...")
-    try:
-        res = requests.post(WP_URL, json=new_items, auth=(WP_USER, WP_APP_PASS), timeout=60)
-        print("Status:", res.status_code)
-        try:
-            print("Response:", json.dumps(res.json(), ensure_ascii=False, indent=2))
-        except Exception:
-            print("Response:", res.text)
-    except Exception as e:
-        print(f"🛑 WordPress送信中にエラー: {e}")
+        print("📭 新規・変更なし")
+    else:
+        print(f"🚀 新規・変更 {len(new_items)}件をWordPressに送信中...")
+    wp_sender.send_all(WP_URL, new_items, auth=(WP_USER, WP_APP_PASS),
+                       on_sent=wp_existing.recorder(WP_GET_URL, key=banner_key))
 
 # -----------------------------
 # メイン処理
@@ -1,9 +1,10 @@
 import os
 import time
 from urllib.parse import urljoin
-import requests
 from requests.auth import HTTPBasicAuth
-from playwright.sync_api import sync_playwright
+from shared_browser import sync_playwright
+import readiness
+import outbox
 
 # -----------------------------
 # WordPress Banner Ingest API
@@ -34,7 +35,7 @@ def scrape_banners() -> list:
 
         try:
             page.goto(TARGET_URL, timeout=60000, wait_until="load")
-            page.wait_for_timeout(5000)
+            readiness.wait_ready(page, "grim-tcg-banners", ".swiper-wrapper .swiper-slide", images=".swiper-wrapper .swiper-slide img", ceiling_ms=5000)
 
             # Swiper スライドの画像取得
             slides = page.query_selector_all(".swiper-wrapper .swiper-slide")
@@ -70,20 +71,16 @@ def scrape_banners() -> list:
 
 
 def post_to_wordpress(banners):
-    """Banner Ingest プラグインへ送信"""
-    if not banners:
+    """Banner Ingest プラグインへ送信（前回送れなかったバナーがあれば一緒に送る）"""
+    if banners:
+        print(f"🚀 {len(banners)} 件を WordPress へ送信中...")
+    else:
         print("📭 投稿データなし")
-        return
-
-    print(f"🚀 {len(banners)} 件を WordPress へ送信中...")
 
     try:
-        res = requests.post(
-            API_URL,
-            json=banners,
-            auth=HTTPBasicAuth(WP_USER, WP_APP_PASS),
-            timeout=60
-        )
+        res = outbox.post_banners(API_URL, banners, auth=HTTPBasicAuth(WP_USER, WP_APP_PASS), timeout=60)
+        if res is None:
+            return
 
         print("📬 Status:", res.status_code)
         try:
@@ -1,9 +1,10 @@
 import os
 from urllib.parse import urljoin
 
-import requests
 from requests.auth import HTTPBasicAuth
-from playwright.sync_api import sync_playwright
+from shared_browser import sync_playwright
+import readiness
+import outbox
 
 
 # 対象サイト
@@ -29,7 +30,7 @@ def scrape_banners() -> list:
 
         try:
             page.goto(TARGET_URL, timeout=60000, wait_until="load")
-            page.wait_for_timeout(5000)
+            readiness.wait_ready(page, "ichica-banners", "#testing img", images="#testing img", ceiling_ms=5000)
 
             # ichica の画像は #testing 内に入っている
             images = page.query_selector_all("#testing img")
@@ -65,12 +66,11 @@ def send_to_wordpress(payload: list):
 
     print(f"📡 WordPress へ送信中: {api_url}")
 
-    res = requests.post(
-        api_url,
-        json=payload,
-        auth=HTTPBasicAuth(WP_USER, WP_APP_PASS),
-        timeout=30,
-    )
+    # 前回送れなかったバナーがあれば一緒に送る
+    res = outbox.post_banners(api_url, payload, auth=HTTPBasicAuth(WP_USER, WP_APP_PASS), timeout=30)
+    if res is None:
+        print("📭 送信データなし")
+        return
 
     print("📬 ステータス:", res.status_code)
     try:
@@ -84,7 +84,6 @@ def main():
 
     if not banners:
         print("📭 新規バナーなし（または取得失敗）")
-        return
 
     send_to_wordpress(banners)
 
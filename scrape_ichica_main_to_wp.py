@@ -1,10 +1,13 @@
 import os
 import re
 import time
-import json
 from urllib.parse import urljoin, urlparse
-from playwright.sync_api import sync_playwright
-import requests
+from shared_browser import sync_playwright
+import readiness
+import resource_policy
+import wp_sender
+import wp_existing
+import item_diff
 
 # -----------------------------
 # WordPress REST API 設定
@@ -25,18 +28,8 @@ BASE_URL = "https://ichica.co/"
 # WordPress既存URL取得
 # -----------------------------
 def fetch_existing_urls() -> set:
-    print("🔍 WordPress既存URLを取得中...")
-    try:
-        res = requests.get(WP_GET_URL, auth=(WP_USER, WP_APP_PASS), timeout=30)
-        if res.status_code != 200:
-            print(f"⚠️ URL取得失敗: {res.status_code}")
-            return set()
-        urls = set(res.json())
-        print(f"✅ 既存URL数: {len(urls)} 件")
-        return urls
-    except Exception as e:
-        print(f"🛑 既存URL取得エラー: {e}")
-        return set()
+    # 前回のスナップショット + 差分（古ければ全件取得）
+    return wp_existing.fetch(WP_GET_URL, auth=(WP_USER, WP_APP_PASS), source_slug="ichica-main")
 
 # -----------------------------
 # URL正規化
@@ -55,9 +48,10 @@ def scrape_items() -> list[dict]:
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True, args=["--no-sandbox"])
         page = browser.new_page()
+        stats = resource_policy.install(page, "ichica-main", BASE_URL)
         try:
             page.goto(BASE_URL, timeout=120000)
-            page.wait_for_timeout(7000)
+            readiness.wait_ready(page, "ichica-main", "div.clickable-element.bubble-element.Group.cmgaAm", images="div.clickable-element.bubble-element.Group.cmgaAm div.bubble-element.Image.cmgaBaP img", ceiling_ms=7000)
             cards = page.query_selector_all('div.clickable-element.bubble-element.Group.cmgaAm')
             print(f"🟢 検出数: {len(cards)}")
         except Exception as exc:
@@ -108,6 +102,7 @@ def scrape_items() -> list[dict]:
                 "extra": {"scraped_at": time.strftime("%Y-%m-%d %H:%M:%S")}
             })
 
+        stats.finish()
         browser.close()
 
     print(f"✅ {len(items)} 件のデータを取得完了")
@@ -121,28 +116,14 @@ def post_to_wordpress(items, existing_urls):
         print("📭 投稿データなし")
         return
 
-    new_items = []
-    for item in items:
-        detail_url = item.get("detail_url", "").strip()
-        if detail_url in existing_urls:
-            print(f"⏭ スキップ（重複）: {item['title']}")
-            continue
-        new_items.append(item)
-
+    new_items, counts = item_diff.split(items, existing_urls, key=lambda item: item.get("detail_url", "").strip())
+    print(item_diff.line(counts))
     if not new_items:
-        print("📭 新規データなし（全件既存）")
-        return
-
-    print(f"🚀 新規 {len(new_items)}件をWordPressに送信中...")
-    try:
-        res = requests.post(WP_URL, json=new_items, auth=(WP_USER, WP_APP_PASS), timeout=60)
-        print("Status:", res.status_code)
-        try:
-            print("Response:", json.dumps(res.json(), ensure_ascii=False, indent=2))
-        except Exception:
-            print("Response:", res.text)
-    except Exception as e:
-        print("🛑 WordPress送信中にエラー:", e)
+        print("📭 新規・変更なし")
+    else:
+        print(f"🚀 新規・変更 {len(new_items)}件をWordPressに送信中...")
+    wp_sender.send_all(WP_URL, new_items, auth=(WP_USER, WP_APP_PASS),
+                       on_sent=wp_existing.recorder(WP_GET_URL))
 
 # -----------------------------
 # メイン処理
@@ -1,10 +1,12 @@
 import os
 import re
 import time
-import json
 from urllib.parse import urljoin, urlparse
-from playwright.sync_api import sync_playwright
-import requests
+from shared_browser import sync_playwright
+import readiness
+import resource_policy
+import wp_sender
+import wp_existing
 
 # -----------------------------
 # WordPress REST API 設定
@@ -26,18 +28,8 @@ TARGET_URL = "https://ichica.co/?tab=Lotteries&dds=recommended"
 # WordPress既存URL取得
 # -----------------------------
 def fetch_existing_urls() -> set:
-    print("🔍 WordPress既存URLを取得中...")
-    try:
-        res = requests.get(WP_GET_URL, auth=(WP_USER, WP_APP_PASS), timeout=30)
-        if res.status_code != 200:
-            print(f"⚠️ URL取得失敗: {res.status_code}")
-            return set()
-        urls = set(res.json())
-        print(f"✅ 既存URL数: {len(urls)} 件")
-        return urls
-    except Exception as e:
-        print(f"🛑 既存URL取得エラー: {e}")
-        return set()
+    # 前回のスナップショット + 差分（古ければ全件取得）
+    return wp_existing.fetch(WP_GET_URL, auth=(WP_USER, WP_APP_PASS), source_slug="ichica")
 
 # -----------------------------
 # URL正規化
@@ -63,10 +55,11 @@ def scrape_banners() -> list[dict]:
             )
         )
         page = context.new_page()
+        stats = resource_policy.install(page, "ichica", TARGET_URL)
 
         try:
             page.goto(TARGET_URL, timeout=60000, wait_until="load")
-            page.wait_for_timeout(5000)
+            readiness.wait_ready(page, "ichica", "#testing img", images="#testing img", ceiling_ms=5000)
             images = page.query_selector_all("#testing img")
         except Exception as e:
             print(f"🛑 ページ読み込み失敗: {e}")
@@ -83,6 +76,7 @@ def scrape_banners() -> list[dict]:
             src = urljoin(BASE_URL, src)
             rows.append({"image": src, "detail_url": TARGET_URL})
 
+        stats.finish()
         browser.close()
 
     print(f"✅ {len(rows)} 件のデータ取得完了")
@@ -123,18 +117,10 @@ def post_to_wordpress(items, existing_urls):
 
     if not new_items:
         print("📭 新規データなし（全件既存）")
-        return
-
-    print(f"🚀 新規 {len(new_items)}件をWordPressに送信中...")
-    try:
-        res = requests.post(WP_URL, json=new_items, auth=(WP_USER, WP_APP_PASS), timeout=60)
-        print("Status:", res.status_code)
-        try:
-            print("Response:", json.dumps(res.json(), ensure_ascii=False, indent=2))
-        except Exception:
-            print("Response:", res.text)
-    except Exception as e:
-        print(f"🛑 WordPress送信中にエラー: {e}")
+    else:
+        print(f"🚀 新規 {len(new_items)}件をWordPressに送信中...")
+    wp_sender.send_all(WP_URL, new_items, auth=(WP_USER, WP_APP_PASS),
+                       on_sent=wp_existing.recorder(WP_GET_URL))
 
 # -----------------------------
 # メイン処理
@@ -1,10 +1,13 @@
 import os
 import re
 import time
-import json
 from urllib.parse import urljoin
 from typing import List
-import requests
+import http_session
+import wp_sender
+import wp_existing
+import item_diff
+import stream_fetch
 from bs4 import BeautifulSoup
 
 # -----------------------------
@@ -24,29 +27,20 @@ THUMBNAIL_SELECTOR = "div.pack-thumbnail img"
 PRICE_SELECTOR = "div.pack-price-count i"
 TITLE_SELECTOR = "h1"
 HEADERS = {"User-Agent": "Mozilla/5.0"}
+TITLE_TARGETS = [stream_fetch.Target(TITLE_SELECTOR)]
 
 # -----------------------------
 # WordPress既存URL取得
 # -----------------------------
 def fetch_existing_urls() -> set:
-    print("🔍 WordPress既存URLを取得中...")
-    try:
-        res = requests.get(WP_GET_URL, auth=(WP_USER, WP_APP_PASS), timeout=30)
-        if res.status_code != 200:
-            print(f"⚠️ URL取得失敗: {res.status_code}")
-            return set()
-        urls = set(res.json())
-        print(f"✅ 既存URL数: {len(urls)} 件")
-        return urls
-    except Exception as e:
-        print(f"🛑 既存URL取得エラー: {e}")
-        return set()
+    # 前回のスナップショット + 差分（古ければ全件取得）
+    return wp_existing.fetch(WP_GET_URL, auth=(WP_USER, WP_APP_PASS), source_slug="iris-toreca")
 
 # -----------------------------
 # HTML取得ヘルパー
 # -----------------------------
 def fetch_page(url: str) -> BeautifulSoup:
-    resp = requests.get(url, headers=HEADERS, timeout=30)
+    resp = http_session.get(url, headers=HEADERS, timeout=30)
     resp.raise_for_status()
     return BeautifulSoup(resp.text, "html.parser")
 
@@ -63,7 +57,9 @@ def extract_pt(text: str) -> str:
 def fetch_title(detail_url: str) -> str:
     time.sleep(1)  # polite delay
     try:
-        soup = fetch_page(detail_url)
+        # 最初の h1 を読み終えたら残りは受信しない（h1 がなければ最後まで読んで <title> を使う）
+        html = stream_fetch.fetch_until(detail_url, TITLE_TARGETS, headers=HEADERS)
+        soup = BeautifulSoup(html, "html.parser")
     except Exception as exc:
         print(f"⚠ 詳細ページ読み込み失敗: {detail_url} ({exc})")
         return ""
@@ -111,31 +107,25 @@ def scrape(existing_urls: set) -> List[dict]:
             "extra": {"scraped_at": time.strftime("%Y-%m-%d %H:%M:%S")}
         })
     print(f"✅ {len(results)} 件のデータを取得完了")
+    print(stream_fetch.STATS.line())
     return results
 
 # -----------------------------
 # WordPress REST API投稿（重複除外）
 # -----------------------------
-def post_to_wordpress(items: List[dict], existing_urls: set):
+def post_to_wordpress(items: List[dict], existing_urls):
     if not items:
         print("📭 投稿データなし")
         return
 
-    new_items = [item for item in items if item["detail_url"] not in existing_urls]
+    new_items, counts = item_diff.split(items, existing_urls)
+    print(item_diff.line(counts))
     if not new_items:
-        print("📭 新規データなし（全件既存）")
-        return
-
-    print(f"🚀 新規 {len(new_items)}件をWordPressに送信中...")
-    try:
-        res = requests.post(WP_URL, json=new_items, auth=(WP_USER, WP_APP_PASS), timeout=60)
-        print("Status:", res.status_code)
-        try:
-            print("Response:", json.dumps(res.json(), ensure_ascii=False, indent=2))
-        except Exception:
-            print("Response:", res.text)
-    except Exception as e:
-        print(f"🛑 WordPress送信中にエラー: {e}")
+        print("📭 新規・変更なし")
+    else:
+        print(f"🚀 新規・変更 {len(new_items)}件をWordPressに送信中...")
+    wp_sender.send_all(WP_URL, new_items, auth=(WP_USER, WP_APP_PASS),
+                       on_sent=wp_existing.recorder(WP_GET_URL))
 
 # -----------------------------
 # メイン処理
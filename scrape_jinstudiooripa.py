@@ -1,15 +1,14 @@
 import os
 import re
 import time
-import json
-import requests
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
+import wp_sender
+import wp_existing
+import item_diff
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
-from webdriver_manager.chrome import ChromeDriverManager
+from selenium_driver import new_chrome
 from bs4 import BeautifulSoup
 
 # -----------------------------
@@ -33,24 +32,14 @@ options.add_argument(
     "user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
 )
 
-driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+driver = new_chrome(options)
 
 # -----------------------------
 # WordPress 既存URL取得
 # -----------------------------
 def fetch_existing_urls() -> set:
-    print("🔍 WordPress既存URLを取得中...")
-    try:
-        res = requests.get(WP_GET_URL, auth=(WP_USER, WP_APP_PASS), timeout=30)
-        if res.status_code != 200:
-            print(f"⚠️ URL取得失敗: {res.status_code}")
-            return set()
-        urls = set(res.json())
-        print(f"✅ 既存URL数: {len(urls)} 件")
-        return urls
-    except Exception as e:
-        print(f"🛑 既存URL取得エラー: {e}")
-        return set()
+    # 前回のスナップショット + 差分（古ければ全件取得）
+    return wp_existing.fetch(WP_GET_URL, auth=(WP_USER, WP_APP_PASS), source_slug="jinstudiooripa")
 
 # -----------------------------
 # jinstudiooripa.com スクレイピング
@@ -114,21 +103,14 @@ def post_to_wordpress(items, existing_urls):
         print("📭 投稿データなし")
         return
 
-    new_items = [item for item in items if item["detail_url"] not in existing_urls]
+    new_items, counts = item_diff.split(items, existing_urls)
+    print(item_diff.line(counts))
     if not new_items:
-        print("📭 新規データなし（全件重複）")
-        return
-
-    print(f"🚀 新規 {len(new_items)}件をWordPressに送信中...")
-    try:
-        res = requests.post(WP_URL, json=new_items, auth=(WP_USER, WP_APP_PASS), timeout=60)
-        print("Status:", res.status_code)
-        try:
-            print("Response:", json.dumps(res.json(), ensure_ascii=False, indent=2))
-        except Exception:
-            print("Response:", res.text)
-    except Exception as e:
-        print("🛑 WordPress送信中にエラー:", e)
+        print("📭 新規・変更なし")
+    else:
+        print(f"🚀 新規・変更 {len(new_items)}件をWordPressに送信中...")
+    wp_sender.send_all(WP_URL, new_items, auth=(WP_USER, WP_APP_PASS),
+                       on_sent=wp_existing.recorder(WP_GET_URL))
 
 # -----------------------------
 # メイン処理
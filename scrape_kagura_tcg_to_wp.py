@@ -1,10 +1,15 @@
 import os
 import re
-import time
 import json
+import time
 from urllib.parse import urljoin, urlparse
-from playwright.sync_api import sync_playwright
-import requests
+from shared_browser import sync_playwright
+import readiness
+import resource_policy
+from nav_intercept import NavInterceptor
+import wp_sender
+import wp_existing
+import item_diff
 
 # -----------------------------
 # WordPress REST API 設定
@@ -23,18 +28,8 @@ BASE_URL = "https://kagura-tcg.com/"
 # WordPress既存URL取得
 # -----------------------------
 def fetch_existing_urls() -> set:
-    print("🔍 WordPress既存URLを取得中...")
-    try:
-        res = requests.get(WP_GET_URL, auth=(WP_USER, WP_APP_PASS), timeout=30)
-        if res.status_code != 200:
-            print(f"⚠️ URL取得失敗: {res.status_code}")
-            return set()
-        urls = set(res.json())
-        print(f"✅ 既存URL数: {len(urls)} 件")
-        return urls
-    except Exception as e:
-        print(f"🛑 既存URL取得エラー: {e}")
-        return set()
+    # 前回のスナップショット + 差分（古ければ全件取得）
+    return wp_existing.fetch(WP_GET_URL, auth=(WP_USER, WP_APP_PASS), source_slug="kagura-tcg")
 
 # -----------------------------
 # URL正規化
@@ -43,21 +38,186 @@ def strip_query(url: str) -> str:
     parsed = urlparse(url)
     return f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
 
+# -----------------------------
+# 詳細URLの解決（クリックを横取りして遷移させない）
+# -----------------------------
+CARD_SELECTOR = "div.flex.flex-col.cursor-pointer"
+DETAIL_CONCURRENCY = int(os.getenv("KAGURA_DETAIL_CONCURRENCY", "4"))
+
+# 既存URLのうち、毎回詳細を取り直して変更（PT・タイトル・画像）を確認する件数。
+# 最後に確認した時刻を記録し、古いものから順に回す
+RECHECK_LIMIT = int(os.getenv("KAGURA_RECHECK_LIMIT", "30"))
+RECHECK_PATH = os.getenv("KAGURA_RECHECK_PATH", ".cache/kagura_recheck.json")
+
+
+def card_image(card) -> str:
+    try:
+        img_div = card.query_selector("div[style*='background-image']")
+        style = img_div.get_attribute("style") if img_div else ""
+        match = re.search(r'url\(["\']?(.*?)["\']?\)', style or "")
+        image_url = match.group(1) if match else ""
+        return urljoin(BASE_URL, image_url) if image_url.startswith("/") else image_url
+    except Exception:
+        return ""
+
+
+def open_listing(page, nav):
+    page.goto(BASE_URL, timeout=60000, wait_until="domcontentloaded")
+    readiness.wait_ready(page, "kagura-tcg", CARD_SELECTOR, ceiling_ms=3000)
+    nav.hook()
+    return page.query_selector_all(CARD_SELECTOR)
+
+
+def resolve_detail_urls(page) -> list[dict]:
+    """一覧ページを1回読み込み、各カードの詳細URLと画像URLを集める"""
+    nav = NavInterceptor(page, BASE_URL)
+    cards = open_listing(page, nav)
+    total = len(cards)
+    print(f"📦 検出件数: {total}")
+
+    entries = []
+    reloads = 0
+    for i in range(total):
+        try:
+            image_url = card_image(cards[i])
+            detail_url = nav.click(cards[i])
+        except Exception as e:
+            print(f"⚠️ アイテム処理失敗: {e}")
+            detail_url = ""
+            image_url = ""
+
+        if detail_url:
+            entries.append({"detail_url": detail_url, "image_url": image_url})
+        else:
+            print("⚠️ URLが空のためスキップ")
+
+        # 横取りできずに画面が切り替わったときだけ一覧を読み直す
+        if i + 1 < total and (nav.left_listing() or len(page.query_selector_all(CARD_SELECTOR)) != total):
+            reloads += 1
+            cards = open_listing(page, nav)
+            if len(cards) != total:
+                print(f"⚠️ 再読み込み後の件数が変化: {total} → {len(cards)}")
+                break
+
+    print(f"🔗 詳細URL解決: {len(entries)} 件（一覧の再読み込み {reloads} 回）")
+    return entries
+
+
+# -----------------------------
+# 詳細ページの並列取得
+# -----------------------------
+def read_detail(page, entry: dict):
+    page.wait_for_selector("h1", timeout=30000)
+    title = page.query_selector("h1").inner_text().strip() or "noname"
+
+    pt_value = ""
+    try:
+        pt_el = page.wait_for_selector(".fa-coins", timeout=5000)
+        pt_text = pt_el.evaluate("el => el.parentElement.textContent")
+        pt_value = re.sub(r"[^0-9]", "", pt_text)
+    except Exception:
+        pass
+
+    return {
+        "source_slug": "kagura-tcg",
+        "title": title,
+        "image_url": entry["image_url"],
+        "detail_url": entry["detail_url"],
+        "points": pt_value,
+        "price": None,
+        "rarity": None,
+        "extra": {"scraped_at": time.strftime("%Y-%m-%d %H:%M:%S")}
+    }
+
+
+def fetch_details(browser, entries: list) -> list[dict]:
+    """DETAIL_CONCURRENCY 枚のページで詳細ページを同時に読み込む
+
+    sync API でも、goto を wait_until="commit" で各ページに発行してから
+    順に読み取れば、残りのページの読み込みはブラウザ側で並行して進む。
+    """
+    rows = []
+    if not entries:
+        return rows
+
+    context = browser.new_context()
+    stats = resource_policy.install(context, "kagura-tcg-detail", BASE_URL)
+    pages = [context.new_page() for _ in range(min(DETAIL_CONCURRENCY, len(entries)))]
+
+    for start in range(0, len(entries), len(pages)):
+        batch = list(zip(pages, entries[start:start + len(pages)]))
+        started = []
+        for page, entry in batch:
+            try:
+                page.goto(entry["detail_url"], timeout=30000, wait_until="commit")
+                started.append((page, entry))
+            except Exception as e:
+                print(f"⚠️ 詳細ページ読み込み失敗: {entry['detail_url']} ({e})")
+        for page, entry in started:
+            try:
+                rows.append(read_detail(page, entry))
+            except Exception as e:
+                print(f"⚠️ アイテム処理失敗: {entry['detail_url']} ({e})")
+
+    stats.finish()
+    context.close()
+    return rows
+
+
+# -----------------------------
+# 既存URLの再確認
+# -----------------------------
+def load_checked() -> dict:
+    try:
+        with open(RECHECK_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_checked(checked: dict) -> None:
+    try:
+        os.makedirs(os.path.dirname(RECHECK_PATH) or ".", exist_ok=True)
+        with open(RECHECK_PATH, "w", encoding="utf-8") as f:
+            json.dump(checked, f, ensure_ascii=False)
+    except OSError as e:
+        print(f"⚠️ 再確認時刻の保存失敗: {e}")
+
+
+def select_targets(entries: list, existing_urls) -> list:
+    """詳細を取得するもの: 新規すべてと、既存のうち確認の古いもの RECHECK_LIMIT 件"""
+    checked = load_checked()
+    new_entries = [e for e in entries if strip_query(e["detail_url"]) not in existing_urls]
+    known = [e for e in entries if strip_query(e["detail_url"]) in existing_urls]
+    recheck = sorted(known, key=lambda e: checked.get(strip_query(e["detail_url"]), 0))[:RECHECK_LIMIT]
+    print(f"🆕 詳細取得対象: 新規 {len(new_entries)} 件 + 既存の再確認 {len(recheck)} / {len(known)} 件")
+    return new_entries + recheck
+
+
+def mark_checked(entries: list, rows: list) -> None:
+    """詳細を取得できたものの確認時刻を記録する（一覧から消えたものは忘れる）"""
+    listed = {strip_query(e["detail_url"]) for e in entries}
+    checked = {url: at for url, at in load_checked().items() if url in listed}
+    now = time.time()
+    for row in rows:
+        checked[strip_query(row["detail_url"])] = now
+    save_checked(checked)
+
+
 # -----------------------------
 # スクレイピング処理
 # -----------------------------
-def scrape_items() -> list[dict]:
+def scrape_items(existing_urls=frozenset()) -> list[dict]:
     rows = []
     print("🔍 kagura-tcg.com スクレイピング開始...")
 
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True, args=["--no-sandbox"])
         page = browser.new_page()
+        stats = resource_policy.install(page, "kagura-tcg", BASE_URL)
 
         try:
-            page.goto(BASE_URL, timeout=60000, wait_until="domcontentloaded")
-            page.wait_for_timeout(3000)
-            cards = page.query_selector_all("div.flex.flex-col.cursor-pointer")
+            entries = resolve_detail_urls(page)
         except Exception as exc:
             print(f"🛑 ページ読み込み失敗: {exc}")
             try:
@@ -69,77 +229,13 @@ def scrape_items() -> list[dict]:
                 print(f"⚠️ HTML保存失敗: {e}")
             browser.close()
             return rows
+        stats.finish()
+        page.close()
 
-        print(f"📦 検出件数: {len(cards)}")
-
-        for i in range(len(cards)):
-            try:
-                cards = page.query_selector_all("div.flex.flex-col.cursor-pointer")
-                card = cards[i]
-
-                # 画像URL取得
-                image_url = ""
-                try:
-                    img_div = card.query_selector("div[style*='background-image']")
-                    style = img_div.get_attribute("style") if img_div else ""
-                    match = re.search(r'url\(["\']?(.*?)["\']?\)', style or "")
-                    image_url = match.group(1) if match else ""
-                    if image_url.startswith("/"):
-                        image_url = urljoin(BASE_URL, image_url)
-                except:
-                    pass
-
-                # 詳細ページ遷移
-                with page.expect_navigation(wait_until="load", timeout=30000):
-                    card.click()
-
-                detail_url = page.url
-                norm_url = strip_query(detail_url)
-                if not norm_url:
-                    print("⚠️ URLが空のためスキップ")
-                    page.go_back()
-                    continue
-
-                # タイトル・価格取得
-                title = "noname"
-                try:
-                    title = page.query_selector("h1").inner_text().strip()
-                except:
-                    pass
-
-                pt_value = ""
-                try:
-                    pt_el = page.query_selector(".fa-coins")
-                    pt_text = pt_el.evaluate("el => el.parentElement.textContent") if pt_el else ""
-                    pt_value = re.sub(r"[^0-9]", "", pt_text)
-                except:
-                    pass
-
-                rows.append({
-                    "source_slug": "kagura-tcg",
-                    "title": title,
-                    "image_url": image_url,
-                    "detail_url": detail_url,
-                    "points": pt_value,
-                    "price": None,
-                    "rarity": None,
-                    "extra": {"scraped_at": time.strftime("%Y-%m-%d %H:%M:%S")}
-                })
-
-                page.go_back()
-                page.wait_for_timeout(1000)
-                page.wait_for_selector("div.flex.flex-col.cursor-pointer", timeout=10000)
-
-            except Exception as e:
-                print(f"⚠️ アイテム処理失敗: {e}")
-                try:
-                    page.go_back()
-                    page.wait_for_timeout(1000)
-                    page.wait_for_selector("div.flex.flex-col.cursor-pointer", timeout=10000)
-                except:
-                    pass
-
+        # 既存URLは確認の古いものだけ詳細を取り直し、item_diff で変更を判定する
+        rows = fetch_details(browser, select_targets(entries, existing_urls))
         browser.close()
+        mark_checked(entries, rows)
     print(f"✅ {len(rows)} 件のデータを取得完了")
     return rows
 
@@ -151,28 +247,14 @@ def post_to_wordpress(items, existing_urls):
         print("📭 投稿データなし")
         return
 
-    new_items = []
-    for item in items:
-        norm_url = strip_query(item["detail_url"])
-        if norm_url in existing_urls:
-            print(f"⏭ スキップ（重複）: {item['title']}")
-            continue
-        new_items.append(item)
-
+    new_items, counts = item_diff.split(items, existing_urls, key=lambda item: strip_query(item["detail_url"]))
+    print(item_diff.line(counts))
     if not new_items:
-        print("📭 新規データなし（全件既存）")
-        return
-
-    print(f"🚀 新規 {len(new_items)}件をWordPressに送信中...")
-    try:
-        res = requests.post(WP_URL, json=new_items, auth=(WP_USER, WP_APP_PASS), timeout=60)
-        print("Status:", res.status_code)
-        try:
-            print("Response:", json.dumps(res.json(), ensure_ascii=False, indent=2))
-        except Exception:
-            print("Response:", res.text)
-    except Exception as e:
-        print(f"🛑 WordPress送信中にエラー: {e}")
+        print("📭 新規・変更なし")
+    else:
+        print(f"🚀 新規・変更 {len(new_items)}件をWordPressに送信中...")
+    wp_sender.send_all(WP_URL, new_items, auth=(WP_USER, WP_APP_PASS),
+                       on_sent=wp_existing.recorder(WP_GET_URL))
 
 # -----------------------------
 # メイン処理
@@ -180,7 +262,7 @@ def post_to_wordpress(items, existing_urls):
 def main():
     start = time.time()
     existing_urls = fetch_existing_urls()
-    items = scrape_items()
+    items = scrape_items(existing_urls)
     post_to_wordpress(items, existing_urls)
     print(f"🏁 完了！処理時間: {round(time.time() - start, 2)} 秒")
 
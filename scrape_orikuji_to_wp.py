@@ -1,9 +1,10 @@
 import os
 import time
-import json
 from urllib.parse import urljoin
-from playwright.sync_api import sync_playwright
-import requests
+from shared_browser import sync_playwright
+import wp_sender
+import wp_existing
+import item_diff
 
 # -----------------------------
 # WordPress REST API 設定
@@ -25,18 +26,8 @@ TARGET_URL = "https://orikuji.com/"
 # 既存URL取得
 # -----------------------------
 def fetch_existing_urls() -> set:
-    print("🔍 WordPress既存URLを取得中...")
-    try:
-        res = requests.get(WP_GET_URL, auth=(WP_USER, WP_APP_PASS), timeout=30)
-        if res.status_code != 200:
-            print(f"⚠️ 既存URL取得失敗: {res.status_code}")
-            return set()
-        urls = set(res.json())
-        print(f"✅ 既存URL数: {len(urls)} 件")
-        return urls
-    except Exception as e:
-        print(f"🛑 既存URL取得エラー: {e}")
-        return set()
+    # 前回のスナップショット + 差分（古ければ全件取得）
+    return wp_existing.fetch(WP_GET_URL, auth=(WP_USER, WP_APP_PASS), source_slug="orikuji")
 
 # -----------------------------
 # スクレイピング処理
@@ -126,11 +117,6 @@ def post_to_wordpress(items, existing_urls):
         if image_url.startswith("/"):
             image_url = urljoin(BASE_URL, image_url)
 
-        # 重複チェック
-        if detail_url in existing_urls:
-            print(f"⏭ スキップ（重複）: {title}")
-            continue
-
         payload.append({
             "source_slug": "orikuji",
             "title": title,
@@ -142,20 +128,15 @@ def post_to_wordpress(items, existing_urls):
             "extra": {"scraped_at": time.strftime("%Y-%m-%d %H:%M:%S")}
         })
 
+    # 新規と、PT・タイトル・画像が変わったものだけを送る
+    payload, counts = item_diff.split(payload, existing_urls)
+    print(item_diff.line(counts))
     if not payload:
-        print("📭 新規データなし（全件既存）")
-        return
-
-    print(f"🚀 新規 {len(payload)}件のデータをWordPressに送信中...")
-    try:
-        res = requests.post(WP_URL, json=payload, auth=(WP_USER, WP_APP_PASS), timeout=60)
-        print("Status:", res.status_code)
-        try:
-            print("Response:", json.dumps(res.json(), ensure_ascii=False, indent=2))
-        except Exception:
-            print("Response:", res.text)
-    except Exception as e:
-        print("🛑 送信エラー:", e)
+        print("📭 新規・変更なし")
+    else:
+        print(f"🚀 新規・変更 {len(payload)}件のデータをWordPressに送信中...")
+    wp_sender.send_all(WP_URL, payload, auth=(WP_USER, WP_APP_PASS),
+                       on_sent=wp_existing.recorder(WP_GET_URL))
 
 # -----------------------------
 # メイン処理
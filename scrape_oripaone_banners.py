@@ -4,7 +4,8 @@ from urllib.parse import urljoin
 
 import gspread
 from google.oauth2.service_account import Credentials
-from playwright.sync_api import sync_playwright
+from shared_browser import sync_playwright
+import outbox
 
 BASE_URL = "https://oripaone.jp"
 TARGET_URL = BASE_URL
@@ -109,9 +110,10 @@ def main():
             existing_urls.add(row[0])
 
     rows = scrape_banners(existing_urls)
-    if rows:
-        sheet.append_rows(rows, value_input_option="RAW")
-        print(f"✅ {len(rows)} 件追加しました")
+    # 前回追記できなかった行があれば一緒に追記する
+    appended = outbox.append_rows(sheet, rows, value_input_option="RAW")
+    if appended:
+        print(f"✅ {appended} 件追加しました")
     else:
         print("📭 新規データなし")
 
@@ -1,10 +1,15 @@
 import os
 import time
-import re
-import requests
-from bs4 import BeautifulSoup
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from playwright.sync_api import sync_playwright
+import asyncio
+import wp_sender
+import wp_existing
+from shared_browser import sync_playwright
+import sitemap_discovery
+import detail_fetcher
+import card_extract
+import stream_fetch
+from page_cache import PageCache
+from price_history import PriceHistory
 
 # --------------------------------
 # WordPress REST API 設定
@@ -14,165 +19,198 @@ WP_LIST_URL = "https://online-gacha-hack.com/wp-json/pokeca/v1/list"
 WP_USER = os.getenv("WP_USER")
 WP_APP_PASS = os.getenv("WP_APP_PASS")
 
+# カードURLの取得方法: sitemap（失敗時は scroll に切り替え）/ scroll
+DISCOVERY = os.getenv("POKECA_DISCOVERY", "sitemap")
+
+# new: 新規カードのみ / refresh: 既存カードの価格更新のみ / both: 両方
+MODE = os.getenv("POKECA_MODE", "new")
+
+# 価格更新で1回に取得する既存カードの上限
+REFRESH_BUDGET = int(os.getenv("POKECA_REFRESH_BUDGET", "500"))
+
 # --------------------------------
 # 既存URL取得
 # --------------------------------
 def fetch_existing_urls():
-    try:
-        res = requests.get(WP_LIST_URL, auth=(WP_USER, WP_APP_PASS), timeout=20)
-        urls = set(res.json())
-        print(f"🔎 既存 {len(urls)} 件")
-        return urls
-    except Exception as e:
-        print("🛑 URL取得エラー:", e)
-        return set()
+    # 価格更新の対象を選ぶため URL の文字列も保存して set で返す
+    return set(wp_existing.fetch(WP_LIST_URL, auth=(WP_USER, WP_APP_PASS), keep_urls=True))
 
 
 # --------------------------------
 # /all-card を無限スクロールして全カードURLを抽出
 # --------------------------------
-def fetch_all_card_urls(scroll_count=150):
+ALL_CARD_URL = "https://pokeca-chart.com/all-card"
+
+# 既存URLがこの件数続いたら、それより下は取得済みとみなしてスクロールを止める
+KNOWN_RUN_LIMIT = int(os.getenv("POKECA_KNOWN_RUN_LIMIT", "60"))
+
+# スクロール後、カードが増えるのを待つ上限
+GROW_TIMEOUT_MS = 5000
+
+# ブラウザ内で MutationObserver がカードURLを集め、Python 側は差分だけ受け取る
+HARVEST_JS = """
+() => {
+    const pattern = /^https:\\/\\/pokeca-chart\\.com\\/[a-z0-9\\-]+$/i;
+    const state = window.__harvest = {seen: new Set(), pending: []};
+    const collect = (root) => {
+        const anchors = root.matches && root.matches('a[href]') ? [root] : [];
+        if (root.querySelectorAll) anchors.push(...root.querySelectorAll('a[href]'));
+        for (const a of anchors) {
+            let href = a.getAttribute('href').trim();
+            if (href.startsWith('/')) href = 'https://pokeca-chart.com' + href;
+            if (pattern.test(href) && !state.seen.has(href)) {
+                state.seen.add(href);
+                state.pending.push(href);
+            }
+        }
+    };
+    collect(document);
+    new MutationObserver(mutations => {
+        for (const m of mutations) m.addedNodes.forEach(collect);
+    }).observe(document.body, {childList: true, subtree: true});
+}
+"""
+
+DRAIN_JS = "() => { const batch = window.__harvest.pending; window.__harvest.pending = []; return batch; }"
+
+GROWN_JS = "(h) => window.__harvest.pending.length > 0 || document.body.scrollHeight > h"
+
+
+def fetch_all_card_urls(scroll_count=150, existing=frozenset()):
 
-    print(f"🔍 /all-card を {scroll_count} 回スクロールして全カード取得…")
+    print(f"🔍 /all-card を最大 {scroll_count} 回スクロールしてカードURLを収集…")
+    urls = []
+    known_run = 0
+
+    def drain():
+        nonlocal known_run
+        batch = page.evaluate(DRAIN_JS)
+        for href in batch:
+            urls.append(href)
+            known_run = known_run + 1 if href in existing else 0
+        return batch
 
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=True, args=["--no-sandbox"])
         page = browser.new_page(viewport={"width": 1280, "height": 2000})
-        page.goto("https://pokeca-chart.com/all-card", wait_until="networkidle")
-        time.sleep(1.5)
-
-        last_height = 0
+        page.goto(ALL_CARD_URL, wait_until="networkidle")
+        page.evaluate(HARVEST_JS)
+        drain()
 
         for i in range(scroll_count):
+            if existing and known_run >= KNOWN_RUN_LIMIT:
+                print(f"⏹ 既存URLが {known_run} 件続いたためスクロール終了（{i} 回）")
+                break
+            last_height = page.evaluate("document.body.scrollHeight")
             page.evaluate("window.scrollTo(0, document.body.scrollHeight)")
-            time.sleep(1.2)  # ページ読み込み待機
-            new_height = page.evaluate("document.body.scrollHeight")
-            if new_height == last_height:
-                print(f"⚠️ スクロール {i}で高さ変化なし → それ以上カードは増えない可能性")
+            try:
+                page.wait_for_function(GROWN_JS, arg=last_height, timeout=GROW_TIMEOUT_MS, polling=100)
+            except Exception:
+                print(f"⚠️ スクロール {i}で増加なし → それ以上カードは増えない可能性")
+                drain()
                 break
-            last_height = new_height
-            print(f"  → スクロール {i+1}/{scroll_count}")
+            batch = drain()
+            print(f"  → スクロール {i+1}/{scroll_count}: +{len(batch)} 件（累計 {len(urls)}）")
 
-        soup = BeautifulSoup(page.content(), "html.parser")
         browser.close()
 
-    urls = set()
+    print(f"\n🎉 最終取得カードURL総数: {len(urls)} 件\n")
+    return urls
 
-    # カードURLの共通パターン
-    pattern = re.compile(r"^https://pokeca-chart\.com/[a-z0-9\-]+$", re.IGNORECASE)
 
-    for a in soup.find_all("a", href=True):
-        href = a["href"].strip()
+# --------------------------------
+# 詳細ページの解析（取得は detail_fetcher）
+# --------------------------------
+# parse_card_detail を変えたら上げる（キャッシュ済みの parse 結果を使わなくなる）
+DETAIL_CACHE_KEY = "pokeca-chart-detail:1"
 
-        # 相対パス → 絶対URL化
-        if href.startswith("/"):
-            href = "https://pokeca-chart.com" + href
 
-        if pattern.match(href):
-            urls.add(href)
+def parse_card_detail(url, html):
 
-    print(f"\n🎉 最終取得カードURL総数: {len(urls)} 件\n")
-    return list(urls)
+    # h1・画像・価格表の部分だけを parse する（結果は全体を parse した場合と同じ）
+    return card_extract.card_detail(card_extract.card_soup(html), url)
 
 
 # --------------------------------
-# 詳細ページスクレイピング（requests高速版）
+# 詳細取得 → WP 送信のパイプライン
 # --------------------------------
-def fetch_card_detail(url):
+# 取得済みで送信待ちのカードの上限（これを超えると取得を待たせる）
+PIPELINE_QUEUE_SIZE = 200
 
-    try:
-        r = requests.get(url, timeout=10)
-        soup = BeautifulSoup(r.text, "html.parser")
-
-        # ① カード名
-        h1 = soup.find("h1")
-        card_name = h1.text.strip() if h1 else "noname"
-
-        # ② 画像
-        img_url = ""
-        img = soup.find("img")
-        if img and img.get("src"):
-            img_url = img["src"]
-            if not img_url.startswith("http"):
-                img_url = "https://pokeca-chart.com" + img_url
-
-        # ③ 価格 JSON
-        prices = {"美品": "", "キズあり": "", "PSA10": ""}
-
-        table = soup.find("tbody", id="item-price-table")
-        if table:
-            rows = table.find_all("tr")
-            if len(rows) >= 2:
-                cols = rows[1].find_all("td")
-                if len(cols) >= 4:
-                    prices["美品"] = cols[1].get_text(strip=True)
-                    prices["キズあり"] = cols[2].get_text(strip=True)
-                    prices["PSA10"] = cols[3].get_text(strip=True)
-
-        return {
-            "card_name": card_name,
-            "image_url": img_url,
-            "detail_url": url,
-            "price_json": prices,
-        }
 
-    except Exception as e:
-        print("⚠️ 詳細取得失敗:", url, e)
-        return None
+async def _pipeline(urls, keep):
 
+    queue = asyncio.Queue(maxsize=PIPELINE_QUEUE_SIZE)
+    cache = PageCache()
+    fetcher = detail_fetcher.DetailFetcher(
+        parse_card_detail, cache=cache, cache_key=DETAIL_CACHE_KEY,
+        stop_at=card_extract.CARD_DETAIL_TARGETS,
+    )
+    counts = {"fetched": 0, "sent": 0, "sent_urls": set()}
+    record = wp_existing.recorder(WP_LIST_URL, keep_urls=True)
 
-# --------------------------------
-# 並列で詳細ページを取得
-# --------------------------------
-def fetch_details_parallel(urls, existing):
-
-    print("🔄 詳細ページを並列取得中…")
-    results = []
+    def on_sent(batch):
+        record(batch)
+        counts["sent_urls"].update(item["detail_url"] for item in batch)
 
-    def task(u):
-        if u in existing:
-            print(" ⏭ 重複:", u)
-            return None
-        return fetch_card_detail(u)
+    async def produce():
+        try:
+            async for _, item in fetcher.iter_results(urls):
+                if item:
+                    counts["fetched"] += 1
+                    if keep(item):
+                        await queue.put(item)
+        finally:
+            await queue.put(None)
+
+    async def consume():
+        # バッチ件数・同時送信数は wp_sender が応答時間を見て決める
+        sender = wp_sender.WpSender(WP_URL, auth=(WP_USER, WP_APP_PASS), on_sent=on_sent)
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                await asyncio.to_thread(sender.add, item)
+        finally:
+            await asyncio.to_thread(sender.close)
+            counts["sent"] = sender.sent
 
-    with ThreadPoolExecutor(max_workers=12) as ex:
-        futures = [ex.submit(task, u) for u in urls]
-        for f in as_completed(futures):
-            data = f.result()
-            if data:
-                results.append(data)
+    try:
+        await asyncio.gather(produce(), consume())
+    finally:
+        cache.close()
 
-    print(f"📦 新規カード総数: {len(results)} 件")
-    return results
+    print(f"♻️ キャッシュ済みの parse 結果を使用: {cache.reused} 件")
+    print(stream_fetch.STATS.line())
+    for url, reason in fetcher.failed:
+        print(f" ⚠️ 詳細取得失敗: {url} ({reason})")
+    return counts
 
 
-# --------------------------------
-# WordPressへ 20件ずつ送信
-# --------------------------------
-def send_to_wp_batched(items, batch_size=20):
+def fetch_and_send(urls, keep=lambda item: True):
+    """詳細を取得できたものから順に keep で選び、バッチがたまるごとに WP へ送る"""
 
-    if not items:
+    if not urls:
         print("📭 送信対象なし")
-        return
+        return {"fetched": 0, "sent": 0, "sent_urls": set()}
+    print(f"🔄 詳細ページを取得しながら WP へ送信…（{len(urls)} 件）")
+    counts = asyncio.run(_pipeline(urls, keep))
+    print(f"📦 取得 {counts['fetched']} 件 / 送信 {counts['sent']} 件")
+    return counts
 
-    total = len(items)
-    print(f"🚀 WPへ {total} 件送信開始…")
 
-    for i in range(0, total, batch_size):
-        batch = items[i:i+batch_size]
-        print(f" → Batch {i//batch_size+1}: {len(batch)} 件")
+# --------------------------------
+# 既存カードの価格更新（値動きの多いカード・しばらく見ていないカードから）
+# --------------------------------
+def refresh_prices(existing, history, budget=REFRESH_BUDGET):
 
-        try:
-            res = requests.post(
-                WP_URL,
-                json=batch,
-                auth=(WP_USER, WP_APP_PASS),
-                timeout=60
-            )
-            print("Status:", res.status_code)
-            print(res.text)
-        except Exception as e:
-            print("🛑 バッチ送信エラー:", e)
+    targets = history.plan(existing, budget)
+    print(f"💹 価格更新: 既存 {len(existing)} 件のうち {len(targets)} 件を確認")
+
+    # 価格が変わったカードだけを送る
+    counts = fetch_and_send(targets, keep=lambda item: history.record(item["detail_url"], item["price_json"]))
+    print(f"💹 価格が変わったカード: {counts['sent']} / {counts['fetched']} 件")
 
 
 # --------------------------------
@@ -183,15 +221,52 @@ def main():
     start = time.time()
 
     existing_urls = fetch_existing_urls()
+    history = PriceHistory()
 
-    # Step1: /all-card を150回スクロールして全URL取得
-    list_urls = fetch_all_card_urls(scroll_count=150)
+    if MODE in ("refresh", "both"):
+        try:
+            refresh_prices(existing_urls, history)
+        finally:
+            history.save()
+        if MODE == "refresh":
+            print(f"\n🏁 完了！（{round(time.time() - start, 2)} 秒）")
+            return
+
+    # Step1: サイトマップから新規・更新カードURLを取得（失敗時は /all-card をスクロール）
+    discovery = None
+    if DISCOVERY == "sitemap":
+        try:
+            discovery = sitemap_discovery.discover()
+        except Exception as e:
+            print(f"⚠️ サイトマップ取得失敗のためスクロールで取得します: {e}")
+
+    if discovery:
+        # lastmod が変わったカードは既存でも取り直して upsert する。
+        # サイトマップにあって WP にないカード（前回までに取得・送信できなかったもの）も対象にする
+        missing = [u for u in discovery.urls if u not in existing_urls]
+        list_urls = list(dict.fromkeys(discovery.new + discovery.modified + missing))
+        skip_urls = existing_urls - set(discovery.modified)
+    else:
+        list_urls = fetch_all_card_urls(scroll_count=150, existing=existing_urls)
+        skip_urls = existing_urls
+
+    targets = [u for u in list_urls if u not in skip_urls]
+    print(f"🆕 取得対象 {len(targets)} 件（既存 {len(list_urls) - len(targets)} 件はスキップ）")
+
+    # Step2: 詳細ページを取得しながら WP にバッチ送信
+    # 取得した価格は、次回以降の価格更新の基準として記録する
+    def keep(item):
+        history.record(item["detail_url"], item["price_json"])
+        return True
 
-    # Step2: 詳細ページを並列取得
-    new_items = fetch_details_parallel(list_urls, existing_urls)
+    try:
+        counts = fetch_and_send(targets, keep)
+    finally:
+        history.save()
 
-    # Step3: WP にバッチ送信
-    send_to_wp_batched(new_items)
+    if discovery:
+        # 取得・送信できなかったカードは lastmod を記録しない（次回も新規・更新として取り直す）
+        discovery.commit(exclude=set(targets) - counts["sent_urls"])
 
     print(f"\n🏁 完了！（{round(time.time() - start, 2)} 秒）")
 
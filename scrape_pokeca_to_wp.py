@@ -1,11 +1,13 @@
 import os
 import time
-import json
 import re
 from urllib.parse import urljoin
-from playwright.sync_api import sync_playwright
+from shared_browser import sync_playwright
+import resource_policy
 from bs4 import BeautifulSoup
-import requests
+import wp_sender
+import wp_existing
+import item_diff
 
 # -----------------------------
 # WordPress REST API設定
@@ -19,18 +21,8 @@ WP_GET_URL = "https://online-gacha-hack.com/wp-json/oripa/v1/list"
 # WordPress既存URL取得
 # -----------------------------
 def fetch_existing_urls() -> set:
-    print("🔍 WordPress既存URLを取得中...")
-    try:
-        res = requests.get(WP_GET_URL, auth=(WP_USER, WP_APP_PASS), timeout=30)
-        if res.status_code != 200:
-            print(f"⚠️ 既存URL取得失敗: {res.status_code}")
-            return set()
-        urls = set(res.json())
-        print(f"✅ 既存URL数: {len(urls)} 件")
-        return urls
-    except Exception as e:
-        print(f"🛑 既存URL取得エラー: {e}")
-        return set()
+    # 前回のスナップショット + 差分（古ければ全件取得）
+    return wp_existing.fetch(WP_GET_URL, auth=(WP_USER, WP_APP_PASS), source_slug="pokeca")
 
 # -----------------------------
 # スクレイピング処理
@@ -45,6 +37,7 @@ def scrape_pokeca() -> list:
             user_agent="Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
         )
         page = context.new_page()
+        stats = resource_policy.install(page, "pokeca", "https://pokeca.com/")
 
         page_num = 1
         while True:
@@ -104,6 +97,7 @@ def scrape_pokeca() -> list:
             print(f"📄 ページ {page_num} 完了")
             page_num += 1
 
+        stats.finish()
         browser.close()
     print(f"✅ 取得完了: {len(results)} 件")
     return results
@@ -116,28 +110,14 @@ def post_to_wordpress(items, existing_urls):
         print("📭 投稿データなし")
         return
 
-    new_items = []
-    for item in items:
-        detail_url = item.get("detail_url", "").strip()
-        if not detail_url or detail_url in existing_urls:
-            print(f"⏭ スキップ（重複）: {item.get('title', 'noname')}")
-            continue
-        new_items.append(item)
-
+    new_items, counts = item_diff.split(items, existing_urls, key=lambda item: item.get("detail_url", "").strip())
+    print(item_diff.line(counts))
     if not new_items:
-        print("📭 新規データなし（全件既存）")
-        return
-
-    print(f"🚀 新規 {len(new_items)}件をWordPressに送信中...")
-    try:
-        res = requests.post(WP_URL, json=new_items, auth=(WP_USER, WP_APP_PASS), timeout=90)
-        print("Status:", res.status_code)
-        try:
-            print("Response:", json.dumps(res.json(), ensure_ascii=False, indent=2))
-        except Exception:
-            print("Response:", res.text)
-    except Exception as e:
-        print(f"🛑 WordPress送信中にエラー: {e}")
+        print("📭 新規・変更なし")
+    else:
+        print(f"🚀 新規・変更 {len(new_items)}件をWordPressに送信中...")
+    wp_sender.send_all(WP_URL, new_items, auth=(WP_USER, WP_APP_PASS),
+                       on_sent=wp_existing.recorder(WP_GET_URL))
 
 # -----------------------------
 # メイン処理
@@ -1,14 +1,12 @@
-import time
 import os
 import base64
 import json
-from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
-from selenium.webdriver.chrome.service import Service
-from webdriver_manager.chrome import ChromeDriverManager
-from bs4 import BeautifulSoup
+from selenium_driver import new_chrome
+import card_extract
 import gspread
 from oauth2client.service_account import ServiceAccountCredentials
+import readiness
 
 # 認証ファイル生成
 with open("credentials.json", "wb") as f:
@@ -30,28 +28,19 @@ options = Options()
 options.add_argument('--headless')
 options.add_argument('--no-sandbox')
 options.add_argument('--disable-dev-shm-usage')
-driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
+driver = new_chrome(options)
 
 for i, url in enumerate(urls, start=2):
     if not url.startswith("http"):
         continue
 
     driver.get(url)
-    time.sleep(3)
-    soup = BeautifulSoup(driver.page_source, 'html.parser')
-    table = soup.find("tbody", id="item-price-table")
-    prices = {"美品": "", "キズあり": "", "PSA10": ""}
-
-    if table:
-        rows = table.find_all("tr")
-        if len(rows) >= 2:  # 「直近価格」は2番目の行
-            tds = rows[1].find_all("td")
-            if len(tds) >= 4:
-                prices["美品"] = tds[1].text.strip()
-                prices["キズあり"] = tds[2].text.strip()
-                prices["PSA10"] = tds[3].text.strip()
-
-        # Google Sheets の D列に出力
+    # 価格表の行数が落ち着くまで待つ（表がないページは readyState=complete で進む）
+    readiness.wait_ready_selenium(driver, "pokeca-chart", "tbody#item-price-table tr", min_count=0,
+                                  stable_ms=300, ceiling_ms=3000, verbose=False)
+    prices = card_extract.latest_prices(card_extract.card_soup(driver.page_source))
+
+    # Google Sheets の D列に出力
     sheet.update(
         range_name=f'D{i}',
         values=[[json.dumps(prices, ensure_ascii=False)]]
@@ -0,0 +1,49 @@
+"""Selenium 用 Chrome の起動（ChromeDriver のパスを使い回す）
+
+ChromeDriverManager().install() は実行のたびにバージョン確認の通信が入る。
+CHROMEDRIVER_PATH があればそれを使い、なければ前回解決したパスを
+CHROMEDRIVER_CACHE_PATH（既定 .cache/chromedriver_path）に記録して再利用する。
+Chrome の更新でドライバーが合わなくなったときだけ解決し直す。
+"""
+import os
+
+from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
+from selenium.webdriver.chrome.service import Service
+
+CACHE_PATH = os.getenv("CHROMEDRIVER_CACHE_PATH", ".cache/chromedriver_path")
+
+
+def _cached_path() -> str:
+    try:
+        with open(CACHE_PATH, encoding="utf-8") as f:
+            path = f.read().strip()
+    except OSError:
+        return ""
+    return path if os.path.exists(path) else ""
+
+
+def _install() -> str:
+    from webdriver_manager.chrome import ChromeDriverManager
+
+    path = ChromeDriverManager().install()
+    try:
+        os.makedirs(os.path.dirname(CACHE_PATH) or ".", exist_ok=True)
+        with open(CACHE_PATH, "w", encoding="utf-8") as f:
+            f.write(path)
+    except OSError as e:
+        print(f"⚠️ ChromeDriver パスの記録失敗: {e}")
+    return path
+
+
+def new_chrome(options) -> webdriver.Chrome:
+    """webdriver.Chrome を起動する"""
+    path = os.getenv("CHROMEDRIVER_PATH") or _cached_path()
+    if path:
+        try:
+            return webdriver.Chrome(service=Service(path), options=options)
+        except SessionNotCreatedException as e:
+            if os.getenv("CHROMEDRIVER_PATH"):
+                raise
+            print(f"⚠️ ChromeDriver が Chrome と合わないため取得し直します: {e.msg}")
+    return webdriver.Chrome(service=Service(_install()), options=options)
@@ -0,0 +1,118 @@
+"""Playwright ブラウザ共有ヘルパー
+
+各スクレイパーは ``from shared_browser import sync_playwright`` を使う。
+単体実行時は playwright.sync_api.sync_playwright() と同じ動きをし、
+run_all_scrapers.py から実行されたときだけ、起動済みの Chromium を共有して
+サイトごとに新しい BrowserContext を渡す。
+どちらの場合も、常駐ブラウザサーバー（browser_server.py）が起動していれば
+launch() はその場で起動せずにサーバーへ接続する。
+"""
+import contextlib
+
+from playwright.sync_api import sync_playwright as _sync_playwright
+
+import browser_server
+
+# -----------------------------
+# 共有ブラウザ（run_all_scrapers.py が設定）
+# -----------------------------
+_shared_browser = None
+
+
+class SharedBrowser:
+    """共有ブラウザのラッパー
+
+    new_page / new_context は毎回新しい BrowserContext を作るので、
+    Cookie やストレージはサイト間で混ざらない。
+    close() は自分が作った context だけを閉じ、ブラウザ本体は閉じない。
+    """
+
+    def __init__(self, browser):
+        self._browser = browser
+        self._contexts = []
+
+    def new_context(self, **kwargs):
+        context = self._browser.new_context(**kwargs)
+        self._contexts.append(context)
+        return context
+
+    def new_page(self, **kwargs):
+        return self.new_context(**kwargs).new_page()
+
+    def close(self):
+        for context in self._contexts:
+            try:
+                context.close()
+            except Exception as e:
+                print(f"⚠️ context クローズ失敗: {e}")
+        self._contexts.clear()
+
+    def __getattr__(self, name):
+        return getattr(self._browser, name)
+
+
+class _SharedBrowserType:
+    """p.chromium の代わり。launch() は共有ブラウザを返すだけ"""
+
+    def launch(self, **kwargs):
+        # headless / args などの起動オプションは共有ブラウザ側で決まっているため無視
+        return SharedBrowser(_shared_browser)
+
+
+class _SharedPlaywright:
+    chromium = _SharedBrowserType()
+
+
+class _ServerAwareBrowserType:
+    """p.chromium の代わり。常駐ブラウザがあれば接続し、なければ起動する"""
+
+    def __init__(self, p):
+        self._p = p
+
+    def launch(self, **kwargs):
+        return browser_server.connect(self._p) or self._p.chromium.launch(**kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._p.chromium, name)
+
+
+class _ServerAwarePlaywright:
+    def __init__(self, p):
+        self._p = p
+        self.chromium = _ServerAwareBrowserType(p)
+
+    def __getattr__(self, name):
+        return getattr(self._p, name)
+
+
+@contextlib.contextmanager
+def _local_playwright():
+    with _sync_playwright() as p:
+        yield _ServerAwarePlaywright(p)
+
+
+# -----------------------------
+# sync_playwright 互換エントリポイント
+# -----------------------------
+def sync_playwright():
+    """共有ブラウザがあればそれを、なければ通常の Playwright を返す"""
+    if _shared_browser is None:
+        return _local_playwright()
+    return contextlib.nullcontext(_SharedPlaywright())
+
+
+@contextlib.contextmanager
+def use_shared_browser(browser):
+    """with ブロック内の sync_playwright() を共有ブラウザに切り替える"""
+    global _shared_browser
+    previous = _shared_browser
+    _shared_browser = browser
+    try:
+        yield browser
+    finally:
+        _shared_browser = previous
+
+
+def launch_browser(p):
+    """共有用 Chromium を用意する（常駐ブラウザがあれば接続、なければ起動）"""
+    return browser_server.connect(p) or p.chromium.launch(headless=True, args=["--no-sandbox"])
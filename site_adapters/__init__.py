@@ -0,0 +1,5 @@
+"""サイトアダプタ定義（1サイト1モジュール）
+
+各モジュールは ``ADAPTER`` を1つ定義する。読み込みは site_registry.get_adapter()
+から必要なサイトの分だけ行う。
+"""
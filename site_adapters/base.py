@@ -0,0 +1,290 @@
+"""サイトアダプタの共通定義
+
+1サイト = 1つの SiteAdapter。URL・待機セレクタ・抽出スクリプト・
+正規化ルール・投稿先 (sink) だけを宣言し、取得・重複除外・投稿は
+site_registry.py と async_scrape_engine.py が共通で行う。
+"""
+import re
+import time
+import asyncio
+from urllib.parse import urljoin, urlparse
+
+from api_capture import EndpointStore, best_match, replay
+from http_fastpath import PathMemory, fetch_html
+from readiness import wait_ready_async
+from resource_policy import DEFAULT_POLICY, install_async
+
+CHROME_UA = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/120.0.0.0 Safari/537.36"
+)
+
+# wait_for_selector の後、件数が落ち着くまで待つ時間と上限。
+# もともとこの待機はなかったので、落ち着かないページでも短く打ち切る
+READY_STABLE_MS = 200
+READY_CEILING_MS = 500
+
+# サイトごとの取得方法（api / http / browser）と確認済み JSON API の記録
+PATHS = PathMemory()
+ENDPOINTS = EndpointStore()
+
+
+# -----------------------------
+# URL正規化（クエリ除去）
+# -----------------------------
+def strip_query(url: str) -> str:
+    parsed = urlparse(url)
+    return f"{parsed.scheme}://{parsed.netloc}{parsed.path}"
+
+
+class SiteAdapter:
+    """一覧ページ型サイトの定義
+
+    extract_js:
+        一覧ページで実行するスクリプト。{title, image, url, pt} の配列を返す。
+    http_extract:
+        ブラウザなしで取得した HTML から同じ形の配列を返す関数（任意）。
+        指定があれば先に HTTP で取得する。ブラウザの結果と一致を確認するまでは
+        ブラウザの結果を使い、一致しなければ HTTP を使わなくなる（http_fastpath）。
+    api:
+        api_capture.ApiCapture。ブラウザ取得中の XHR/fetch の JSON からも一覧を作り、
+        DOM の結果と一致したエンドポイントは次回から HTTP で直接取得する。
+        直接取得した結果も、http_extract と同じ条件でブラウザと突き合わせ直す。
+    points:
+        "raw"            抽出した文字列をそのまま（前後の空白のみ除去）
+        "digits"         数字以外を除去
+        "digits_or_none" 数字以外を除去し、空なら None
+    dedup:
+        "exact"          detail_url のまま既存URLと比較
+        "strip_query"    クエリを除いて比較
+    sink:
+        "oripa"          /oripa/v1/upsert へ投稿
+    block:
+        resource_policy.BlockPolicy。None ならリソースをブロックしない
+    """
+
+    def __init__(self, slug, url, ready_selector, extract_js, base_url=None,
+                 wait_until="load", timeout=60000, user_agent=None,
+                 points="raw", dedup="exact", default_title="noname",
+                 sink="oripa", debug_html=None, notify_slack=False,
+                 block=DEFAULT_POLICY, http_extract=None, api=None):
+        self.slug = slug
+        self.url = url
+        self.ready_selector = ready_selector
+        self.extract_js = extract_js
+        self.base_url = base_url or url
+        self.wait_until = wait_until
+        self.timeout = timeout
+        self.user_agent = user_agent
+        self.points = points
+        self.dedup = dedup
+        self.default_title = default_title
+        self.sink = sink
+        self.debug_html = debug_html
+        self.notify_slack = notify_slack
+        self.block = block
+        self.http_extract = http_extract
+        self.api = api
+
+    # -----------------------------
+    # スクレイピング（async_scrape_engine から呼ばれる）
+    # -----------------------------
+    async def scrape(self, engine) -> list:
+        if self.api and ENDPOINTS.get(self.slug):
+            items = await self.scrape_api()
+            if items and ENDPOINTS.verified(self.slug, len(items)):
+                PATHS.remember(self.slug, "api")
+                return items
+            if items:
+                print(f"🔍 {self.slug}: API の結果をブラウザの結果と照合します")
+
+        if not self.http_extract or not PATHS.should_try_http(self.slug):
+            return await self.scrape_browser(engine)
+
+        items = await self.scrape_http()
+        if items and PATHS.http_verified(self.slug, len(items)):
+            return items
+
+        # 未確認の HTTP の結果はそのまま投稿せず、ブラウザの結果と突き合わせる
+        if items:
+            print(f"🔍 {self.slug}: HTTP の結果をブラウザの結果と照合します")
+        else:
+            print(f"↪️ {self.slug}: HTTP では0件のためブラウザで取得します")
+        dom_items = await self.scrape_browser(engine)
+        if items and self._same_items(items, dom_items):
+            print(f"✅ {self.slug}: HTTP の結果がブラウザと一致したので次回から HTTP で取得します")
+            PATHS.remember(self.slug, "http", count=len(items))
+        else:
+            if items:
+                print(f"↪️ {self.slug}: HTTP の結果がブラウザと一致しないためブラウザで取得します")
+            PATHS.remember(self.slug, "browser")
+        return dom_items
+
+    async def scrape_api(self) -> list:
+        endpoint = ENDPOINTS.get(self.slug)
+        if endpoint["method"] != "GET":
+            return []
+        start = time.time()
+        try:
+            payload = await asyncio.to_thread(replay, endpoint, self.url, self.user_agent)
+            items = self.to_items(self.api.extract(payload))
+        except Exception as e:
+            print(f"⚠️ {self.slug}: API 取得失敗: {e}")
+            items = []
+        if not items:
+            # 仕様が変わった可能性があるので、次のブラウザ取得で確認し直す
+            ENDPOINTS.forget(self.slug)
+            return []
+        print(f"⚡ {self.slug}: API で {len(items)} 件（{round(time.time() - start, 2)} 秒）")
+        return items
+
+    async def scrape_http(self) -> list:
+        start = time.time()
+        try:
+            html = await asyncio.to_thread(fetch_html, self.url, self.user_agent)
+            items = self.to_items(self.http_extract(html))
+        except Exception as e:
+            print(f"⚠️ {self.slug}: HTTP 取得失敗: {e}")
+            return []
+        print(f"⚡ {self.slug}: HTTP で {len(items)} 件（{round(time.time() - start, 2)} 秒）")
+        return items
+
+    def _same_items(self, items: list, dom_items: list) -> bool:
+        """HTTP / JSON API と DOM の結果が同じ一覧か（URL の集合と、各 URL のタイトル・PT が一致）"""
+        def fields(items):
+            return {self.dedup_key(item["detail_url"]): (item["title"], re.sub(r"[^0-9]", "", str(item["points"] or "")))
+                    for item in items}
+
+        other, dom = fields(items), fields(dom_items)
+        return bool(dom) and other == dom
+
+    async def scrape_browser(self, engine) -> list:
+        options = {"user_agent": self.user_agent} if self.user_agent else {}
+        captured = []
+        reads = []
+        async with engine.page(self.slug, **options) as page:
+            stats = await install_async(page, self.slug, self.url, self.block)
+            if self.api:
+                page.on("response", lambda response: self._capture(response, captured, reads))
+            try:
+                await page.goto(self.url, timeout=self.timeout, wait_until=self.wait_until)
+                await page.wait_for_selector(self.ready_selector, timeout=60000)
+            except Exception:
+                await asyncio.gather(*reads)
+                items = self._known_api_items(captured)
+                if items:
+                    return items
+                await self._save_debug_html(page)
+                raise
+            # 最初の1件が出た後も描画が続くので、件数が落ち着くまで待つ
+            await wait_ready_async(page, self.slug, self.ready_selector,
+                                   stable_ms=READY_STABLE_MS, ceiling_ms=READY_CEILING_MS)
+            raw_items = await page.evaluate(self.extract_js)
+            await asyncio.gather(*reads)
+            stats.finish()
+
+        dom_items = self.to_items(raw_items)
+        if not self.api:
+            return dom_items
+        return self._prefer_api(dom_items, captured)
+
+    # -----------------------------
+    # JSON API キャプチャ
+    # -----------------------------
+    def _capture(self, response, captured: list, reads: list):
+        if self.api.matches(response):
+            reads.append(asyncio.ensure_future(self._read_json(response, captured)))
+
+    async def _read_json(self, response, captured: list):
+        try:
+            payload = await response.json()
+        except Exception:
+            return
+        items = self.to_items(self.api.extract(payload))
+        if items:
+            captured.append((response.url, response.request.method, items))
+
+    def _known_api_items(self, captured: list) -> list:
+        """確認済みエンドポイントのレスポンスがあれば、その結果を返す"""
+        endpoint = ENDPOINTS.get(self.slug)
+        if not endpoint:
+            return []
+        for url, _, items in captured:
+            if url == endpoint["url"]:
+                print(f"🔌 {self.slug}: DOM から取得できないため API の {len(items)} 件を使用")
+                return items
+        return []
+
+    def _prefer_api(self, dom_items: list, captured: list) -> list:
+        """DOM と一致する JSON があればそちらを使い、エンドポイントを記録する"""
+        match = best_match(captured, dom_items, self._same_items)
+        if match:
+            url, method, items = match
+            ENDPOINTS.remember(self.slug, url, method, len(items))
+            print(f"🔌 {self.slug}: JSON API を確認（{method} {url}）")
+            return items
+        if not dom_items:
+            return self._known_api_items(captured)
+        if ENDPOINTS.get(self.slug):
+            # 記録済みのエンドポイントが DOM と合わなくなったので、次回は直接取得しない
+            print(f"↪️ {self.slug}: JSON API の結果が DOM と一致しないため DOM の結果を使います")
+            ENDPOINTS.forget(self.slug)
+        return dom_items
+
+    async def _save_debug_html(self, page):
+        if not self.debug_html:
+            return
+        try:
+            with open(self.debug_html, "w", encoding="utf-8") as f:
+                f.write(await page.content())
+            print(f"💾 {self.debug_html} を保存しました")
+        except Exception as e:
+            print(f"⚠️ HTML保存失敗: {e}")
+
+    # -----------------------------
+    # WordPress 投稿用に整形
+    # -----------------------------
+    def to_items(self, raw_items: list) -> list:
+        return [item for item in map(self.to_item, raw_items) if item]
+
+    def to_item(self, raw: dict):
+        detail_url = (raw.get("url") or "").strip()
+        image_url = (raw.get("image") or "").strip()
+        title = (raw.get("title") or "").strip() or self.default_title
+        pt_text = (raw.get("pt") or "").strip()
+
+        if not detail_url:
+            return None
+        if detail_url.startswith("/"):
+            detail_url = urljoin(self.base_url, detail_url)
+        if image_url.startswith("/"):
+            image_url = urljoin(self.base_url, image_url)
+
+        if self.points == "raw":
+            points = pt_text
+        else:
+            points = re.sub(r"[^0-9]", "", pt_text)
+            if self.points == "digits_or_none":
+                points = points or None
+
+        return {
+            "source_slug": self.slug,
+            "title": title,
+            "image_url": image_url,
+            "detail_url": detail_url,
+            "points": points,
+            "price": None,
+            "rarity": None,
+            "extra": {"scraped_at": time.strftime("%Y-%m-%d %H:%M:%S")},
+        }
+
+    # -----------------------------
+    # 重複判定
+    # -----------------------------
+    def dedup_key(self, url: str) -> str:
+        return strip_query(url) if self.dedup == "strip_query" else url
+
+    def item_key(self, item: dict) -> str:
+        """差分判定（item_diff.split）のキー"""
+        return self.dedup_key(item["detail_url"])
@@ -0,0 +1,42 @@
+"""dokkan-toreca.com"""
+from api_capture import ApiCapture
+
+from .base import SiteAdapter
+
+# 一覧は JSON API から描画される。JSON の結果は DOM の結果と一致した場合だけ
+# 採用されるので、合わなければ従来どおり DOM から取得する。
+API = ApiCapture(
+    url_pattern=r"dokkan-toreca\.com",
+    detail_url="https://dokkan-toreca.com/gacha/{id}",
+)
+
+ADAPTER = SiteAdapter(
+    slug="dokkan-toreca",
+    url="https://dokkan-toreca.com/",
+    ready_selector="li.chakra-wrap__listitem",
+    api=API,
+    wait_until="networkidle",
+    dedup="strip_query",
+    debug_html="dokkan_debug.html",
+    notify_slack=True,
+    extract_js="""
+    () => {
+        const results = [];
+        document.querySelectorAll('li.chakra-wrap__listitem').forEach(li => {
+            const a = li.querySelector('a[href]');
+            if (!a) return;
+            const banner = a.querySelector('img[src*="banners"]');
+            const altText = banner ? banner.getAttribute('alt') || '' : '';
+            const textTitle = li.querySelector('div.css-3t04x3')?.textContent.trim() || '';
+            const title = altText && altText !== 'bannerImage' ? altText : textTitle;
+            const imgSrc = banner ? banner.src : '';
+            const detail = a.href;
+            const ptBox = li.querySelector('div.chakra-stack.css-1g48141');
+            let pt = '';
+            if (ptBox) pt = ptBox.textContent.replace(/\\s+/g, '').replace(/[^0-9,]/g, '');
+            results.push({title, image: imgSrc, url: detail, pt});
+        });
+        return results;
+    }
+    """,
+)
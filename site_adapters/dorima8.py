@@ -0,0 +1,71 @@
+"""dorima8.com"""
+import re
+from http_fastpath import parse_html
+
+from .base import SiteAdapter
+
+
+def extract_html(html: str) -> list:
+    """サーバー描画の一覧 HTML から extract_js と同じ形で取り出す"""
+    soup = parse_html(html)
+    results = []
+    for box in soup.select("div.banner_base.banner"):
+        img = box.select_one("img.current") or box.select_one("img")
+        image = img.get("src", "") if img else ""
+        name_el = box.select_one(".name_area-pack_name")
+        title = name_el.get_text().strip() if name_el else ""
+        if not title and img:
+            title = (img.get("alt") or img.get("title") or "").strip()
+        a = box.select_one("a[href]") or box.find_parent("a", href=True)
+        url = a.get("href", "") if a else ""
+        if not url:
+            m = re.search(r"/pack/(\d+)", image)
+            if m:
+                url = f"/pack/{m.group(1)}"
+        pt = ""
+        pt_el = box.select_one(".point_area")
+        if pt_el:
+            m2 = re.search(r"(\d+)", re.sub(r"[\s,]", "", pt_el.get_text()))
+            if m2:
+                pt = m2.group(1)
+        results.append({"title": title, "image": image, "url": url, "pt": pt})
+    return results
+
+
+ADAPTER = SiteAdapter(
+    slug="dorima8",
+    url="https://dorima8.com/",
+    ready_selector="div.banner_base.banner",
+    http_extract=extract_html,
+    wait_until="domcontentloaded",
+    dedup="strip_query",
+    extract_js="""
+    () => {
+        const results = [];
+        document.querySelectorAll('div.banner_base.banner').forEach(box => {
+            const img = box.querySelector('img.current') || box.querySelector('img');
+            const image = img ? (img.getAttribute('src') || '') : '';
+            let title = '';
+            const nameEl = box.querySelector('.name_area-pack_name');
+            if (nameEl) title = nameEl.textContent.trim();
+            if (!title && img) title = (img.getAttribute('alt') || img.getAttribute('title') || '').trim();
+            let url = '';
+            const a = box.querySelector('a[href]') || box.closest('a[href]');
+            if (a) url = a.getAttribute('href') || '';
+            if (!url) {
+                const m = image.match(/\\/pack\\/(\\d+)/);
+                if (m) url = `/pack/${m[1]}`;
+            }
+            let pt = '';
+            const ptEl = box.querySelector('.point_area');
+            if (ptEl) {
+                const txt = ptEl.textContent.replace(/[\\s,]/g, '');
+                const m2 = txt.match(/(\\d+)/);
+                if (m2) pt = m2[1];
+            }
+            results.push({ title, image, url, pt });
+        });
+        return results;
+    }
+    """,
+)
@@ -0,0 +1,34 @@
+"""japan-toreca.com"""
+from .base import SiteAdapter, CHROME_UA
+
+ADAPTER = SiteAdapter(
+    slug="japan-toreca",
+    url="https://japan-toreca.com/",
+    ready_selector='a[data-sentry-component="NewOripaCard"]',
+    wait_until="domcontentloaded",
+    timeout=120000,
+    user_agent=CHROME_UA,
+    debug_html="japan_toreca_debug.html",
+    extract_js="""
+    () => {
+        const results = [];
+        document.querySelectorAll('a[data-sentry-component="NewOripaCard"]').forEach(card => {
+            const href = card.getAttribute('href') || '';
+            const img = card.querySelector('img');
+            if (!img) return;
+            const title = (img.getAttribute('alt') || '').trim() || 'noname';
+            let image = img.getAttribute('src') || '';
+            const srcset = img.getAttribute('srcset');
+            if (srcset) {
+                const parts = srcset.split(',').map(s => s.trim().split(' ')[0]);
+                image = parts[parts.length - 1] || image;
+            }
+            let pt = '';
+            const span = card.querySelector('span.css-1qwnwpn');
+            if (span) pt = span.textContent.trim();
+            results.push({ title, image, url: href, pt });
+        });
+        return results;
+    }
+    """,
+)
@@ -0,0 +1,51 @@
+"""koppepanchi.com"""
+from .base import SiteAdapter
+
+ADAPTER = SiteAdapter(
+    slug="koppepanchi",
+    url="https://koppepanchi.com/",
+    ready_selector="div.relative.bg-white.rounded-lg.shadow-sm",
+    wait_until="networkidle",
+    timeout=120000,
+    points="digits",
+    debug_html="koppepanchi_debug.html",
+    notify_slack=True,
+    extract_js="""
+    () => {
+        const cards = Array.from(
+            document.querySelectorAll('div.relative.bg-white.rounded-lg.shadow-sm')
+        );
+        return cards.map(card => {
+            const img = card.querySelector('img');
+            const title = (img?.getAttribute('alt') || '').trim() ||
+                (card.querySelector('h3, h2, p, span')?.textContent.trim() || '');
+            let image = '';
+            if (img) {
+                image = img.getAttribute('src') || img.getAttribute('data-src') || '';
+            }
+            let url = '';
+            const link = card.querySelector('a[href]');
+            if (link) {
+                url = link.href;
+            } else {
+                const parentLink = card.closest('a[href]');
+                if (parentLink) url = parentLink.href;
+            }
+            if (!url) {
+                const button = card.querySelector('button[data-url], button[data-href]');
+                if (button) url = button.getAttribute('data-url') || button.getAttribute('data-href') || '';
+            }
+            if (!url) {
+                const datasetUrl = card.getAttribute('data-url') || card.getAttribute('data-href');
+                if (datasetUrl) url = datasetUrl;
+            }
+            let pt = '';
+            const ptBlocks = card.querySelectorAll('span.px-1.vc_module__point-raw');
+            if (ptBlocks.length) {
+                pt = Array.from(ptBlocks)[ptBlocks.length - 1].textContent.replace(/\\s+/g, '');
+            }
+            return { title, image, url, pt };
+        }).filter(item => item.image || item.url || item.title);
+    }
+    """,
+)
@@ -0,0 +1,56 @@
+"""moshoripa.com"""
+from urllib.parse import urljoin
+
+from http_fastpath import parse_html
+
+from .base import SiteAdapter
+
+
+def extract_html(html: str) -> list:
+    """サーバー描画の一覧 HTML から extract_js と同じ形で取り出す"""
+    soup = parse_html(html)
+    data = []
+    for card in soup.select("div.homes-gacha-card"):
+        a = card.select_one("a.gacha-link")
+        url = urljoin("https://moshoripa.com/", a.get("href", "")) if a else ""
+        img = card.select_one("a.gacha-link > img")
+        image = urljoin("https://moshoripa.com/", img.get("src", "")) if img else ""
+        title = a.get_text().strip() if a else ""
+        if not title or len(title) < 2:
+            title = img.get("alt", "").strip() if img else "No title"
+        pt_el = card.select_one("div.gacha-price span.font-size-xl")
+        pt = pt_el.get_text().strip() if pt_el else "0"
+        data.append({"title": title, "image": image, "url": url, "pt": pt})
+    return data
+
+
+ADAPTER = SiteAdapter(
+    slug="moshoripa",
+    url="https://moshoripa.com/",
+    ready_selector="div.homes-gacha-card",
+    http_extract=extract_html,
+    wait_until="networkidle",
+    points="digits_or_none",
+    dedup="strip_query",
+    default_title="No title",
+    debug_html="moshoripa_debug.html",
+    extract_js="""
+    () => {
+        const data = [];
+        document.querySelectorAll('div.homes-gacha-card').forEach(card => {
+            const a = card.querySelector('a.gacha-link');
+            const url = a ? a.href : '';
+            const img = card.querySelector('a.gacha-link > img');
+            const image = img ? img.src : '';
+            let title = a ? a.textContent.trim() : '';
+            if (!title || title.length < 2) {
+                title = img ? img.alt.trim() : 'No title';
+            }
+            const ptEl = card.querySelector('div.gacha-price span.font-size-xl');
+            const pt = ptEl ? ptEl.textContent.trim() : '0';
+            data.push({title, image, url, pt});
+        });
+        return data;
+    }
+    """,
+)
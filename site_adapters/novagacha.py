@@ -0,0 +1,42 @@
+"""novagacha.com"""
+from api_capture import ApiCapture
+
+from .base import SiteAdapter
+
+# 一覧は JSON API から描画される。JSON の結果は DOM の結果と一致した場合だけ
+# 採用されるので、合わなければ従来どおり DOM から取得する。
+API = ApiCapture(
+    url_pattern=r"novagacha\.com",
+    detail_url="https://www.novagacha.com/gacha/{id}",
+)
+
+ADAPTER = SiteAdapter(
+    slug="novagacha",
+    url="https://www.novagacha.com/?tab=gacha&category=2",
+    base_url="https://www.novagacha.com",
+    ready_selector="section.flex.flex-col.px-1",
+    api=API,
+    wait_until="networkidle",
+    points="digits",
+    extract_js="""
+    () => {
+        const results = [];
+        document.querySelectorAll('section.flex.flex-col.px-1').forEach(sec => {
+            const link = sec.querySelector('a[href]');
+            if (!link) return;
+            const url = link.href;
+            let image = '';
+            const bgDiv = sec.querySelector("div.bg-cover");
+            if (bgDiv) {
+                const match = /url\\(["']?(.*?)["']?\\)/.exec(bgDiv.style.backgroundImage);
+                if (match) image = match[1];
+            }
+            let pt = '';
+            const ptEl = sec.querySelector("div.text-xl");
+            if (ptEl) pt = ptEl.textContent.trim();
+            results.push({ title: "noname", image, url, pt });
+        });
+        return results;
+    }
+    """,
+)
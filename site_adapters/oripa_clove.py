@@ -0,0 +1,71 @@
+"""oripa.clove.jp"""
+import re
+
+from http_fastpath import iter_dicts, next_data
+
+from .base import SiteAdapter
+
+ITEM_IMAGE_RE = re.compile(r"/items/([a-z0-9]+)\.png")
+
+
+def extract_next_data(html: str) -> list:
+    """__NEXT_DATA__ から商品画像（/items/<id>.png）を持つレコードを取り出す
+
+    画像 URL 以外のキー名はページ側の都合で変わりうるので候補から探す。
+    推測なので、ブラウザの結果と一致を確認するまでは使われない（SiteAdapter.scrape）。
+    """
+    data = next_data(html)
+    if not data:
+        return []
+    results = []
+    seen = set()
+    for record in iter_dicts(data):
+        image = next((v for v in record.values() if isinstance(v, str) and ITEM_IMAGE_RE.search(v)), "")
+        if not image:
+            continue
+        item_id = ITEM_IMAGE_RE.search(image).group(1)
+        if item_id in seen:
+            continue
+        seen.add(item_id)
+        title = record.get("name") or record.get("title") or "noname"
+        pt = next((record[k] for k in ("coin", "price", "point", "pt") if record.get(k) not in (None, "")), "")
+        results.append({
+            "title": str(title).strip(),
+            "image": image,
+            "url": f"https://oripa.clove.jp/oripa/{item_id}",
+            "pt": str(pt),
+        })
+    return results
+
+
+ADAPTER = SiteAdapter(
+    slug="oripa-clove",
+    url="https://oripa.clove.jp/oripa/All",
+    base_url="https://oripa.clove.jp",
+    ready_selector="div.css-k3cv9u",
+    http_extract=extract_next_data,
+    extract_js="""
+    () => {
+        const results = [];
+        document.querySelectorAll('div.css-k3cv9u').forEach(box => {
+            const img = box.querySelector('img');
+            const title = img ? (img.getAttribute('alt') || '').trim() : 'noname';
+            let img_src = img ? img.getAttribute('src') : '';
+            let image = img_src;
+            if (img_src && img_src.startsWith('/_next/image') && img_src.includes('url=')) {
+                const match = img_src.match(/url=([^&]+)/);
+                if (match) image = decodeURIComponent(match[1]);
+            }
+            let itemId = "";
+            const m = image.match(/\\/items\\/([a-z0-9]+)\\.png/);
+            if (m) itemId = m[1];
+            let url = itemId ? `https://oripa.clove.jp/oripa/${itemId}` : "";
+            let pt = "";
+            const coinEl = box.querySelector('div.css-13pczcl p.chakra-text');
+            if (coinEl) pt = coinEl.textContent.trim();
+            results.push({ title, image, url, pt });
+        });
+        return results;
+    }
+    """,
+)
@@ -0,0 +1,30 @@
+"""oripa.ex-toreca.com"""
+from .base import SiteAdapter
+
+ADAPTER = SiteAdapter(
+    slug="oripa-ex-toreca",
+    url="https://oripa.ex-toreca.com/",
+    ready_selector="div.group.relative.cursor-pointer.rounded",
+    wait_until="domcontentloaded",
+    extract_js="""
+    () => {
+        const results = [];
+        document.querySelectorAll('div.group.relative.cursor-pointer.rounded').forEach(box => {
+            const img = box.querySelector('img');
+            const title = img ? (img.getAttribute('alt') || '').trim() : '';
+            const image = img ? img.getAttribute('src') : '';
+            let url = '';
+            if (img) {
+                const src = img.getAttribute('src') || '';
+                const m = src.match(/original-pack\\/(\\d+)\\//);
+                if (m) url = `https://oripa.ex-toreca.com/pack/${m[1]}`;
+            }
+            let pt = '';
+            const ptEl = box.querySelector('p span');
+            if (ptEl) pt = ptEl.textContent.trim();
+            results.push({ title: title || 'noname', image, url, pt });
+        });
+        return results;
+    }
+    """,
+)
@@ -0,0 +1,50 @@
+"""oripavictory.com"""
+from http_fastpath import parse_html
+
+from .base import SiteAdapter
+
+
+def extract_html(html: str) -> list:
+    """サーバー描画の一覧 HTML から extract_js と同じ形で取り出す"""
+    soup = parse_html(html)
+    results = []
+    for div in soup.select("div.col-sm-6.series-item"):
+        a = div.select_one("a")
+        img = div.select_one(".bgimg img")
+        title_el = div.select_one(".item-content .valuetext-title") or img
+        title = (title_el.get("alt") or title_el.get_text()).strip() if title_el else "noname"
+        image = (img.get("data-original") or img.get("src") or "") if img else ""
+        url = (a.get("link") or a.get("href") or "") if a else ""
+        pt_el = div.select_one(".pricetag .price .valuetext")
+        pt = pt_el.get_text().strip() if pt_el else ""
+        results.append({"title": title, "image": image, "url": url, "pt": pt})
+    return results
+
+
+ADAPTER = SiteAdapter(
+    slug="oripavictory",
+    url="https://oripavictory.com/index",
+    base_url="https://oripavictory.com",
+    ready_selector="div.col-sm-6.series-item",
+    http_extract=extract_html,
+    wait_until="networkidle",
+    timeout=120000,
+    debug_html="oripavictory_debug.html",
+    extract_js="""
+    () => {
+        const results = [];
+        document.querySelectorAll('div.col-sm-6.series-item').forEach(div => {
+            const a = div.querySelector('a');
+            const img = div.querySelector('.bgimg img');
+            const titleEl = div.querySelector('.item-content .valuetext-title') || img;
+            const title = titleEl ? (titleEl.getAttribute('alt') || titleEl.textContent || '').trim() : 'noname';
+            const image = img ? (img.getAttribute('data-original') || img.getAttribute('src') || '') : '';
+            const url = a ? (a.getAttribute('link') || a.getAttribute('href') || '') : '';
+            const ptEl = div.querySelector('.pricetag .price .valuetext');
+            const pt = ptEl ? ptEl.textContent.trim() : '';
+            results.push({ title, image, url, pt });
+        });
+        return results;
+    }
+    """,
+)
@@ -0,0 +1,53 @@
+"""pokepa365.com"""
+from http_fastpath import parse_html
+
+from .base import SiteAdapter, CHROME_UA
+
+
+def extract_html(html: str) -> list:
+    """サーバー描画の一覧 HTML から extract_js と同じ形で取り出す"""
+    soup = parse_html(html)
+    results = []
+    for item in soup.select("div.series-item"):
+        a = item.select_one("a.single-page")
+        if not a:
+            continue
+        detail = a.get("link") or a.get("href") or ""
+        img = a.select_one("div.bgimg img")
+        image = img.get("src", "") if img else ""
+        title = img.get("alt", "") if img else ""
+        pt_el = item.select_one("div.price span.valuetext")
+        pt = pt_el.get_text().strip() if pt_el else ""
+        results.append({"title": title, "image": image, "url": detail, "pt": pt})
+    return results
+
+
+ADAPTER = SiteAdapter(
+    slug="pokepa365",
+    url="https://pokepa365.com/index",
+    base_url="https://pokepa365.com",
+    ready_selector="div.series-item",
+    http_extract=extract_html,
+    user_agent=CHROME_UA,
+    points="digits",
+    dedup="strip_query",
+    debug_html="pokepa365_debug.html",
+    extract_js="""
+    () => {
+        const results = [];
+        document.querySelectorAll('div.series-item').forEach(item => {
+            const a = item.querySelector('a.single-page');
+            if (!a) return;
+            const detail = a.getAttribute('link') || a.getAttribute('href') || '';
+            const img = a.querySelector('div.bgimg img');
+            const image = img ? (img.getAttribute('src') || '') : '';
+            let title = '';
+            if (img) title = img.getAttribute('alt') || '';
+            const ptEl = item.querySelector('div.price span.valuetext');
+            const pt = ptEl ? ptEl.textContent.trim() : '';
+            results.push({title, image, url: detail, pt});
+        });
+        return results;
+    }
+    """,
+)
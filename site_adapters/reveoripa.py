@@ -0,0 +1,34 @@
+"""reve-oripa.jp"""
+from .base import SiteAdapter
+
+ADAPTER = SiteAdapter(
+    slug="reveoripa",
+    url="https://reve-oripa.jp/",
+    ready_selector="div.cursor-pointer.w-full.overflow-hidden.border.rounded-xl",
+    wait_until="networkidle",
+    points="digits_or_none",
+    dedup="strip_query",
+    debug_html="reve_oripa_debug.html",
+    extract_js="""
+    () => {
+        const results = [];
+        document.querySelectorAll('div.cursor-pointer.w-full.overflow-hidden.border.rounded-xl').forEach(card => {
+            const link = card.querySelector('a[href]');
+            const img = card.querySelector('img');
+            const url = link ? link.href : '';
+            const image = img ? (img.getAttribute('src') || img.getAttribute('data-src') || '') : '';
+            let title = '';
+            if (img) title = img.getAttribute('alt') || img.getAttribute('title') || '';
+            if (!title) {
+                const t = card.querySelector('h3, h2, .font-bold, p');
+                if (t) title = t.textContent.trim();
+            }
+            let pt = '';
+            const ptSpan = card.querySelector('span.text-base.font-bold, span.font-bold');
+            if (ptSpan) pt = ptSpan.textContent.replace(/\\s+/g, '');
+            results.push({title, image, url, pt});
+        });
+        return results;
+    }
+    """,
+)
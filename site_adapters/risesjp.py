@@ -0,0 +1,55 @@
+"""rises.jp"""
+import re
+from urllib.parse import urljoin
+
+from http_fastpath import parse_html
+
+from .base import SiteAdapter, CHROME_UA
+
+
+def extract_html(html: str) -> list:
+    """サーバー描画の一覧 HTML から extract_js と同じ形で取り出す"""
+    soup = parse_html(html)
+    results = []
+    for card in soup.select("div.gacha-item"):
+        link = card.select_one("a[href]")
+        img = link.select_one("img") if link else None
+        url = urljoin("https://rises.jp/product", link["href"]) if link else ""
+        image = img.get("src", "") if img else ""
+        title = img.get("alt", "").strip() if img else ""
+        span = card.select_one("span.gacha-price")
+        pt = re.sub(r"\s+", "", span.get_text()) if span else ""
+        results.append({"title": title, "image": image, "url": url, "pt": pt})
+    return results
+
+
+ADAPTER = SiteAdapter(
+    slug="risesjp",
+    url="https://rises.jp/product",
+    base_url="https://rises.jp",
+    ready_selector="div.gacha-item",
+    http_extract=extract_html,
+    wait_until="networkidle",
+    timeout=120000,
+    user_agent=CHROME_UA,
+    points="digits_or_none",
+    dedup="strip_query",
+    debug_html="rises_debug.html",
+    extract_js="""
+    () => {
+        const results = [];
+        document.querySelectorAll('div.gacha-item').forEach(card => {
+            const link = card.querySelector('a[href]');
+            const img = link ? link.querySelector('img') : null;
+            const url = link ? link.href : '';
+            const image = img ? (img.getAttribute('src') || '') : '';
+            const title = img ? (img.getAttribute('alt') || '').trim() : '';
+            let pt = '';
+            const span = card.querySelector('span.gacha-price');
+            if (span) pt = span.textContent.replace(/\\s+/g, '');
+            results.push({title, image, url, pt});
+        });
+        return results;
+    }
+    """,
+)
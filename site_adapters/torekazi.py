@@ -0,0 +1,34 @@
+"""torekazi.com"""
+from .base import SiteAdapter, CHROME_UA
+
+ADAPTER = SiteAdapter(
+    slug="torekazi",
+    url="https://torekazi.com/",
+    ready_selector="div.bg-white.rounded-lg",
+    wait_until="networkidle",
+    user_agent=CHROME_UA,
+    points="digits",
+    dedup="strip_query",
+    debug_html="torekazi_debug.html",
+    extract_js="""
+    () => {
+        const results = [];
+        document.querySelectorAll('div.bg-white.rounded-lg').forEach(card => {
+            const a = card.querySelector('a[href]');
+            if (!a) return;
+            const img = a.querySelector('img');
+            const url = a.href;
+            const image = img ? (img.getAttribute('src') || img.getAttribute('data-src') || '') : '';
+            const titleEl = card.querySelector('h2, h3, p.font-semibold, p.font-bold');
+            let title = titleEl ? titleEl.textContent.trim() : '';
+            if (!title && img) {
+                title = img.getAttribute('alt') || '';
+            }
+            const ptEl = card.querySelector('div.flex p.font-bold.text-lg');
+            const pt = ptEl ? ptEl.textContent.replace(/\\s+/g, '') : '';
+            results.push({title, image, url, pt});
+        });
+        return results;
+    }
+    """,
+)
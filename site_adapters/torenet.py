@@ -0,0 +1,42 @@
+"""torenet.com"""
+from .base import SiteAdapter
+
+ADAPTER = SiteAdapter(
+    slug="torenet",
+    url="https://torenet.com/user/packList",
+    base_url="https://torenet.com",
+    ready_selector=".packList__item",
+    wait_until="domcontentloaded",
+    timeout=120000,
+    extract_js="""
+    () => {
+        const results = [];
+        document.querySelectorAll('.packList__item').forEach(item => {
+            const title = item.getAttribute('data-pack-name') || 'noname';
+            let image = '';
+            const img = item.querySelector('img');
+            if (img) {
+                const srcset = img.getAttribute('srcset');
+                if (srcset) {
+                    const parts = srcset.split(',').map(p => p.trim().split(' ')[0]);
+                    if (parts.length) image = parts[parts.length - 1];
+                } else {
+                    image = img.getAttribute('src') || '';
+                }
+            }
+            const packId = item.getAttribute('data-pack-id');
+            let url = '';
+            if (packId) url = `/pack/${packId}`;
+            let pt = '';
+            const ptEl = item.querySelector('.packList__pt-txt');
+            if (ptEl) {
+                const text = ptEl.textContent.replace(/,/g, '').trim();
+                const m = text.match(/(\\d+)/);
+                if (m) pt = m[1];
+            }
+            results.push({ title, image, url, pt });
+        });
+        return results;
+    }
+    """,
+)
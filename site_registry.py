@@ -0,0 +1,140 @@
+"""サイトアダプタのレジストリと実行入口
+
+使い方:
+    python site_registry.py                  # 登録済みの全サイト
+    python site_registry.py torekazi risesjp # 指定サイトだけ
+
+アダプタ（site_adapters/*.py）は実行するサイトの分だけ import する。
+取得は async_scrape_engine.py、既存URLの取得と投稿は wp_client.py が
+全サイト共通で行うので、修正は1か所で全サイトに反映される。
+"""
+import os
+import sys
+import time
+import asyncio
+import importlib
+
+import requests
+
+# -----------------------------
+# 登録サイト（slug → アダプタモジュール）
+# -----------------------------
+SITE_MODULES = {
+    "novagacha": "site_adapters.novagacha",
+    "oripa-clove": "site_adapters.oripa_clove",
+    "dokkan-toreca": "site_adapters.dokkan_toreca",
+    "dorima8": "site_adapters.dorima8",
+    "japan-toreca": "site_adapters.japan_toreca",
+    "koppepanchi": "site_adapters.koppepanchi",
+    "moshoripa": "site_adapters.moshoripa",
+    "oripa-ex-toreca": "site_adapters.oripa_ex_toreca",
+    "oripavictory": "site_adapters.oripavictory",
+    "pokepa365": "site_adapters.pokepa365",
+    "reveoripa": "site_adapters.reveoripa",
+    "risesjp": "site_adapters.risesjp",
+    "torekazi": "site_adapters.torekazi",
+    "torenet": "site_adapters.torenet",
+}
+
+
+def get_adapter(slug: str):
+    """slug に対応するアダプタを読み込んで返す"""
+    if slug not in SITE_MODULES:
+        raise KeyError(f"未登録のサイト: {slug}")
+    return importlib.import_module(SITE_MODULES[slug]).ADAPTER
+
+
+# -----------------------------
+# Slack通知
+# -----------------------------
+def notify_slack(message: str) -> None:
+    webhook = os.getenv("SLACK_WEBHOOK_URL")
+    if not webhook:
+        print(message)
+        return
+    try:
+        requests.post(webhook, json={"text": message}, timeout=10)
+    except Exception as exc:
+        print(f"⚠️ Slack通知失敗: {exc}")
+        print(message)
+
+
+# -----------------------------
+# 投稿先 (sink)
+# -----------------------------
+def post_oripa(adapters: list, results: dict) -> dict:
+    """/oripa/v1/upsert へ新規と内容が変わったものだけ投稿し、サイト別の成否を返す"""
+    from wp_client import fetch_existing_urls, post_to_wordpress
+
+    posted = {}
+    for adapter in adapters:
+        items = results[adapter.slug]
+        print(f"\n===== {adapter.slug}: 取得 {len(items)} 件 =====")
+        existing_urls = fetch_existing_urls(adapter.slug)
+        posted[adapter.slug] = post_to_wordpress(items, existing_urls, key=adapter.item_key)
+        if not posted[adapter.slug] and adapter.notify_slack:
+            notify_slack(f"🛑 {adapter.slug} WordPress送信失敗")
+    return posted
+
+
+SINKS = {
+    "oripa": post_oripa,
+}
+
+
+# -----------------------------
+# 実行
+# -----------------------------
+def run_sites(slugs: list):
+    """サイトを並列に取得して投稿し、(サイト別処理時間, サイト別の成否) を返す
+
+    取得0件（スクレイピング失敗を含む）か投稿失敗のサイトは失敗とする。
+    """
+    from async_scrape_engine import scrape_sites
+
+    adapters = [get_adapter(slug) for slug in slugs]
+    results, timings = asyncio.run(scrape_sites(adapters))
+
+    ok = {}
+    for adapter in adapters:
+        ok[adapter.slug] = bool(results[adapter.slug])
+        if not ok[adapter.slug] and adapter.notify_slack:
+            notify_slack(f"🛑 {adapter.slug} 取得0件（ページ読み込み失敗の可能性）")
+
+    for sink_name, sink in SINKS.items():
+        targets = [adapter for adapter in adapters if adapter.sink == sink_name]
+        if targets:
+            for slug, posted in sink(targets, results).items():
+                ok[slug] = ok[slug] and posted
+    return timings, ok
+
+
+def run_site(slug: str) -> None:
+    """1サイトだけ実行する（各 scrape_*_to_wp.py から呼ばれる）"""
+    start = time.time()
+    run_sites([slug])
+    print(f"🏁 完了！処理時間: {round(time.time() - start, 2)} 秒")
+
+
+# -----------------------------
+# メイン処理
+# -----------------------------
+def main():
+    start = time.time()
+    slugs = sys.argv[1:] or list(SITE_MODULES)
+    unknown = [slug for slug in slugs if slug not in SITE_MODULES]
+    if unknown:
+        print(f"🛑 未登録のサイト: {', '.join(unknown)}")
+        sys.exit(1)
+
+    timings, _ = run_sites(slugs)
+
+    print("\n📊 サイト別処理時間")
+    for slug, elapsed in sorted(timings.items(), key=lambda kv: -kv[1]):
+        print(f"  {slug}: {round(elapsed, 2)} 秒")
+    print(f"⏱ 逐次実行なら合計: {round(sum(timings.values()), 2)} 秒")
+    print(f"🏁 完了！処理時間: {round(time.time() - start, 2)} 秒")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+"""XML サイトマップからのカード URL 取得（pokeca-chart.com）
+
+pokeca-chart.com は WordPress なので、/all-card をブラウザでスクロールしなくても
+サイトマップ（wp-sitemap.xml / sitemap_index.xml）に全カードの URL と
+lastmod が載っている。サイトマップは XMLPullParser で受信しながら読み、
+全体をメモリに載せない。
+
+カード URL ごとの lastmod を SITEMAP_STATE_PATH（既定 .cache/pokeca_sitemap.json）
+に記録し、前回から
+    - new:      初めて見た URL
+    - modified: lastmod が変わった URL（価格更新の候補）
+を返す。サイトマップ索引の lastmod が前回と同じ子サイトマップは取得しない。
+
+    python sitemap_discovery.py        # 件数と URL を表示し、記録を更新する
+"""
+import os
+import re
+import sys
+import json
+import zlib
+from xml.etree.ElementTree import XMLPullParser, ParseError
+
+import requests
+
+import http_session
+
+SITE_ROOT = "https://pokeca-chart.com"
+STATE_PATH = os.getenv("SITEMAP_STATE_PATH", ".cache/pokeca_sitemap.json")
+
+# robots.txt に記載がなければ、この順に試す
+SITEMAP_CANDIDATES = ("/wp-sitemap.xml", "/sitemap_index.xml", "/sitemap.xml")
+
+CARD_URL_RE = re.compile(r"^https://pokeca-chart\.com/[a-z0-9\-]+$", re.IGNORECASE)
+
+# カード以外（固定ページ・タクソノミー・投稿者）の子サイトマップは読まない。
+# WordPress（Yoast / コア）のファイル名だけに一致させ、カード名の一部（vintage など）では外さない
+SKIP_SITEMAP_RE = re.compile(
+    r"/(?:(?:page|post_tag|category|author)-sitemap\d*\.xml"
+    r"|wp-sitemap-(?:posts-page|taxonomies|users)-[^/?#]*)(?:[?#].*)?$",
+    re.IGNORECASE,
+)
+
+CHUNK_SIZE = 64 * 1024
+
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+
+def card_url(loc: str) -> str:
+    """カード詳細ページの URL なら WP 側と同じ形（末尾スラッシュなし）で返す"""
+    url = loc.strip()
+    if url.endswith("/"):
+        url = url[:-1]
+    return url if CARD_URL_RE.match(url) else ""
+
+
+# -----------------------------
+# サイトマップの逐次パース
+# -----------------------------
+def iter_sitemap(url: str, timeout: int = 30):
+    """サイトマップを受信しながらパースし、("url" | "sitemap", loc, lastmod) を返す"""
+    res = http_session.get(url, timeout=timeout, stream=True)
+    res.raise_for_status()
+    # .xml.gz は Content-Encoding ではなくファイル自体が gzip
+    gunzip = zlib.decompressobj(16 + zlib.MAX_WBITS) if url.endswith(".gz") else None
+    parser = XMLPullParser(events=("end",))
+    try:
+        for chunk in res.iter_content(CHUNK_SIZE):
+            parser.feed(gunzip.decompress(chunk) if gunzip else chunk)
+            yield from _entries(parser)
+        parser.close()
+        yield from _entries(parser)
+    finally:
+        res.close()
+
+
+def _entries(parser):
+    for _, elem in parser.read_events():
+        kind = _local(elem.tag)
+        if kind not in ("url", "sitemap"):
+            continue
+        loc = lastmod = ""
+        for child in elem:
+            name = _local(child.tag)
+            if name == "loc":
+                loc = (child.text or "").strip()
+            elif name == "lastmod":
+                lastmod = (child.text or "").strip()
+        elem.clear()
+        if loc:
+            yield kind, loc, lastmod
+
+
+def find_sitemaps(timeout: int = 15) -> list:
+    """robots.txt の Sitemap: 行、なければ既定の候補から、存在するサイトマップを返す"""
+    try:
+        res = http_session.get(f"{SITE_ROOT}/robots.txt", timeout=timeout)
+        listed = [line.split(":", 1)[1].strip() for line in res.text.splitlines()
+                  if res.ok and line.lower().startswith("sitemap:")]
+    except requests.RequestException:
+        listed = []
+    if listed:
+        return listed
+
+    for path in SITEMAP_CANDIDATES:
+        try:
+            res = http_session.head(SITE_ROOT + path, timeout=timeout, allow_redirects=True)
+        except requests.RequestException:
+            continue
+        if res.ok:
+            return [res.url]
+    return []
+
+
+# -----------------------------
+# lastmod の記録
+# -----------------------------
+class SitemapStore:
+    """カード URL と子サイトマップの lastmod を記録する"""
+
+    def __init__(self, path: str = STATE_PATH):
+        self.path = path
+        state = self._load()
+        self.urls = state.get("urls", {})
+        self.sitemaps = state.get("sitemaps", {})
+
+    def _load(self) -> dict:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self) -> None:
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump({"urls": self.urls, "sitemaps": self.sitemaps}, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"⚠️ サイトマップ記録の保存失敗: {e}")
+
+
+class Discovery:
+    """discover() の結果。commit() で lastmod を記録に反映する
+
+    取得・送信できなかった URL は commit(exclude=...) で記録から外し、
+    次回も新規・更新として返されるようにする。
+    """
+
+    def __init__(self, store: SitemapStore):
+        self.store = store
+        self.new = []
+        self.modified = []
+        self.fetched = 0        # 取得した子サイトマップ数
+        self.skipped = 0        # lastmod が同じで取得しなかった子サイトマップ数
+        self._urls = {}
+        self._sitemaps = {}
+        self._source = {}       # カード URL -> 載っていた子サイトマップ
+
+    @property
+    def urls(self) -> list:
+        """今回サイトマップで見つかったカード URL（取得しなかった子サイトマップの分は含まない）"""
+        return list(self._urls)
+
+    def commit(self, exclude=()) -> None:
+        exclude = set(exclude)
+        self.store.urls.update((url, lastmod) for url, lastmod in self._urls.items() if url not in exclude)
+        # 外した URL を含む子サイトマップは、次回も読み直すよう lastmod を記録しない
+        retry = {self._source.get(url) for url in exclude}
+        self.store.sitemaps.update((loc, lastmod) for loc, lastmod in self._sitemaps.items() if loc not in retry)
+        self.store.save()
+
+
+def discover(store: SitemapStore = None) -> Discovery:
+    """サイトマップをたどり、新規・更新されたカード URL を返す
+
+    サイトマップが見つからない・取得できないときは例外を送出する
+    （呼び出し側でスクロール取得に切り替える）。
+    """
+    store = store or SitemapStore()
+    result = Discovery(store)
+    queue = find_sitemaps()
+    if not queue:
+        raise RuntimeError("サイトマップが見つかりません")
+
+    seen = set()
+    while queue:
+        sitemap_url = queue.pop(0)
+        if sitemap_url in seen:
+            continue
+        seen.add(sitemap_url)
+        result.fetched += 1
+        for kind, loc, lastmod in iter_sitemap(sitemap_url):
+            if kind == "sitemap":
+                if SKIP_SITEMAP_RE.search(loc):
+                    continue
+                if lastmod and store.sitemaps.get(loc) == lastmod:
+                    result.skipped += 1
+                    continue
+                result._sitemaps[loc] = lastmod
+                queue.append(loc)
+                continue
+
+            url = card_url(loc)
+            if not url or url in result._urls:
+                continue
+            result._urls[url] = lastmod
+            result._source[url] = sitemap_url
+            if url not in store.urls:
+                result.new.append(url)
+            elif lastmod and store.urls[url] != lastmod:
+                result.modified.append(url)
+
+    print(f"🗺 サイトマップ {result.fetched} 件取得（{result.skipped} 件は変更なし）: "
+          f"新規 {len(result.new)} 件 / 更新 {len(result.modified)} 件")
+    return result
+
+
+def main():
+    try:
+        result = discover()
+    except (requests.RequestException, ParseError, RuntimeError) as e:
+        print(f"🛑 サイトマップ取得失敗: {e}")
+        sys.exit(1)
+    for url in result.new:
+        print(f"new\t{url}")
+    for url in result.modified:
+        print(f"modified\t{url}")
+    result.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,132 @@
+"""必要な部分を読み終えたら受信をやめる HTTP 取得
+
+詳細ページで使うのは上の方（<title> / h1 / 価格表）だけなのに、WordPress テーマの
+ページは下にサイドバーや関連記事が続いて大きい。ここではレスポンスを少しずつ
+html.parser に流し込み、指定した要素（Target）がすべて揃った時点で接続を閉じて
+そこまでの HTML を返す。返した HTML を従来どおり BeautifulSoup で parse すれば、
+抽出結果は全体を取得した場合と同じになる（要素は先頭から最初に見つかったものを使う前提）。
+
+残りが DRAIN_BYTES 以下なら最後まで読み、Keep-Alive の接続を使い回せるようにする。
+受信しなかったバイト数（Content-Length が分かるときのみ）は STATS に集計する。
+"""
+import codecs
+import threading
+from html.parser import HTMLParser
+
+import http_session
+
+CHUNK_SIZE = 16 * 1024
+DRAIN_BYTES = 16 * 1024
+
+
+class Target:
+    """待つ要素。event="start" は開始タグ、"end" は要素の終わりまで読んだら揃ったとみなす"""
+
+    def __init__(self, tag: str, event: str = "end", **attrs):
+        self.tag = tag
+        self.event = event
+        self.attrs = attrs
+
+    def matches(self, tag: str, attrs: dict) -> bool:
+        return tag == self.tag and all(attrs.get(k) == v for k, v in self.attrs.items())
+
+
+class _Scanner(HTMLParser):
+    def __init__(self, targets):
+        super().__init__(convert_charrefs=False)
+        self.pending = list(targets)
+        self.open = {}       # 読んでいる途中の Target -> 同名タグの入れ子の深さ
+
+    @property
+    def done(self) -> bool:
+        return not self.pending and not self.open
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        for target, depth in list(self.open.items()):
+            if tag == target.tag:
+                self.open[target] = depth + 1
+        for target in list(self.pending):
+            if target.matches(tag, attrs):
+                self.pending.remove(target)
+                if target.event == "end":
+                    self.open[target] = 1
+
+    def handle_startendtag(self, tag, attrs):
+        for target in list(self.pending):
+            if target.matches(tag, dict(attrs)):
+                self.pending.remove(target)
+
+    def handle_endtag(self, tag):
+        for target, depth in list(self.open.items()):
+            if tag == target.tag:
+                if depth <= 1:
+                    del self.open[target]
+                else:
+                    self.open[target] = depth - 1
+
+
+class StreamStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pages = 0
+        self.early = 0          # 途中で打ち切ったページ数
+        self.bytes_read = 0
+        self.bytes_saved = 0
+
+    def add(self, read: int, saved: int, early: bool) -> None:
+        with self._lock:
+            self.pages += 1
+            self.early += int(early)
+            self.bytes_read += read
+            self.bytes_saved += saved
+
+    def line(self) -> str:
+        return (f"✂️ 途中で受信終了 {self.early}/{self.pages} ページ | 受信 {self.bytes_read / 1024 / 1024:.1f} MB "
+                f"| 節約 {self.bytes_saved / 1024 / 1024:.1f} MB")
+
+
+STATS = StreamStats()
+
+
+def read_until(res, targets, chunk_size: int = CHUNK_SIZE) -> str:
+    """stream=True のレスポンスを targets が揃うまで読み、そこまでの HTML を返す"""
+    decoder = codecs.getincrementaldecoder(res.encoding or "utf-8")(errors="replace")
+    scanner = _Scanner(targets)
+    parts = []
+    try:
+        for chunk in res.iter_content(chunk_size):
+            text = decoder.decode(chunk)
+            parts.append(text)
+            scanner.feed(text)
+            if scanner.done:
+                break
+        else:
+            parts.append(decoder.decode(b"", final=True))
+            STATS.add(res.raw.tell(), 0, early=False)
+            return "".join(parts)
+
+        length = int(res.headers.get("Content-Length") or 0)
+        remaining = length - res.raw.tell() if length else None
+        if remaining is not None and remaining <= DRAIN_BYTES:
+            # 残りが少なければ読み切って接続を使い回す（HTML としては使わない）
+            for _ in res.iter_content(chunk_size):
+                pass
+            STATS.add(res.raw.tell(), 0, early=False)
+        else:
+            STATS.add(res.raw.tell(), max(remaining or 0, 0), early=True)
+        return "".join(parts)
+    finally:
+        res.close()
+
+
+def fetch_until(url: str, targets, session=None, **kwargs) -> str:
+    """url を targets が揃うまで取得する（HTTP エラーは例外）"""
+    kwargs.setdefault("timeout", http_session.DEFAULT_TIMEOUT)
+    res = (session or http_session.get_session()).get(url, stream=True, **kwargs)
+    try:
+        res.raise_for_status()
+    except Exception:
+        res.close()
+        raise
+    return read_until(res, targets)
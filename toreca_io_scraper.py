@@ -6,7 +6,8 @@ from typing import List
 
 import gspread
 from google.oauth2.service_account import Credentials
-from playwright.sync_api import sync_playwright
+from shared_browser import sync_playwright
+import outbox
 
 BASE_URL = "https://toreca.io/"
 SHEET_NAME = "その他"
@@ -109,12 +110,13 @@ def main() -> None:
     sheet = get_sheet()
     existing_urls = fetch_existing_urls(sheet)
     rows = scrape_items(existing_urls)
-    if not rows:
-        print("📭 新規データなし")
-        return
     try:
-        sheet.append_rows(rows, value_input_option="USER_ENTERED")
-        print(f"📥 {len(rows)} 件追記完了")
+        # 前回追記できなかった行があれば一緒に追記する
+        appended = outbox.append_rows(sheet, rows, value_input_option="USER_ENTERED")
+        if not appended:
+            print("📭 新規データなし")
+            return
+        print(f"📥 {appended} 件追記完了")
     except Exception as exc:
         print(f"❌ スプレッドシート書き込み失敗: {exc}")
 
@@ -0,0 +1,45 @@
+"""WordPress oripa REST API 共通処理
+
+既存URL一覧の取得と upsert エンドポイントへの投稿。
+各サイトのスクレイパーで重複していた処理をここにまとめる。
+"""
+import os
+
+import wp_sender
+import wp_existing
+import item_diff
+
+# -----------------------------
+# WordPress REST API 設定
+# -----------------------------
+WP_URL = os.getenv("WP_URL") or "https://online-gacha-hack.com/wp-json/oripa/v1/upsert"
+WP_GET_URL = os.getenv("WP_GET_URL") or "https://online-gacha-hack.com/wp-json/oripa/v1/list"
+WP_USER = os.getenv("WP_USER")
+WP_APP_PASS = os.getenv("WP_APP_PASS")
+
+
+# -----------------------------
+# WordPress既存URL取得
+# -----------------------------
+def fetch_existing_urls(source_slug: str = None) -> set:
+    """既存URLの集合（前回のスナップショット + 差分、古ければ全件取得）"""
+    return wp_existing.fetch(WP_GET_URL, auth=(WP_USER, WP_APP_PASS), source_slug=source_slug)
+
+
+# -----------------------------
+# WordPress REST API投稿
+# -----------------------------
+def post_to_wordpress(items: list, existing_urls=None, key="detail_url") -> bool:
+    """整形済みアイテムを upsert エンドポイントへ送信する
+
+    existing_urls（fetch_existing_urls() の結果）を渡すと、新規と内容が変わったものだけを送る。
+    """
+    if existing_urls is not None:
+        items, counts = item_diff.split(items, existing_urls, key=key)
+        print(item_diff.line(counts))
+    if not items:
+        print("📭 新規・変更なし")
+    else:
+        print(f"🚀 新規・変更 {len(items)}件をWordPressに送信中...")
+    return wp_sender.send_all(WP_URL, items, auth=(WP_USER, WP_APP_PASS),
+                              on_sent=wp_existing.recorder(WP_GET_URL))
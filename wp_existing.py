@@ -0,0 +1,289 @@
+"""WordPress 既存URL一覧のローカルスナップショットと差分同期
+
+各スクレイパーは毎回 /wp-json/oripa/v1/list から全ソースの全URLを取得していたが、
+カタログが増えるほど、この一覧の取得が小さなスクレイパーの固定費として一番重くなる。
+ここでは一覧を dedup_index（正規化したURLのハッシュ）に、同期時刻などを
+WP_EXISTING_DIR（既定 .cache/wp_existing）に保存し、
+    - 前回の全件取得から WP_EXISTING_TTL_SEC 以内なら、since（前回同期時刻）と
+      source_slug を付けて差分だけ取得してスナップショットに足す
+    - エンドポイントが since を無視して全件を返した場合は、以降は差分を取りに行かず
+      TTL 以内はスナップショットをそのまま使う
+    - TTL を過ぎたら（または WP_EXISTING_REFRESH=1 なら）全件を取り直す
+自分で投稿したURL（wp_sender の成功バッチ）もインデックスに足すので、
+差分取得できない場合でも同じスクレイパーが同じURLを二重に送ることはない。
+
+時刻は WordPress の Date ヘッダー（サーバー時刻）を使い、DELTA_OVERLAP_SEC だけ
+さかのぼって取得する。取得に失敗したときは古いスナップショットでも使う。
+
+    urls = wp_existing.fetch(WP_GET_URL, auth=(WP_USER, WP_APP_PASS), source_slug="eve-gacha")
+    wp_sender.send_all(WP_URL, items, auth=..., on_sent=wp_existing.recorder(WP_GET_URL))
+"""
+import os
+import re
+import json
+import time
+import codecs
+import hashlib
+import threading
+from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import parsedate_to_datetime
+
+import http_session
+import dedup_index
+import item_diff
+
+SNAPSHOT_DIR = os.getenv("WP_EXISTING_DIR", ".cache/wp_existing")
+TTL_SEC = int(os.getenv("WP_EXISTING_TTL_SEC", str(12 * 3600)))
+FORCE_REFRESH = os.getenv("WP_EXISTING_REFRESH", "") == "1"
+
+# 時計のずれ・書き込み中の投稿を取りこぼさないよう、since をさかのぼる秒数
+DELTA_OVERLAP_SEC = 300
+
+# 差分のつもりで取得した結果にスナップショットのこの割合以上が含まれていたら、
+# since が無視されて全件が返ってきたとみなす（判定はスナップショットがこの件数以上のときだけ）
+FULL_OVERLAP_RATIO = 0.9
+FULL_OVERLAP_MIN = 50
+
+# ページ分割の一覧（wp/v2 のコレクション）を同時に取得するページ数
+PAGE_WORKERS = int(os.getenv("WP_LIST_WORKERS", "6"))
+CHUNK_SIZE = 16 * 1024
+
+# modified_after はサイトのタイムゾーンで解釈されることがあるので、1日さかのぼる
+PAGED_OVERLAP_SEC = 24 * 3600
+
+# "detail_url": "..." の値（JSON 文字列としてエスケープされたまま）
+DETAIL_URL_PATTERN = re.compile(r'"detail_url"\s*:\s*"((?:[^"\\]|\\.)*)"')
+# チャンクの境目にまたがる値のために残す長さ（これより長い URL は想定しない）
+STREAM_TAIL = 4096
+
+_lock = threading.Lock()
+
+
+def _item_url(item) -> str:
+    # oripa/v1/list は URL の配列。detail_url を持つオブジェクトの配列にも対応する
+    if isinstance(item, dict):
+        return item.get("detail_url") or ""
+    return item if isinstance(item, str) else ""
+
+
+def _server_time(res) -> float:
+    try:
+        return parsedate_to_datetime(res.headers["Date"]).timestamp()
+    except (KeyError, TypeError, ValueError):
+        return time.time()
+
+
+def _stream_detail_urls(res, urls: set) -> None:
+    """レスポンスを少しずつ読み、detail_url の値だけを urls に足す（投稿オブジェクト全体は作らない）"""
+    decoder = codecs.getincrementaldecoder(res.encoding or "utf-8")(errors="replace")
+    buffer = ""
+    try:
+        for chunk in res.iter_content(CHUNK_SIZE):
+            buffer += decoder.decode(chunk)
+            end = 0
+            for match in DETAIL_URL_PATTERN.finditer(buffer):
+                urls.add(json.loads(f'"{match.group(1)}"'))
+                end = match.end()
+            buffer = buffer[max(end, len(buffer) - STREAM_TAIL):]
+        buffer += decoder.decode(b"", final=True)
+        for match in DETAIL_URL_PATTERN.finditer(buffer):
+            urls.add(json.loads(f'"{match.group(1)}"'))
+    finally:
+        res.close()
+
+
+def _get_page(session, list_url: str, auth, params: dict, page: int):
+    res = session.get(list_url, params={**params, "page": page}, auth=auth, stream=True, timeout=30)
+    if res.status_code == 400 and page > 1:
+        # rest_post_invalid_page_number（取得中に件数が減った）
+        res.close()
+        return set(), res
+    if res.status_code != 200:
+        res.close()
+        raise RuntimeError(f"status {res.status_code}（{page} ページ目）")
+    urls = set()
+    _stream_detail_urls(res, urls)
+    return urls, res
+
+
+def fetch_paged(list_url: str, auth=None, workers: int = PAGE_WORKERS, **params):
+    """wp/v2 形式のページ分割の一覧から detail_url を集め、(URL の集合, サーバー時刻) を返す
+
+    _fields=detail_url で必要なフィールドだけを要求し、1ページ目の X-WP-TotalPages を見て
+    残りのページを workers 並列で取得する。1ページでも失敗したら例外（半端な一覧を返さない）。
+    X-WP-TotalPages がなければ空のページまで順に取得する。
+    """
+    params = {"_fields": "detail_url", **params}
+    session = http_session.get_session(workers)
+    urls, first = _get_page(session, list_url, auth, params, 1)
+    server_now = _server_time(first)
+    total = first.headers.get("X-WP-TotalPages")
+
+    if total is None:
+        page = 2
+        while True:
+            page_urls, _ = _get_page(session, list_url, auth, params, page)
+            if not page_urls:
+                break
+            urls |= page_urls
+            page += 1
+        return urls, server_now
+
+    pages = range(2, int(total) + 1)
+    parallel = max(1, min(workers, len(pages)))
+    if pages:
+        with ThreadPoolExecutor(max_workers=parallel) as executor:
+            for page_urls, _ in executor.map(lambda p: _get_page(session, list_url, auth, params, p), pages):
+                urls |= page_urls
+    print(f"📄 一覧 {int(total)} ページを取得（並列 {parallel}）")
+    return urls, server_now
+
+
+class Snapshot:
+    def __init__(self, list_url: str, source_slug: str = None, keep_urls: bool = False,
+                 paged: bool = False, directory: str = SNAPSHOT_DIR):
+        self.list_url = list_url
+        self.source_slug = source_slug
+        self.paged = paged      # wp/v2 形式（ページ分割・modified_after）の一覧
+        key = hashlib.sha1(f"{list_url}|{source_slug or ''}".encode("utf-8")).hexdigest()[:16]
+        self.path = os.path.join(directory, f"{key}.json")
+        # URL 自体は dedup_index に source_slug（なければ一覧URL）ごとに保存する
+        self.urls = dedup_index.get_index().partition(source_slug or list_url, keep_urls=keep_urls)
+        self.full_at = 0.0      # 最後に全件取得したサーバー時刻
+        self.synced_at = 0.0    # 最後に同期（全件または差分）したサーバー時刻
+        self.delta = None       # since が効くか（None は未確認）
+        self.count = 0          # 保存時の件数（インデックスが失われていないかの確認用）
+        self._load()
+
+    def _load(self) -> None:
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        self.full_at = data.get("full_at", 0.0)
+        self.synced_at = data.get("synced_at", 0.0)
+        self.delta = data.get("delta")
+        self.count = data.get("count", 0)
+
+    def stale(self, now: float) -> bool:
+        if self.count and not len(self.urls):
+            return True     # メタ情報だけ残ってインデックスがない
+        return not self.full_at or now - self.full_at > TTL_SEC
+
+    # -----------------------------
+    # 同期
+    # -----------------------------
+    def _get(self, auth, since: float = None):
+        if self.paged:
+            params = {}
+            if since is not None:
+                since -= PAGED_OVERLAP_SEC
+                params["modified_after"] = datetime.fromtimestamp(since, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+            return fetch_paged(self.list_url, auth, **params)
+
+        params = {}
+        if since is not None:
+            params["since"] = int(since)
+        if self.source_slug:
+            params["source_slug"] = self.source_slug
+        res = http_session.get(self.list_url, params=params, auth=auth, timeout=30)
+        if res.status_code != 200:
+            raise RuntimeError(f"status {res.status_code}")
+        urls = {_item_url(item) for item in res.json()}
+        urls.discard("")
+        return urls, _server_time(res)
+
+    def refresh_full(self, auth) -> None:
+        urls, server_now = self._get(auth)
+        # 一覧の取得後に投稿したもの（自分の投稿）だけ残して入れ替える
+        self.urls.replace(urls, added=server_now, keep_after=server_now - DELTA_OVERLAP_SEC)
+        self.full_at = self.synced_at = server_now
+        print(f"✅ 既存URL（全件取得）: {len(self.urls)} 件")
+
+    def refresh_delta(self, auth) -> None:
+        urls, server_now = self._get(auth, since=self.synced_at - DELTA_OVERLAP_SEC)
+        known = len(self.urls)
+        if known >= FULL_OVERLAP_MIN and sum(self.urls.contains_many(urls)) >= FULL_OVERLAP_RATIO * known:
+            # since が無視された（全件が返ってきた）ので全件取得として扱う
+            print("ℹ️ 一覧APIが since に対応していないため、TTL 以内はスナップショットを使います")
+            self.urls.replace(urls, added=server_now, keep_after=server_now - DELTA_OVERLAP_SEC)
+            self.full_at = server_now
+            self.delta = False
+        else:
+            added = self.urls.add(urls, added=server_now)
+            if known >= FULL_OVERLAP_MIN:
+                self.delta = True
+            print(f"✅ 既存URL（差分 {len(urls)} 件、うち追加 {added} 件）: {len(self.urls)} 件")
+        self.synced_at = server_now
+
+    def save(self) -> None:
+        data = {
+            "list_url": self.list_url,
+            "source_slug": self.source_slug,
+            "full_at": self.full_at,
+            "synced_at": self.synced_at,
+            "delta": self.delta,
+            "count": len(self.urls),
+        }
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            tmp = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(data, f, ensure_ascii=False)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"⚠️ 既存URLスナップショットの保存失敗: {e}")
+
+
+# -----------------------------
+# 入口
+# -----------------------------
+def fetch(list_url: str, auth=None, source_slug: str = None, keep_urls: bool = False, paged: bool = False):
+    """既存URL（dedup_index.Partition。`url in existing` で判定できる）を返す
+
+    前回のスナップショット + 差分で更新し、古ければ全件取得する。
+    keep_urls=True なら URL の文字列も保存し、for で列挙できる。
+    paged=True は wp/v2 形式の一覧（fetch_paged で取得し、差分は modified_after）。
+    """
+    print("🔍 WordPress既存URLを取得中...")
+    with _lock:
+        snapshot = Snapshot(list_url, source_slug, keep_urls=keep_urls, paged=paged)
+        try:
+            if FORCE_REFRESH or snapshot.stale(time.time()):
+                snapshot.refresh_full(auth)
+            elif snapshot.delta is not False:
+                snapshot.refresh_delta(auth)
+            else:
+                age = (time.time() - snapshot.full_at) / 60
+                print(f"✅ 既存URL（スナップショット、{age:.0f} 分前）: {len(snapshot.urls)} 件")
+        except Exception as e:
+            if not snapshot.full_at:
+                print(f"🛑 既存URL取得エラー: {e}")
+            else:
+                print(f"⚠️ 既存URL取得エラーのためスナップショットを使います: {e}")
+            return snapshot.urls
+        snapshot.save()
+        return snapshot.urls
+
+
+def record_posted(list_url: str, items, keep_urls: bool = False, key=None) -> None:
+    """投稿できたアイテムの detail_url と内容の指紋を source_slug（なければ一覧URL）のインデックスに記録する
+
+    key（アイテムから URL を返す関数）を渡すと、detail_url の代わりにその URL を記録する。
+    """
+    by_source = {}
+    for item in items:
+        url = key(item) if key else _item_url(item)
+        if url:
+            by_source.setdefault(item.get("source_slug") or list_url, []).append((url, item_diff.fingerprint(item)))
+    index = dedup_index.get_index()
+    for source, rows in by_source.items():
+        urls, fps = zip(*rows)
+        index.partition(source, keep_urls=keep_urls).add(urls, fps=list(fps))
+
+
+def recorder(list_url: str, keep_urls: bool = False, key=None):
+    """wp_sender の on_sent に渡すコールバック（key は item_diff.split と同じものを渡す）"""
+    return lambda batch: record_posted(list_url, batch, keep_urls=keep_urls, key=key)
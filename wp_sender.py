@@ -0,0 +1,244 @@
+"""WordPress upsert エンドポイント（/oripa/v1/upsert, /pokeca/v1/upsert）への共通送信
+
+全件を1回の POST で送ると件数が多いときに WordPress 側のタイムアウトに
+かかり、20件ずつ順番に送ると遅い。ここでは
+    - 1バッチの件数を、直近の応答時間が WP_BATCH_TARGET_SEC 程度になるよう調整する
+    - 同時に WP_IN_FLIGHT バッチまで送る（それ以上は add() が待つ）
+    - WP_GZIP=auto のときはリクエストボディを gzip で送る（サーバーが受け付けなければ以降は無圧縮）
+    - 5xx・タイムアウト・接続エラーはジッター付きバックオフで再試行し、
+      タイムアウトしたバッチは半分に分けて送り直す
+最後まで送れなかったアイテムは failed_items に残る。送れたバッチは on_sent に渡す
+（wp_existing.recorder で既存URLスナップショットに記録する）。
+
+送るアイテムは送信前に outbox（送信先ごとの追記専用ファイル）へ書き、成功したら
+消し込む。前回送れなかったものは次の WpSender が読み込み、今回のアイテムと
+キー（source_slug + detail_url）でまとめて（同じものは今回の方を）最後に送る。
+
+    with WpSender(WP_URL, auth=(WP_USER, WP_APP_PASS)) as sender:
+        for item in items:
+            sender.add(item)
+    ok = send_all(WP_URL, items, auth=(WP_USER, WP_APP_PASS))
+
+環境変数:
+    WP_BATCH_SIZE        最初のバッチ件数（既定 20）
+    WP_BATCH_TARGET_SEC  1バッチの目標応答時間（既定 8 秒）
+    WP_IN_FLIGHT         同時に送るバッチ数（既定 3）
+    WP_RETRIES           1バッチの再試行回数（既定 3）
+    WP_GZIP              off（既定）/ auto（gzip で送り、拒否されたら無圧縮）
+                         PHP の WordPress は Content-Encoding: gzip のボディを展開しないことが多く、
+                         空のパラメータで 200 を返されると送れたものとして扱ってしまうので、
+                         展開することを確認したエンドポイントでだけ auto にする
+"""
+import os
+import json
+import gzip
+import time
+import random
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+import outbox
+import http_session
+
+BATCH_SIZE = int(os.getenv("WP_BATCH_SIZE", "20"))
+TARGET_SEC = float(os.getenv("WP_BATCH_TARGET_SEC", "8"))
+IN_FLIGHT = int(os.getenv("WP_IN_FLIGHT", "3"))
+RETRIES = int(os.getenv("WP_RETRIES", "3"))
+GZIP = os.getenv("WP_GZIP", "off").lower()
+TIMEOUT = 60
+
+MIN_BATCH = 5
+MAX_BATCH = 200
+BACKOFF_BASE = 1.0
+
+# gzip のボディを受け付けなかったエンドポイント（プロセス内で記憶）
+_gzip_rejected = set()
+
+
+class WpSender:
+    def __init__(self, url: str, auth=None, batch_size: int = BATCH_SIZE, in_flight: int = IN_FLIGHT,
+                 retries: int = RETRIES, timeout: int = TIMEOUT, on_sent=None, spool: bool = True):
+        self.url = url
+        self.on_sent = on_sent  # 成功したバッチ（アイテムのリスト）を受け取るコールバック
+        self.auth = auth
+        self.batch_size = float(max(MIN_BATCH, min(MAX_BATCH, batch_size)))
+        self.in_flight = max(1, in_flight)
+        self.retries = retries
+        self.timeout = timeout
+        self.sent = 0
+        self.failed_items = []
+        self.responses = []     # 成功したバッチのレスポンス JSON（取れなければテキスト）
+        self._buffer = []
+        self._batches = 0
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.in_flight)
+        self._futures = []
+        self._executor = ThreadPoolExecutor(max_workers=self.in_flight)
+        self._session = http_session.get_session(self.in_flight)
+        self._started = time.monotonic()
+        # 送信待ちの控え（spool=False なら使わない）と、前回送れなかったアイテム
+        self._outbox = outbox.Outbox(f"wp:{url}") if spool else None
+        self._replay = self._outbox.pending() if spool else {}
+        if self._replay:
+            print(f"📤 前回送れなかった {len(self._replay)} 件を今回の送信と一緒に再送します")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    # -----------------------------
+    # 投入
+    # -----------------------------
+    def add(self, item: dict) -> None:
+        """アイテムを追加する（送信中のバッチが上限なら空くまで待つ）"""
+        if self._replay:
+            self._replay.pop(outbox.item_key(item), None)
+        self._buffer.append(item)
+        if len(self._buffer) >= int(self.batch_size):
+            self._dispatch()
+
+    def extend(self, items) -> None:
+        for item in items:
+            self.add(item)
+
+    def flush(self) -> None:
+        if self._buffer:
+            self._dispatch()
+
+    def close(self) -> bool:
+        """前回の送信待ちと残りを送り、すべて終わるまで待つ。全件送れたら True"""
+        replay, self._replay = list(self._replay.values()), {}
+        size = int(self.batch_size)
+        errors = 0
+        try:
+            for i in range(0, len(replay), size):
+                # 控えにはもう書いてあるので、そのまま送る
+                self._dispatch(replay[i:i + size], spool=False)
+            self.flush()
+            for future in self._futures:
+                try:
+                    future.result()
+                except requests.RequestException as e:
+                    # _send で扱えなかった通信エラー（バッチは控えに残っている）
+                    errors += 1
+                    print(f"🛑 WP送信エラー: {e}")
+        finally:
+            self._executor.shutdown()
+            elapsed = time.monotonic() - self._started
+            print(f"📮 WP送信: 成功 {self.sent} 件 / 失敗 {len(self.failed_items)} 件 "
+                  f"/ {self._batches} バッチ（{elapsed:.1f} 秒、最終バッチ件数 {int(self.batch_size)}）")
+            if self._outbox:
+                left = self._outbox.compact()
+                if left:
+                    print(f"📥 送れなかった {left} 件は次回の実行で再送します")
+        return not self.failed_items and not errors
+
+    def _dispatch(self, batch: list = None, spool: bool = True) -> None:
+        if batch is None:
+            batch, self._buffer = self._buffer, []
+        if self._outbox and spool:
+            self._outbox.put((outbox.item_key(item), item) for item in batch)
+        self._slots.acquire()
+        future = self._executor.submit(self._send, batch)
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+
+    # -----------------------------
+    # 送信
+    # -----------------------------
+    def _send(self, batch: list) -> None:
+        for attempt in range(self.retries + 1):
+            try:
+                res, elapsed = self._post(batch)
+            except requests.Timeout:
+                self._shrink()
+                if len(batch) > MIN_BATCH:
+                    # 大きすぎてタイムアウトした可能性が高いので分けて送り直す
+                    half = len(batch) // 2
+                    print(f"⏱ タイムアウト: {len(batch)} 件を {half} + {len(batch) - half} 件に分割")
+                    self._send(batch[:half])
+                    self._send(batch[half:])
+                    return
+                reason = "timeout"
+            except requests.ConnectionError as e:
+                reason = f"接続エラー: {e}"
+            except requests.RequestException as e:
+                reason = f"通信エラー: {e}"
+            else:
+                if res.ok:
+                    self._record_success(batch, res, elapsed)
+                    return
+                if res.status_code < 500 and res.status_code != 429:
+                    print(f"🛑 WP送信失敗 {res.status_code}: {res.text[:300]}")
+                    break
+                self._shrink()
+                reason = f"status {res.status_code}"
+
+            if attempt < self.retries:
+                delay = random.uniform(0, BACKOFF_BASE * 2 ** attempt)
+                print(f"🔁 WP送信を再試行（{reason}、{delay:.1f} 秒後、{len(batch)} 件）")
+                time.sleep(delay)
+            else:
+                print(f"🛑 WP送信を断念（{reason}、{len(batch)} 件）")
+
+        with self._lock:
+            self.failed_items.extend(batch)
+
+    def _post(self, batch: list):
+        body = json.dumps(batch, ensure_ascii=False).encode("utf-8")
+        headers = {"Content-Type": "application/json; charset=utf-8"}
+        use_gzip = GZIP == "auto" and self.url not in _gzip_rejected
+        if use_gzip:
+            headers["Content-Encoding"] = "gzip"
+        start = time.monotonic()
+        res = self._session.post(self.url, data=gzip.compress(body) if use_gzip else body,
+                                 headers=headers, auth=self.auth, timeout=self.timeout)
+        if use_gzip and res.status_code in (400, 411, 415):
+            # 圧縮したボディを読めないサーバー（JSON として解釈できない）
+            print(f"ℹ️ gzip のリクエストを受け付けないため無圧縮で送ります: {self.url}")
+            _gzip_rejected.add(self.url)
+            start = time.monotonic()
+            res = self._session.post(self.url, data=body, headers={"Content-Type": headers["Content-Type"]},
+                                     auth=self.auth, timeout=self.timeout)
+        return res, time.monotonic() - start
+
+    def _record_success(self, batch: list, res, elapsed: float) -> None:
+        try:
+            payload = res.json()
+        except ValueError:
+            payload = res.text
+        with self._lock:
+            self._batches += 1
+            self.sent += len(batch)
+            self.responses.append(payload)
+            number = self._batches
+            # 1件あたりの応答時間から、目標時間に収まる件数へ（1回で最大2倍・半分まで）
+            ideal = TARGET_SEC / max(elapsed / len(batch), 1e-3)
+            ideal = max(self.batch_size / 2, min(self.batch_size * 2, ideal))
+            self.batch_size = max(MIN_BATCH, min(MAX_BATCH, 0.5 * self.batch_size + 0.5 * ideal))
+        if self._outbox:
+            self._outbox.done(outbox.item_key(item) for item in batch)
+        if self.on_sent:
+            self.on_sent(batch)
+        print(f"✅ Batch {number}: {len(batch)} 件 / {res.status_code} / {elapsed:.1f} 秒")
+
+    def _shrink(self) -> None:
+        with self._lock:
+            self.batch_size = max(MIN_BATCH, self.batch_size / 2)
+
+
+def send_all(url: str, items: list, auth=None, **kwargs) -> bool:
+    """items をまとめて送る（前回送れなかったものがあれば一緒に送る）。全件送れたら True"""
+    if not items and (not kwargs.get("spool", True) or not outbox.Outbox(f"wp:{url}").pending()):
+        return True
+    sender = WpSender(url, auth=auth, **kwargs)
+    try:
+        sender.extend(items)
+    finally:
+        # 最後の送信や前回分の再送の失敗も close() の結果に含まれる
+        ok = sender.close()
+    return ok